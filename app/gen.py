@@ -50,9 +50,45 @@ def random_graph(
     with test_data.open(mode="w") as dat:
         dat.write(f"graph {vertices}\n")
         for adj in adj_list:
+            dat.write("".join([f"{w},{v} " for w, v in adj]) + "\n")
+    return vertices, edges
+
+
+def random_geometric_graph(
+    test_data: Path,
+    vertices: int = 100000,
+    edges: int = 300000,
+    width: int = MAX_VAL,
+) -> tuple[int]:
+    """Generates a random connected road-like graph with vertex coordinates.
+    The file is a graph file, with each edge listed once, followed by a
+    "coords" line and one "x y" line per vertex.
+
+    Args:
+        test_data (Path): The file to write the graph to.
+        vertices (int, optional): The number of vertices. Defaults to 100000.
+        edges (int, optional): The rough number of edges. Defaults to 300000.
+        width (int, optional): The side length of the square the vertices
+            are in. Defaults to MAX_VAL.
+
+    Returns:
+        tuple[int]: (vertices, edges)
+    """
+
+    vertices = max(vertices, 1)
+    coords, adj_list = graph.rand_geometric_graph(vertices, edges, max(width, 1))
+    edges = 0
+    with test_data.open(mode="w") as dat:
+        dat.write(f"graph {vertices}\n")
+        for u, adj in enumerate(adj_list):
             for w, v in adj:
-                dat.write(f"{w},{v} ")
+                if u < v:
+                    dat.write(f"{w},{v} ")
+                    edges += 1
             dat.write("\n")
+        dat.write("coords\n")
+        for x, y in coords:
+            dat.write(f"{x} {y}\n")
     return vertices, edges
 
 
@@ -18,6 +18,8 @@ from pathlib import Path
 import re
 import gen
 import run
+import server
+from util import daryheap, heaps
 
 FILE_NAME_FILTER = re.compile("[^a-z0-9_\-]")
 DATA_DIR = Path(__file__).parent.parent.absolute() / "data"
@@ -36,6 +38,7 @@ DEFAULT_OPTIONS = {
     "maxweight": int(1e9),
     "minval": int(-1e9),
     "maxval": int(1e9),
+    "width": int(1e9),
 }
 
 
@@ -108,6 +111,14 @@ def gen_command(args: tuple[str]) -> None:
             maxweight=options["maxweight"],
         )
         display_graph_data(options["name"], vertices, edges, options["minweight"])
+    elif options["type"] == "geometric":
+        vertices, edges = gen.random_geometric_graph(
+            test_data=test_data,
+            vertices=options["vertices"],
+            edges=options["edges"],
+            width=options["width"],
+        )
+        display_graph_data(options["name"], vertices, edges, 0)
     else:
         print("Unable to read config file: invalid type argument")
 
@@ -116,10 +127,15 @@ def run_command(args: tuple[str]) -> None:
     """Command to run tests.
 
     Args:
-        args (tuple[str]): The heap to use and test data filename.
-            data/default used if no filename specified.
-
-        ("run", "ph" or "fh" or "bh" or "pd" or "fd" or "bd" or "nd")
+        args (tuple[str]): The test to run and test data filename. Extra
+            integer arguments are passed to a registered heap, such as the
+            arity of a d-ary heap.
+
+        ("run", <code>h or <code>d or <code>c for a code in heaps.HEAPS or
+            "pm" or "pa" or "pb" or "ah" or "fb" or "bh" or "nh" or "mh" or
+            "mp" or "bd" or "nd" or "vd" or "ms" or "ds" or "lr" or "up" or
+            "sv" or "ks" or "st" or "as" or "lm" or "ch" or "bc" or "mg",
+            filename, *args)
     """
 
     if len(args) < 3:
@@ -129,15 +145,47 @@ def run_command(args: tuple[str]) -> None:
     if not data.is_file():
         print("Test data not found. Use the gen command if you haven't already.")
         return
+    # registered heaps run as <code>h and <code>d, extra args go to the heap
+    name = heaps.by_code(args[1][0]) if len(args[1]) == 2 else None
+    label = name[0].upper() + name[1:] if name else ""
+    if name and len(args) > 3:
+        label += " (" + ", ".join(args[3:]) + ")"
     try:
-        if args[1] == "ph":
+        if name and args[1][1] == "h":
+            extra = [int(arg) for arg in args[3:]]
+            print("running...")
+            time = run.heap_time(data, name, *extra)
+            print(f"\n{label} heap runtime on {args[2]}: {time:.5} s\n")
+        elif name and args[1][1] == "d":
+            extra = [int(arg) for arg in args[3:]]
+            print("running...")
+            time = run.dijkstra_time(data, name, *extra)
+            print(f"\n{label} heap runtime on {args[2]}: {time:.5} s\n")
+        elif name and args[1][1] == "c":
+            extra = [int(arg) for arg in args[3:]]
+            print("running...")
+            time = run.dijkstra_csr_time(data, name, *extra)
+            print(f"\n{label} heap CSR runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "pm":
             print("running...")
-            time = run.pairing_time(data)
-            print(f"\nPairing heap runtime on {args[2]}: {time:.5} s\n")
-        elif args[1] == "fh":
+            time = run.heap_time(data, "multipass pairing")
+            print(f"\nMultipass pairing heap runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "pa":
             print("running...")
-            time = run.fibonacci_time(data)
-            print(f"\nFibonacci heap runtime on {args[2]}: {time:.5} s\n")
+            time = run.heap_time(data, "auxiliary pairing")
+            print(f"\nAuxiliary pairing heap runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "pb":
+            print("running...")
+            time = run.pairing_batch_time(data)
+            print(f"\nBatched pairing heap runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "ah":
+            print("running...")
+            time = run.array_pairing_time(data)
+            print(f"\nArray pairing heap runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "fb":
+            print("running...")
+            time = run.fibonacci_batch_time(data)
+            print(f"\nBatched Fibonacci heap runtime on {args[2]}: {time:.5} s\n")
         elif args[1] == "bh":
             print("running...")
             time = run.binary_time(data)
@@ -146,14 +194,20 @@ def run_command(args: tuple[str]) -> None:
             print("running...")
             time = run.noheap_time(data)
             print(f"\nHeapless runtime on {args[2]}: {time:.5} s\n")
-        elif args[1] == "pd":
+        elif args[1] == "mh":
             print("running...")
-            time = run.dijkstra_pairing_time(data)
-            print(f"\nPairing heap runtime on {args[2]}: {time:.5} s\n")
-        elif args[1] == "fd":
+            usage = run.node_memory(data)
+            print(f"\nMemory per heap node on {args[2]}")
+            for name, size in usage.items():
+                print(f"  {name:<20}{size:,.1f} B")
+            print()
+        elif args[1] == "mp":
             print("running...")
-            time = run.dijkstra_fibonacci_time(data)
-            print(f"\nFibonacci heap runtime on {args[2]}: {time:.5} s\n")
+            usage = run.pop_memory(data)
+            print(f"\nPeak memory allocated by pops on {args[2]}")
+            for name, size in usage.items():
+                print(f"  {name:<20}{size:,} B")
+            print()
         elif args[1] == "bd":
             print("running...")
             time = run.dijkstra_binary_time(data)
@@ -162,6 +216,157 @@ def run_command(args: tuple[str]) -> None:
             print("running...")
             time = run.dijkstra_noheap_time(data)
             print(f"\nHeapless runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "vd":
+            print("running...")
+            time = run.dijkstra_dense_time(data)
+            print(f"\nVectorized dense runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "ms":
+            sources = int(args[3]) if len(args) > 3 else 100
+            workers = int(args[4]) if len(args) > 4 else None
+            print("running...")
+            time = run.dijkstra_multi_time(data, sources, workers)
+            print(f"\nMulti-source runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "ds":
+            delta = int(args[3]) if len(args) > 3 else 0
+            workers = int(args[4]) if len(args) > 4 else None
+            print("running...")
+            base, results = run.delta_stepping_time(data, delta or None, workers)
+            print(f"\nDelta-stepping on {args[2]}")
+            print(f"  {'Dijkstra':<20}{base:.5} s")
+            for count, time in results.items():
+                speedup = results[1] / time
+                print(f"  {f'{count} processes':<20}{time:.5} s, {speedup:.3}x")
+            print()
+        elif args[1] == "lr":
+            queries = int(args[3]) if len(args) > 3 else 100
+            sources = int(args[4]) if len(args) > 4 else 10
+            megabytes = int(args[5]) if len(args) > 5 else 64
+            disk = len(args) > 6 and args[6] == "disk"
+            print("running...")
+            base, time, cache = run.cache_time(
+                data, queries, sources, megabytes << 20, disk
+            )
+            print(f"\n{queries} searches from {sources} sources on {args[2]}")
+            print(f"  {'no cache':<20}{base:.5} s")
+            print(f"  {'LRU cache':<20}{time:.5} s")
+            print(f"  {cache.hits} hits, {cache.disk_hits} disk hits,", end=" ")
+            print(f"{cache.misses} misses, {cache.evictions} evictions,", end=" ")
+            print(f"{cache.disk_evictions} disk evictions")
+            print()
+        elif args[1] == "up":
+            heap = heaps.by_code(args[3]) if len(args) > 3 else "pairing"
+            batches = int(args[4]) if len(args) > 4 else 4
+            if not heap:
+                print("Invalid heap code. Type 'help run' for usage.")
+                return
+            print("running...")
+            results = run.repair_time(data, heap, batches)
+            print(f"\nRepairs after edge changes on {args[2]} ({heap} heap)")
+            print(
+                f"  {'batch':<10}{'repair':<12}{'Dijkstra':<12}{'speedup':<10}"
+                "settled"
+            )
+            for size, (repair, full, settled) in results.items():
+                speedup = full / repair if repair else float("inf")
+                print(
+                    f"  {size:<10,}{repair:<12.5}{full:<12.5}{speedup:<10,.1f}"
+                    f"{settled:.2%}"
+                )
+            print()
+        elif args[1] == "sv":
+            queries = int(args[3]) if len(args) > 3 else 1000
+            workers = int(args[4]) if len(args) > 4 else None
+            print("running...")
+            read, search, stats = server.query_latency(data, queries, workers=workers)
+            print(f"\nServer latency on {args[2]}, {queries:,} queries")
+            print(f"  {'read graph':<20}{read:.5} s")
+            print(f"  {'one search':<20}{search:.5} s")
+            print(f"  {'batches':<20}{stats['batches']:,}")
+            for label in ("p50", "p90", "p99", "max"):
+                print(f"  {label:<20}{stats[label + '_ms'] / 1000:.5} s")
+            print()
+        elif args[1] == "ks":
+            k = int(args[3]) if len(args) > 3 else 10
+            queries = int(args[4]) if len(args) > 4 else 5
+            codes = args[5] if len(args) > 5 else "pfi"
+            names = [heaps.by_code(code) for code in codes]
+            if not all(names):
+                print("Invalid heap code. Type 'help run' for usage.")
+                return
+            print("running...")
+            results = run.k_shortest_time(data, names, k, queries)
+            print(f"\n{k} shortest paths on {args[2]}, {queries} queries")
+            print(f"  {'':<20}{'plain':<12}{'settled':<12}{'tree':<12}settled")
+            for name, (plain, p_settled, tree, t_settled) in results.items():
+                print(
+                    f"  {name:<20}{plain:<12.5}{p_settled:<12,.0f}{tree:<12.5}"
+                    f"{t_settled:,.0f}"
+                )
+            print()
+        elif args[1] == "st":
+            queries = int(args[3]) if len(args) > 3 else 100
+            heap = heaps.by_code(args[4]) if len(args) > 4 else "pairing"
+            if not heap:
+                print("Invalid heap code. Type 'help run' for usage.")
+                return
+            print("running...")
+            results = run.point_to_point(data, heap, queries)
+            print(f"\n{queries} point to point queries on {args[2]} ({heap} heap)")
+            for search, (time, settled) in results.items():
+                print(f"  {search:<20}{time:.5} s, {settled:.2%} settled")
+            print()
+        elif args[1] == "as":
+            queries = int(args[3]) if len(args) > 3 else 100
+            print("running...")
+            results = run.astar_queries(data, queries)
+            print(f"\n{queries} point to point queries on {args[2]}")
+            print(f"  {'heap':<20}{'Dijkstra':<12}{'settled':<10}{'A*':<12}settled")
+            for name, (dt, ds, at, ast) in results.items():
+                print(f"  {name:<20}{dt:<12.5}{ds:<10.2%}{at:<12.5}{ast:.2%}")
+            print()
+        elif args[1] == "lm":
+            landmarks = int(args[3]) if len(args) > 3 else 16
+            queries = int(args[4]) if len(args) > 4 else 100
+            print("running...")
+            build, results = run.landmark_queries(data, landmarks, queries)
+            if build is None:
+                print(f"\nRead the landmark index of {args[2]}")
+            else:
+                print(f"\nBuilt the landmark index of {args[2]} in {build:.5} s")
+            print(f"{queries} point to point queries with {landmarks} landmarks")
+            for search, (time, settled) in results.items():
+                print(f"  {search:<20}{time:.5} s, {settled:.2%} settled")
+            print()
+        elif args[1] == "ch":
+            queries = int(args[3]) if len(args) > 3 else 100
+            heap = heaps.by_code(args[4]) if len(args) > 4 else "pairing"
+            if not heap or heaps.HEAPS[heap].monotone:
+                print("Invalid heap code. Type 'help run' for usage.")
+                return
+            print("running...")
+            build, results = run.hierarchy_queries(data, queries, heap)
+            if build is None:
+                print(f"\nRead the contraction hierarchy of {args[2]}")
+            else:
+                print(f"\nBuilt the contraction hierarchy of {args[2]} in {build:.5} s")
+            print(f"{queries} point to point queries ({heap} heap)")
+            for search, (time, settled) in results.items():
+                print(f"  {search:<20}{time:.5} s, {settled:.2%} settled")
+            saved = (results["full"][0] - results["hierarchy"][0]) / max(queries, 1)
+            if build is not None and saved > 0:
+                print(f"  building pays off after {build / saved:,.0f} queries")
+            print()
+        elif args[1] == "bc":
+            print("running...")
+            time = run.dijkstra_csr_binary_time(data)
+            print(f"\nBinary heap CSR runtime on {args[2]}: {time:.5} s\n")
+        elif args[1] == "mg":
+            print("running...")
+            usage = run.graph_memory(data)
+            print(f"\nMemory held by the graph {args[2]}")
+            for name, size in usage.items():
+                print(f"  {name:<20}{size:,} B")
+            print()
         else:
             print("Invalid option. Type 'help run' for usage.")
     except Exception as e:
@@ -197,23 +402,82 @@ def display_help(args: tuple[str] = ("help",)) -> None:
             "  located in the config/ directory.\n"
         )
     elif args[1] == "run":
+        registered = [(name, info) for name, info in heaps.HEAPS.items() if info.code]
+        heap_tests = "".join(
+            f"      {info.code}h -> {name} heap\n"
+            for name, info in registered
+            if not info.monotone
+        )
+        graph_tests = "".join(
+            f"      {info.code}d -> {name} heap"
+            + (" (integer weights only)\n" if info.monotone else "\n")
+            for name, info in registered
+        )
+        csr_tests = "".join(
+            f"      {info.code}c -> {name} heap\n" for name, info in registered
+        )
         print(
             "\nMeasure runtime\n"
             "  usage: run <test> <data>\n"
             "  Where <test> is one of the following:\n"
             "    Heap Operation Tests\n"
-            "      ph -> pairing heap\n"
-            "      fh -> Fibonacci heap\n"
+            f"{heap_tests}"
+            "      pm -> multipass pairing heap\n"
+            "      pa -> auxiliary two pass pairing heap\n"
+            "      pb -> pairing heap with batched operations\n"
+            "      ah -> pairing heap stored in integer arrays\n"
+            "      fb -> Fibonacci heap with batched operations\n"
             "      bh -> binary heap\n"
             "      nh -> do not use a heap\n"
+            "      mh -> memory per node of each heap\n"
+            "      mp -> memory allocated by pops\n"
             "    Dijkstra Graph Tests (single source shortest path on a graph)\n"
-            "      pd -> use a pairing heap\n"
-            "      fd -> use a Fibonacci heap\n"
-            "      bd -> use a binary heap\n"
+            f"{graph_tests}"
+            "      bd -> binary heap\n"
             "      nd -> do not use a heap\n"
+            "      vd -> do not use a heap, scan an adjacency matrix with NumPy\n"
+            "      ms -> many sources on a process pool\n"
+            "      ds -> delta-stepping on a process pool\n"
+            "      lr -> repeated sources with an LRU cache of shortest path trees\n"
+            "      up -> repair shortest paths after edge changes\n"
+            "      sv -> query latency through the server\n"
+            "      ks -> k shortest paths with Yen's algorithm\n"
+            "      st -> point to point queries: full, early exit, bidirectional\n"
+            "      as -> point to point queries with A* (geometric graphs only)\n"
+            "      lm -> point to point queries with A* and landmarks\n"
+            "      ch -> point to point queries with a contraction hierarchy\n"
+            "    Dijkstra CSR Graph Tests (the graph is stored in flat arrays)\n"
+            f"{csr_tests}"
+            "      bc -> binary heap\n"
+            "      mg -> memory held by the graph in each format\n"
             "  And <data> is the name of the test data file,\n"
             "  located in the data/ directory. Be sure to use the correct\n"
             "  data for a test.\n"
+            "  The d-ary tests take an optional arity after <data>,\n"
+            f"  e.g. 'run dd dense 8'. Defaults to {daryheap.DEFAULT_ARITY}.\n"
+            "  The ms test takes an optional number of sources and workers,\n"
+            "  e.g. 'run ms dense 1000 4'. Defaults to 100 sources, one\n"
+            "  worker per CPU.\n"
+            "  The ds test takes an optional bucket width and most workers,\n"
+            "  e.g. 'run ds big 0 8'. A width of 0 picks one from the weights.\n"
+            "  Runs with 1, 2, 4, ... workers. Defaults to one per CPU.\n"
+            "  The lr test takes an optional number of searches, sources, cache\n"
+            "  megabytes and 'disk', e.g. 'run lr sparse 100 10 64 disk'.\n"
+            "  The up test takes an optional heap code and number of batch\n"
+            "  sizes, e.g. 'run up sparse f 3' for batches of 1, 10 and 100.\n"
+            "  The sv test takes an optional number of queries and workers,\n"
+            "  e.g. 'run sv road 1000 4'. See app/server.py to serve a graph.\n"
+            "  The ks test takes optional k, number of queries and heap codes,\n"
+            "  e.g. 'run ks road 10 5 pfi' for pairing, Fibonacci and indexed\n"
+            "  binary heaps.\n"
+            "  The st test takes an optional number of queries and heap code,\n"
+            "  e.g. 'run st sparse 500 f'. Defaults to 100 queries, pairing.\n"
+            "  The as test takes an optional number of queries.\n"
+            "  The lm test takes an optional number of landmarks and queries,\n"
+            "  e.g. 'run lm sparse 16 500'. The landmark index is saved next to\n"
+            "  the graph and reused.\n"
+            "  The ch test takes an optional number of queries and heap code,\n"
+            "  like st. The hierarchy is saved next to the graph and reused.\n"
         )
     elif args.count("help") > 2:
         print("same qq")
@@ -2,30 +2,103 @@
 
 """Conduct runtime tests on heaps."""
 
+import os
 import sys
 from pathlib import Path
 from timeit import default_timer
+import tracemalloc
+from array import array
 from heapq import heappop, heappush
+from itertools import islice
+from random import choice, randrange
+from typing import Callable
 
 sys.path.append(str(Path(__file__).parent.parent.absolute()))
 
-from util import pairingheap, fibonacciheap, graph
+from util import pairingheap, arraypairingheap, fibonacciheap, heaps, graph
+from util import ssspcache
 
 
-def pairing_time(testdata: Path) -> float:
-    """Executes a heap test using a pairing heap.
+def heap_time(testdata: Path, name: str, *args) -> float:
+    """Executes a heap test using a registered heap. Leading adds go through
+    add_many if the heap has it.
 
     Args:
         test_data (Path): The test data.
+        name (str): The name of the heap in heaps.HEAPS.
+        *args: Passed to the heap's factory, e.g. the arity of a d-ary heap.
 
     Raises:
         Exception: If the data could not be read.
+        ValueError: If the heap is monotone and cannot replay the test.
 
     Returns:
         float: Execution time in seconds.
     """
 
+    if heaps.HEAPS[name].monotone:
+        raise ValueError(f"The {name} heap only runs Dijkstra's")
     ops = read_operations(testdata)
+    keys = leading_adds(ops)
+    start = default_timer()
+    heap = heaps.make(name, *args)
+    if hasattr(heap, "add_many"):
+        nodes = heap.add_many(keys)
+    else:
+        nodes = [heap.add(key) for key in keys]
+    for o in islice(ops, len(keys), None):
+        if o[0] == "d":
+            heap.decreasekey(nodes[o[1]], o[2])
+        elif o[0] == "a":
+            nodes.append(heap.add(o[1]))
+        else:
+            heap.pop()
+    stop = default_timer()
+    return stop - start
+
+
+def array_pairing_time(testdata: Path) -> float:
+    """Executes a heap test using a pairing heap stored in integer arrays.
+
+    Args:
+        test_data (Path): The test data.
+
+    Raises:
+        Exception: If the data could not be read.
+
+    Returns:
+        float: Execution time in seconds.
+    """
+
+    ops = read_operations(testdata)
+    start = default_timer()
+    heap = arraypairingheap.Heap(len(ops))
+    for o in ops:
+        if o[0] == "d":
+            # handles are given out in add order
+            heap.decreasekey(o[1], o[2])
+        elif o[0] == "a":
+            heap.add(o[1])
+        else:
+            heap.pop()
+    stop = default_timer()
+    return stop - start
+
+
+def pairing_batch_time(testdata: Path) -> float:
+    """Executes a heap test using a pairing heap and batched operations.
+
+    Args:
+        test_data (Path): The test data.
+
+    Raises:
+        Exception: If the data could not be read.
+
+    Returns:
+        float: Execution time in seconds.
+    """
+
+    ops = batch_operations(read_operations(testdata))
     start = default_timer()
     heap = pairingheap.Heap()
     nodes = []
@@ -34,14 +107,22 @@ def pairing_time(testdata: Path) -> float:
             heap.decreasekey(nodes[o[1]], o[2])
         elif o[0] == "a":
             nodes.append(heap.add(o[1]))
-        else:
+        elif o[0] == "p":
             heap.pop()
+        elif o[0] == "ap":
+            nodes.append(heap.pushpop(o[1])[1])
+        elif o[0] == "dn":
+            heap.decreasekey_many([(nodes[i], key) for i, key in o[1]])
+        elif o[0] == "an":
+            nodes += heap.add_many(o[1])
+        else:
+            heap.pop_many(o[1])
     stop = default_timer()
     return stop - start
 
 
-def fibonacci_time(testdata: Path) -> float:
-    """Executes a heap test using a Fibonacci heap.
+def fibonacci_batch_time(testdata: Path) -> float:
+    """Executes a heap test using a Fibonacci heap and batched operations.
 
     Args:
         test_data (Path): The test data.
@@ -53,7 +134,7 @@ def fibonacci_time(testdata: Path) -> float:
         float: Execution time in seconds.
     """
 
-    ops = read_operations(testdata)
+    ops = batch_operations(read_operations(testdata))
     start = default_timer()
     heap = fibonacciheap.Heap()
     nodes = []
@@ -62,8 +143,16 @@ def fibonacci_time(testdata: Path) -> float:
             heap.decreasekey(nodes[o[1]], o[2])
         elif o[0] == "a":
             nodes.append(heap.add(o[1]))
-        else:
+        elif o[0] == "p":
             heap.pop()
+        elif o[0] == "ap":
+            nodes.append(heap.pushpop(o[1])[1])
+        elif o[0] == "dn":
+            heap.decreasekey_many([(nodes[i], key) for i, key in o[1]])
+        elif o[0] == "an":
+            nodes += heap.add_many(o[1])
+        else:
+            heap.pop_many(o[1])
     stop = default_timer()
     return stop - start
 
@@ -136,11 +225,89 @@ def noheap_time(testdata: Path) -> float:
     return stop - start
 
 
-def dijkstra_pairing_time(graphdata: Path) -> float:
-    """Executes Dijkstra's with a pairing heap.
+def node_memory(testdata: Path) -> dict[str, float]:
+    """Measures the memory used per node by each node based heap. Only the
+    add operations of the test are used.
+
+    Args:
+        test_data (Path): The test data.
+
+    Raises:
+        Exception: If the data could not be read.
+
+    Returns:
+        dict[str, float]: Heap name -> bytes allocated per added node.
+    """
+
+    keys = [o[1] for o in read_operations(testdata) if o[0] == "a"]
+    if min(keys, default=0) < 0:
+        # radix heaps only hold non-negative keys
+        low = min(keys)
+        keys = [key - low for key in keys]
+    res = {}
+    for name in heaps.HEAPS:
+        heap = heaps.make(name)
+        tracemalloc.start()
+        for i, key in enumerate(keys):
+            heap.add(key, i)
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        res[name] = used / max(len(keys), 1)
+        del heap
+    # array heap nodes have no payload
+    heap = arraypairingheap.Heap()
+    tracemalloc.start()
+    for key in keys:
+        heap.add(key)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    res["array pairing"] = used / max(len(keys), 1)
+    return res
+
+
+def pop_memory(testdata: Path) -> dict[str, int]:
+    """Measures the most memory a pop allocates on top of the heap itself.
+    Every key added by the test is loaded, then the heap is emptied with
+    pops while all nodes are kept alive.
+
+    Args:
+        test_data (Path): The test data.
+
+    Raises:
+        Exception: If the data could not be read.
+
+    Returns:
+        dict[str, int]: Heap name -> peak bytes allocated while popping.
+    """
+
+    keys = [o[1] for o in read_operations(testdata) if o[0] == "a"]
+    res = {}
+    for name in ("pairing", "Fibonacci"):
+        heap = heaps.make(name)
+        nodes = heap.add_many(keys)
+        # one pop so the Fibonacci degree table is already sized
+        heap.pop()
+        tracemalloc.start()
+        # reading the counters allocates too, so measure that first
+        start = tracemalloc.get_traced_memory()[0]
+        overhead = tracemalloc.get_traced_memory()[1] - start
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        while heap.size:
+            heap.pop()
+        res[name] = tracemalloc.get_traced_memory()[1] - start - overhead
+        tracemalloc.stop()
+        del heap, nodes
+    return res
+
+
+def dijkstra_time(graphdata: Path, name: str, *args) -> float:
+    """Executes Dijkstra's with a registered heap.
 
     Args:
         graphdata (Path): The file with the graph.
+        name (str): The name of the heap in heaps.HEAPS.
+        *args: Passed to the heap's factory, e.g. the arity of a d-ary heap.
 
     Raises:
         Exception: If the test could not be read.
@@ -151,13 +318,13 @@ def dijkstra_pairing_time(graphdata: Path) -> float:
 
     adj_list = read_graph(graphdata)
     start = default_timer()
-    graph.dijkstra_ssp_pairingheap(adj_list, 0)
+    graph.dijkstra_ssp(adj_list, 0, heaps.make(name, *args))
     stop = default_timer()
     return stop - start
 
 
-def dijkstra_fibonacci_time(graphdata: Path) -> float:
-    """Executes Dijkstra's with a Fibonacci heap.
+def dijkstra_binary_time(graphdata: Path) -> float:
+    """Executes Dijkstra's with a binary heap.
 
     Args:
         graphdata (Path): The file with the graph.
@@ -171,16 +338,18 @@ def dijkstra_fibonacci_time(graphdata: Path) -> float:
 
     adj_list = read_graph(graphdata)
     start = default_timer()
-    graph.dijkstra_ssp_fibonacciheap(adj_list, 0)
+    graph.dijkstra_ssp_binaryheap(adj_list, 0)
     stop = default_timer()
     return stop - start
 
 
-def dijkstra_binary_time(graphdata: Path) -> float:
-    """Executes Dijkstra's with a binary heap.
+def dijkstra_csr_time(graphdata: Path, name: str, *args) -> float:
+    """Executes Dijkstra's on a CSR graph with a registered heap.
 
     Args:
         graphdata (Path): The file with the graph.
+        name (str): The name of the heap in heaps.HEAPS.
+        *args: Passed to the heap's factory, e.g. the arity of a d-ary heap.
 
     Raises:
         Exception: If the test could not be read.
@@ -189,13 +358,483 @@ def dijkstra_binary_time(graphdata: Path) -> float:
         float: Execution time in seconds.
     """
 
-    adj_list = read_graph(graphdata)
+    g = read_csr_graph(graphdata)
     start = default_timer()
-    graph.dijkstra_ssp_binaryheap(adj_list, 0)
+    graph.dijkstra_ssp_csr(g, 0, heaps.make(name, *args))
     stop = default_timer()
     return stop - start
 
 
+def dijkstra_csr_binary_time(graphdata: Path) -> float:
+    """Executes Dijkstra's on a CSR graph with a binary heap.
+
+    Args:
+        graphdata (Path): The file with the graph.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        float: Execution time in seconds.
+    """
+
+    g = read_csr_graph(graphdata)
+    start = default_timer()
+    graph.dijkstra_ssp_csr_binaryheap(g, 0)
+    stop = default_timer()
+    return stop - start
+
+
+def dijkstra_dense_time(graphdata: Path) -> float:
+    """Executes Dijkstra's on an adjacency matrix with NumPy vector
+    operations instead of a heap.
+
+    Args:
+        graphdata (Path): The file with the graph.
+
+    Raises:
+        Exception: If the test could not be read.
+        ImportError: If NumPy is not installed.
+
+    Returns:
+        float: Execution time in seconds.
+    """
+
+    matrix = graph.dense_matrix(read_csr_graph(graphdata))
+    start = default_timer()
+    graph.dijkstra_ssp_dense(matrix, 0)
+    stop = default_timer()
+    return stop - start
+
+
+def dijkstra_multi_time(
+    graphdata: Path, sources: int = 100, workers: int = None
+) -> float:
+    """Executes Dijkstra's from many sources on a process pool.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        sources (int, optional): The number of sources, spread evenly over
+            the vertices. Defaults to 100.
+        workers (int, optional): The number of processes. 1 runs without a
+            pool. Defaults to the number of CPUs.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        float: Execution time in seconds, including starting the pool and
+            sharing the graph.
+    """
+
+    g = read_csr_graph(graphdata)
+    step = max(len(g) // max(sources, 1), 1)
+    start = default_timer()
+    for _ in graph.dijkstra_msp(g, range(0, len(g), step)[:sources], workers=workers):
+        pass
+    stop = default_timer()
+    return stop - start
+
+
+def delta_stepping_time(
+    graphdata: Path, delta: int = None, workers: int = None
+) -> tuple[float, dict[int, float]]:
+    """Executes delta-stepping with more and more processes, doubling from
+    one, and Dijkstra's on the same CSR graph for comparison.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        delta (int, optional): The bucket width. Defaults to graph.auto_delta.
+        workers (int, optional): The most processes to run with. Defaults to
+            the number of CPUs.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        tuple[float, dict[int, float]]: (Dijkstra's time in seconds,
+            processes -> delta-stepping time in seconds, including starting
+            the pool and sharing the graph)
+    """
+
+    g = read_csr_graph(graphdata)
+    workers = workers or os.cpu_count() or 1
+    counts = [1 << i for i in range(workers.bit_length()) if 1 << i < workers]
+    start = default_timer()
+    graph.dijkstra_ssp_csr_binaryheap(g, 0)
+    stop = default_timer()
+    res = {}
+    for count in counts + [workers]:
+        start_ds = default_timer()
+        graph.delta_stepping(g, 0, delta, count)
+        res[count] = default_timer() - start_ds
+    return stop - start, res
+
+
+def cache_time(
+    graphdata: Path,
+    queries: int = 100,
+    sources: int = 10,
+    max_bytes: int = 1 << 26,
+    disk: bool = False,
+) -> tuple[float, float, ssspcache.Cache]:
+    """Executes Dijkstra's from sources picked at random out of a few
+    popular ones, with and without a shortest path tree cache.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        queries (int, optional): The number of searches. Defaults to 100.
+        sources (int, optional): The number of popular sources. Defaults to
+            10.
+        max_bytes (int, optional): The most bytes of trees the cache keeps
+            in memory. Defaults to 64 MiB.
+        disk (bool, optional): Whether the cache keeps every tree on disk
+            too, in <graphdata>.sssp/. Defaults to False.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        tuple[float, float, ssspcache.Cache]: (execution time in seconds
+            without the cache, with the cache, the cache and its counters)
+    """
+
+    adj_list = read_graph(graphdata)
+    popular = [randrange(len(adj_list)) for _ in range(sources)]
+    picks = [choice(popular) for _ in range(queries)]
+    start = default_timer()
+    for src in picks:
+        ssspcache.solve(adj_list, src)
+    stop = default_timer()
+    directory = graphdata.with_name(graphdata.name + ".sssp") if disk else None
+    cache = ssspcache.Cache(max_bytes, directory)
+    start_cached = default_timer()
+    key = ssspcache.fingerprint(adj_list)
+    for src in picks:
+        cache.sssp(adj_list, src, key)
+    stop_cached = default_timer()
+    return stop - start, stop_cached - start_cached, cache
+
+
+def repair_time(
+    graphdata: Path, name: str = "pairing", batches: int = 4, rounds: int = 5
+) -> dict[int, tuple[float, float, float]]:
+    """Times repairing shortest paths after batches of random edge changes
+    against running Dijkstra's again, for batches of 1, 10, 100, ... edges.
+    A third of the changes add an edge and the rest give an edge a random
+    weight up to twice the old one.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        name (str, optional): The name of the heap in heaps.HEAPS. Defaults
+            to "pairing".
+        batches (int, optional): The number of batch sizes. Defaults to 4.
+        rounds (int, optional): The number of batches of each size. Defaults
+            to 5.
+
+    Raises:
+        Exception: If the test could not be read.
+        AssertionError: If a repair disagrees with Dijkstra's.
+
+    Returns:
+        dict[int, tuple[float, float, float]]: Batch size -> (repair time in
+            seconds, Dijkstra's time in seconds, average fraction of
+            vertices settled per repair)
+    """
+
+    adj_list = read_graph(graphdata)
+    n = len(adj_list)
+    maxweight = max((w for edges in adj_list for w, _ in edges), default=0)
+    dyn = graph.DynamicShortestPaths(adj_list, 0, name)
+    res = {}
+    for size in (10**i for i in range(batches)):
+        repair = full = settled = 0
+        for _ in range(rounds):
+            changes = []
+            for _ in range(size):
+                u = randrange(n)
+                if randrange(3) == 0 or not dyn.out[u]:
+                    changes.append((u, randrange(n), randrange(maxweight + 1)))
+                else:
+                    v = choice(list(dyn.out[u]))
+                    changes.append((u, v, randrange(2 * dyn.out[u][v] + 1)))
+            start = default_timer()
+            settled += dyn.update(changes)
+            repair += default_timer() - start
+            current = dyn.adj_list()
+            start = default_timer()
+            exp = graph.dijkstra_ssp(current, 0, heaps.make(name))
+            full += default_timer() - start
+            assert dyn.result().dist == exp.dist, "Repair disagrees with Dijkstra's"
+        res[size] = (repair, full, settled / max(rounds * n, 1))
+    return res
+
+
+def k_shortest_time(
+    graphdata: Path, names: list[str], k: int = 10, queries: int = 5
+) -> dict[str, tuple[float, float, float, float]]:
+    """Times Yen's k shortest paths between random vertices with each heap,
+    with plain Dijkstra's spur searches and with spur searches that reuse
+    the tree of distances to the target.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        names (list[str]): The names of heaps in heaps.HEAPS.
+        k (int, optional): The number of paths per query. Defaults to 10.
+        queries (int, optional): The number of queries. Defaults to 5.
+
+    Raises:
+        Exception: If the test could not be read.
+        AssertionError: If the heaps disagree.
+
+    Returns:
+        dict[str, tuple[float, float, float, float]]: Heap -> (plain time in
+            seconds, average vertices settled per query, time with the tree
+            in seconds, average vertices settled per query)
+    """
+
+    adj_list = read_graph(graphdata)
+    n = len(adj_list)
+    pairs = [(randrange(n), randrange(n)) for _ in range(queries)]
+    res = {}
+    exp = None
+    for name in names:
+        row = []
+        for reuse in (False, True):
+            settled = 0
+            dists = []
+            start = default_timer()
+            for src, dst in pairs:
+                paths, count = graph.yen(adj_list, src, dst, k, name, reuse)
+                settled += count
+                dists.append([d for d, _ in paths])
+            row += [default_timer() - start, settled / max(queries, 1)]
+            exp = exp or dists
+            assert dists == exp, f"{name} heap disagrees on path lengths"
+        res[name] = tuple(row)
+    return res
+
+
+def point_to_point(
+    graphdata: Path, name: str = "pairing", queries: int = 100
+) -> dict[str, tuple[float, float]]:
+    """Times queries between random pairs of vertices with a full search,
+    an early exit search and a bidirectional search.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        name (str, optional): The name of the heap in heaps.HEAPS. Defaults
+            to "pairing".
+        queries (int, optional): The number of queries. Defaults to 100.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        dict[str, tuple[float, float]]: Search -> (execution time in seconds,
+            average fraction of vertices settled per query)
+    """
+
+    adj_list = read_graph(graphdata)
+    n = len(adj_list)
+    pairs = [(randrange(n), randrange(n)) for _ in range(queries)]
+    searches = {
+        "full": lambda src, dst: (
+            None,
+            None,
+            graph.dijkstra_ssp(adj_list, src, heaps.make(name)).reached(),
+        ),
+        "early exit": lambda src, dst: graph.dijkstra_st(
+            adj_list, src, dst, heaps.make(name)
+        ),
+        "bidirectional": lambda src, dst: graph.dijkstra_bidirectional(
+            adj_list, src, dst, name
+        ),
+    }
+    return time_queries(searches, pairs, n)
+
+
+def astar_queries(
+    graphdata: Path, queries: int = 100
+) -> dict[str, tuple[float, float, float, float]]:
+    """Times queries between random pairs of vertices of a geometric graph
+    with early exit Dijkstra's and with A* on every registered heap.
+
+    Args:
+        graphdata (Path): The file with the geometric graph.
+        queries (int, optional): The number of queries. Defaults to 100.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        dict[str, tuple[float, float, float, float]]: Heap name ->
+            (Dijkstra's time in seconds, fraction of vertices it settled,
+            A* time in seconds, fraction of vertices it settled)
+    """
+
+    adj_list = read_graph(graphdata)
+    coords = read_coords(graphdata)
+    n = len(adj_list)
+    pairs = [(randrange(n), randrange(n)) for _ in range(queries)]
+    heuristics = [graph.euclidean(coords, dst) for _, dst in pairs]
+    res = {}
+    for name in heaps.HEAPS:
+        settled = 0
+        start = default_timer()
+        for src, dst in pairs:
+            settled += graph.dijkstra_st(adj_list, src, dst, heaps.make(name))[2]
+        stop = default_timer()
+        dijkstra = (stop - start, settled / max(queries * n, 1))
+        settled = 0
+        start = default_timer()
+        for (src, dst), heuristic in zip(pairs, heuristics):
+            settled += graph.astar(adj_list, src, dst, heaps.make(name), heuristic)[2]
+        stop = default_timer()
+        res[name] = dijkstra + (stop - start, settled / max(queries * n, 1))
+    return res
+
+
+def landmark_queries(
+    graphdata: Path, landmarks: int = 16, queries: int = 100, name: str = "pairing"
+) -> tuple[float, dict[str, tuple[float, float]]]:
+    """Times queries between random pairs of vertices with a full search,
+    an early exit search and A* with landmark bounds. The landmark index is
+    stored next to the graph as <graphdata>.alt with a fingerprint of the
+    graph, and is only built if it is missing, was built for another graph
+    or has a different number of landmarks.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        landmarks (int, optional): The number of landmarks. Defaults to 16.
+        queries (int, optional): The number of queries. Defaults to 100.
+        name (str, optional): The name of the heap in heaps.HEAPS. Defaults
+            to "pairing".
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        tuple[float, dict[str, tuple[float, float]]]: (seconds to build the
+            index or None if it was read from disk, search -> (execution
+            time in seconds, average fraction of vertices settled per query))
+    """
+
+    adj_list = read_graph(graphdata)
+    n = len(adj_list)
+    key = ssspcache.fingerprint(adj_list)
+    indexdata = graphdata.with_name(graphdata.name + ".alt")
+    try:
+        index = graph.Landmarks.load(indexdata, key)
+    except (OSError, ValueError):
+        index = None
+    build = None
+    k = min(landmarks, n)
+    if not index or len(index) != k or len(index.dist) != n * k:
+        start = default_timer()
+        index = graph.Landmarks.build(adj_list, landmarks, name)
+        build = default_timer() - start
+        index.save(indexdata, key)
+    pairs = [(randrange(n), randrange(n)) for _ in range(queries)]
+    searches = {
+        "full": lambda src, dst: (
+            None,
+            None,
+            graph.dijkstra_ssp(adj_list, src, heaps.make(name)).reached(),
+        ),
+        "early exit": lambda src, dst: graph.dijkstra_st(
+            adj_list, src, dst, heaps.make(name)
+        ),
+        "landmarks": lambda src, dst: graph.astar(
+            adj_list, src, dst, heaps.make(name), index.heuristic(dst)
+        ),
+    }
+    return build, time_queries(searches, pairs, n)
+
+
+def hierarchy_queries(
+    graphdata: Path, queries: int = 100, name: str = "pairing"
+) -> tuple[float, dict[str, tuple[float, float]]]:
+    """Times queries between random pairs of vertices with a full search,
+    an early exit search and a contraction hierarchy. The hierarchy is
+    stored next to the graph as <graphdata>.ch with a fingerprint of the
+    graph. It is built again if it is missing, was built for another graph
+    or disagrees with an early exit search on one query after loading.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        queries (int, optional): The number of queries. Defaults to 100.
+        name (str, optional): The name of the heap in heaps.HEAPS, used to
+            order vertices and by the Dijkstra searches. Defaults to
+            "pairing".
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        tuple[float, dict[str, tuple[float, float]]]: (seconds to build the
+            hierarchy or None if it was read from disk, search -> (execution
+            time in seconds, average fraction of vertices settled per query))
+    """
+
+    adj_list = read_graph(graphdata)
+    n = len(adj_list)
+    key = ssspcache.fingerprint(adj_list)
+    chdata = graphdata.with_name(graphdata.name + ".ch")
+    try:
+        ch = graph.Hierarchy.load(chdata, key)
+    except (OSError, ValueError):
+        ch = None
+    if ch and n:
+        src, dst = randrange(n), randrange(n)
+        exp = graph.dijkstra_st(adj_list, src, dst, heaps.make(name))[0]
+        if len(ch) != n or ch.query(src, dst)[0] != exp:
+            ch = None
+    build = None
+    if not ch:
+        start = default_timer()
+        ch = graph.Hierarchy.build(adj_list, name)
+        build = default_timer() - start
+        ch.save(chdata, key)
+    pairs = [(randrange(n), randrange(n)) for _ in range(queries)]
+    searches = {
+        "full": lambda src, dst: (
+            None,
+            None,
+            graph.dijkstra_ssp(adj_list, src, heaps.make(name)).reached(),
+        ),
+        "early exit": lambda src, dst: graph.dijkstra_st(
+            adj_list, src, dst, heaps.make(name)
+        ),
+        "hierarchy": ch.query,
+    }
+    return build, time_queries(searches, pairs, n)
+
+
+def graph_memory(graphdata: Path) -> dict[str, int]:
+    """Measures the memory held by a graph read as an adjacency list and as
+    CSR arrays.
+
+    Args:
+        graphdata (Path): The file with the graph.
+
+    Raises:
+        Exception: If the graph could not be read.
+
+    Returns:
+        dict[str, int]: Graph format -> bytes held after reading.
+    """
+
+    res = {}
+    for name, reader in (("adjacency list", read_graph), ("CSR", read_csr_graph)):
+        tracemalloc.start()
+        g = reader(graphdata)
+        res[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del g
+    return res
+
+
 def dijkstra_noheap_time(graphdata: Path) -> float:
     """Executes Dijkstra's without a heap.
 
@@ -249,6 +888,99 @@ def read_operations(testdata: Path) -> tuple[int, list[tuple]]:
     return ops
 
 
+def leading_adds(ops: list[tuple]) -> list[int]:
+    """Finds the keys added before any other operation, which is the initial
+    heap of a test.
+
+    Args:
+        ops (list[tuple]): Commands from read_operations.
+
+    Returns:
+        list[int]: The keys, in order.
+    """
+
+    keys = []
+    for o in ops:
+        if o[0] != "a":
+            break
+        keys.append(o[1])
+    return keys
+
+
+def batch_operations(ops: list[tuple]) -> list[tuple]:
+    """Groups runs of the same heap operation into batches. Operations that
+    are not part of a run are left as they are.
+
+    Args:
+        ops (list[tuple]): Commands from read_operations.
+
+    Returns:
+        list[tuple]: A list of all commands in the following form:
+
+            ("d", index, key) decrease key at the index
+            ("a", key) add key
+            ("p") pop minimum
+            ("dn", [(index, key)]) decrease keys at the indices
+            ("an", [key]) add keys
+            ("pn", count) pop minimum count times
+            ("ap", key) add key then pop minimum
+    """
+
+    batches = []
+    i = 0
+    while i < len(ops):
+        o = ops[i]
+        j = i + 1
+        if o[0] == "a" and j < len(ops) and ops[j][0] == "p":
+            batches.append(("ap", o[1]))
+            i += 2
+            continue
+        while j < len(ops) and ops[j][0] == o[0]:
+            j += 1
+        if o[0] == "a" and j < len(ops) and ops[j][0] == "p":
+            # leave the last add to be fused with the pop
+            j -= 1
+        if j - i == 1:
+            batches.append(o)
+        elif o[0] == "d":
+            batches.append(("dn", [(d[1], d[2]) for d in ops[i:j]]))
+        elif o[0] == "a":
+            batches.append(("an", [a[1] for a in ops[i:j]]))
+        else:
+            batches.append(("pn", j - i))
+        i = j
+    return batches
+
+
+def time_queries(
+    searches: dict[str, Callable[[int, int], tuple]],
+    pairs: list[tuple[int]],
+    vertices: int,
+) -> dict[str, tuple[float, float]]:
+    """Times point to point searches on the same queries.
+
+    Args:
+        searches (dict[str, Callable[[int, int], tuple]]): Search name ->
+            function of (src, dst) returning (distance, path, settled).
+        pairs (list[tuple[int]]): (src, dst) for each query.
+        vertices (int): The number of vertices in the graph.
+
+    Returns:
+        dict[str, tuple[float, float]]: Search -> (execution time in seconds,
+            average fraction of vertices settled per query)
+    """
+
+    res = {}
+    for search, query in searches.items():
+        settled = 0
+        start = default_timer()
+        for src, dst in pairs:
+            settled += query(src, dst)[2]
+        stop = default_timer()
+        res[search] = (stop - start, settled / max(len(pairs) * vertices, 1))
+    return res
+
+
 def read_graph(graphdata: Path) -> list[list[tuple[int]]]:
     """Reads a graph from a file.
 
@@ -269,10 +1001,66 @@ def read_graph(graphdata: Path) -> list[list[tuple[int]]]:
             raise ValueError("This is not a graph")
         n = int(info[1])
         adj_list = [[] for _ in range(n)]
-        for u, line in enumerate(dat):
+        for u, line in enumerate(islice(dat, n)):
             edges = line.split()
             for e in edges:
                 w, v = map(int, e.split(","))
                 adj_list[u].append((w, v))
                 adj_list[v].append((w, u))
     return adj_list
+
+
+def read_csr_graph(graphdata: Path) -> graph.CSRGraph:
+    """Reads a graph from a file into CSR arrays without making a tuple per
+    edge. Holds the same edges in the same order as read_graph.
+
+    Args:
+        graphdata (Path): The file to read the graph from.
+
+    Raises:
+        ValueError: If the graph could not be read.
+
+    Returns:
+        graph.CSRGraph: The graph.
+    """
+
+    tails = array(graph.TARGET_TYPE)
+    heads = array(graph.TARGET_TYPE)
+    weights = array("q")
+    with graphdata.open(mode="r") as dat:
+        info = dat.readline().split()
+        if info[0] != "graph":
+            raise ValueError("This is not a graph")
+        n = int(info[1])
+        for u, line in enumerate(islice(dat, n)):
+            # "w,v w,v ..." -> w v w v ...
+            nums = array("q", map(int, line.replace(",", " ").split()))
+            weights.extend(nums[::2])
+            heads.extend(array(graph.TARGET_TYPE, nums[1::2]))
+            tails.extend(array(graph.TARGET_TYPE, [u]) * (len(nums) // 2))
+    return graph.CSRGraph.from_edges(n, tails, heads, weights, undirected=True)
+
+
+def read_coords(graphdata: Path) -> list[tuple[int]]:
+    """Reads the vertex coordinates of a geometric graph file.
+
+    Args:
+        graphdata (Path): The file to read the coordinates from.
+
+    Raises:
+        ValueError: If the file has no coordinates.
+
+    Returns:
+        list[tuple[int]]: coords[vertex index] = (x, y)
+    """
+
+    with graphdata.open(mode="r") as dat:
+        info = dat.readline().split()
+        if info[0] != "graph":
+            raise ValueError("This is not a graph")
+        n = int(info[1])
+        for _ in islice(dat, n):
+            pass
+        if dat.readline().strip() != "coords":
+            raise ValueError("This graph has no coordinates")
+        return [tuple(map(int, line.split())) for line in islice(dat, n)]
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3.9
+
+"""Serves shortest path queries on one graph as JSON lines. The graph is
+read once and copied into shared memory, an asyncio front end gathers
+queries into batches, and a process pool answers them. Queries in a batch
+with the same source share one search, and each worker keeps recent trees
+in an ssspcache.Cache.
+
+Each request is one JSON object per line. "dst" asks for one distance and
+path, and without it the distances to every vertex come back, -1 for
+vertices that cannot be reached. {"op": "stats"} reports latency
+percentiles in milliseconds.
+
+Example:
+    $ python3 app/server.py road --socket /tmp/road.sock
+    $ echo '{"id": 1, "src": 0, "dst": 5}' | python3 app/server.py road
+    {"id": 1, "dist": 12, "path": [0, 3, 5]}
+
+Attributes:
+    LATENCY_WINDOW (int): The number of recent latencies kept for stats.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from random import choice, randrange
+from timeit import default_timer
+from typing import Optional
+
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+import run
+from util import graph, heaps, ssspcache
+
+LATENCY_WINDOW = 100000
+
+# the graph and cache a pool worker reads, set once per process by
+# _init_worker
+_worker_shm = None
+_worker_graph = None
+_worker_cache = None
+_worker_key = None
+
+
+def _init_worker(
+    name: str, vertices: int, edges: int, key: str, heap: str, max_bytes: int
+) -> None:
+    """Attaches a pool worker to the shared graph and gives it a cache.
+
+    Args:
+        name (str): The name of the shared memory block.
+        vertices (int): The number of vertices.
+        edges (int): The number of edges.
+        key (str): The fingerprint of the graph.
+        heap (str or None): The name of a heap in heaps.HEAPS, or None for
+            heapq.
+        max_bytes (int): The most bytes of trees the worker keeps.
+    """
+
+    global _worker_shm, _worker_graph, _worker_cache, _worker_key
+    # Ctrl-C reaches the whole process group, and only the parent stops
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # the parent unlinks the block once the pool is shut down
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_graph = graph.attach_csr(_worker_shm.buf, vertices, edges)
+    _worker_cache = ssspcache.Cache(max_bytes, heap=heap)
+    _worker_key = key
+
+
+def _answer(groups: list[tuple[int, list[Optional[int]]]]) -> list[list]:
+    """Answers queries on a pool worker, one search per source.
+
+    Args:
+        groups (list[tuple[int, list[int or None]]]): (source, targets) A
+            target of None asks for every distance.
+
+    Returns:
+        list[list]: The answers for each group, in order. An answer is
+            (distance, path), both None if the target cannot be reached, or
+            the array of distances for a target of None.
+    """
+
+    res = []
+    for src, targets in groups:
+        tree = _worker_cache.sssp(_worker_graph, src, _worker_key)
+        answers = []
+        for dst in targets:
+            if dst is None:
+                answers.append(tree.dist)
+            elif tree.dist[dst] < 0:
+                answers.append((None, None))
+            else:
+                answers.append((tree.dist[dst], tree.path(dst)))
+        res.append(answers)
+    return res
+
+
+def percentiles(latencies: list[float]) -> dict[str, float]:
+    """Summarizes latencies.
+
+    Args:
+        latencies (list[float]): Latencies in seconds.
+
+    Returns:
+        dict[str, float]: "p50", "p90", "p99" and "max" in seconds. 0 for no
+            latencies.
+    """
+
+    ordered = sorted(latencies)
+    n = len(ordered)
+    res = {}
+    for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        res[label] = ordered[min(int(q * n), n - 1)] if n else 0
+    res["max"] = ordered[-1] if n else 0
+    return res
+
+
+class Server:
+    """Answers shortest path queries on one graph held in shared memory.
+
+    Attributes:
+        graph (graph.CSRGraph): The graph.
+        batch (int): The most queries sent to the pool at once.
+        window (float): The longest time in seconds a query waits for a
+            batch to fill.
+        workers (int): The number of processes.
+        pool (ProcessPoolExecutor): The workers.
+        shm (shared_memory.SharedMemory): The block holding the graph.
+        queue (asyncio.Queue or None): Queries waiting for a batch. None
+            until started.
+        gatherer (asyncio.Task or None): The task running gather. None until
+            started.
+        latencies (deque[float]): Recent latencies in seconds, from reading
+            a query to writing its answer.
+        queries (int): The number of queries answered.
+        batches (int): The number of batches sent to the pool.
+    """
+
+    def __init__(
+        self,
+        g: graph.CSRGraph,
+        heap: str = None,
+        workers: int = None,
+        batch: int = 64,
+        window: float = 0.002,
+        max_bytes: int = 1 << 26,
+    ) -> None:
+        """Copies the graph into shared memory and starts the workers.
+
+        Args:
+            g (graph.CSRGraph): The graph. Weights must be non-negative.
+            heap (str, optional): The name of a heap in heaps.HEAPS. Defaults
+                to heapq.
+            workers (int, optional): The number of processes. Defaults to
+                the number of CPUs.
+            batch (int, optional): The most queries sent to the pool at
+                once. Defaults to 64.
+            window (float, optional): The longest time in seconds a query
+                waits for a batch to fill. Defaults to 2 ms.
+            max_bytes (int, optional): The most bytes of trees each worker
+                keeps. Defaults to 64 MiB.
+        """
+
+        self.graph = g
+        self.batch = batch
+        self.window = window
+        self.workers = workers or os.cpu_count() or 1
+        self.shm = graph.share_csr(g)
+        self.pool = ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(
+                self.shm.name,
+                len(g),
+                len(g.targets),
+                ssspcache.fingerprint(g),
+                heap,
+                max_bytes,
+            ),
+        )
+        self.queue = None
+        self.gatherer = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.queries = 0
+        self.batches = 0
+
+    async def start(self) -> None:
+        """Starts gathering queries into batches. Must be called on the
+        running event loop before any query."""
+
+        self.queue = asyncio.Queue()
+        self.gatherer = asyncio.ensure_future(self.gather())
+        # the pool starts its processes on the first job, not the first query
+        await asyncio.get_running_loop().run_in_executor(self.pool, int)
+
+    def close(self) -> None:
+        """Stops the workers and frees the shared graph."""
+
+        if self.gatherer:
+            self.gatherer.cancel()
+        self.pool.shutdown(cancel_futures=True)
+        self.shm.close()
+        self.shm.unlink()
+
+    async def query(self, src: int, dst: int = None) -> any:
+        """Answers one query once its batch comes back from the pool.
+
+        Args:
+            src (int): The source index.
+            dst (int, optional): The target index. Defaults to every vertex.
+
+        Raises:
+            ValueError: If a vertex is not in the graph.
+
+        Returns:
+            tuple[int, list[int]] or array[int]: (distance, path), both None
+                if dst cannot be reached, or the distance to every vertex.
+        """
+
+        n = len(self.graph)
+        for v in (src, dst) if dst is not None else (src,):
+            # JSON true and false are bools, which isinstance counts as ints
+            if type(v) is not int or not 0 <= v < n:
+                raise ValueError(f"Not a vertex: {v}")
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((src, dst, fut))
+        return await fut
+
+    async def gather(self) -> None:
+        """Sends queries to the pool in batches, forever. A batch is sent
+        once it is full or its first query has waited for the window."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(items) < self.batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            # queries with the same source share a search, and sources are
+            # dealt out so every worker gets a share of the batch
+            groups = {}
+            for src, dst, fut in items:
+                groups.setdefault(src, []).append((dst, fut))
+            groups = list(groups.items())
+            for i in range(min(self.workers, len(groups))):
+                asyncio.ensure_future(self.solve(groups[i :: self.workers]))
+
+    async def solve(self, groups: list[tuple[int, list[tuple]]]) -> None:
+        """Answers some sources of a batch on a worker.
+
+        Args:
+            groups (list[tuple[int, list[tuple]]]): (source, [(target,
+                future)])
+        """
+
+        loop = asyncio.get_running_loop()
+        request = [(src, [dst for dst, _ in waiting]) for src, waiting in groups]
+        try:
+            answers = await loop.run_in_executor(self.pool, _answer, request)
+        except Exception as e:
+            for _, waiting in groups:
+                for _, fut in waiting:
+                    if not fut.done():
+                        fut.set_exception(e)
+            return
+        for (_, waiting), group in zip(groups, answers):
+            for (_, fut), answer in zip(waiting, group):
+                if not fut.done():
+                    fut.set_result(answer)
+
+    async def respond(self, line: bytes, start: float) -> bytes:
+        """Answers one JSON line and records its latency.
+
+        Args:
+            line (bytes): The request.
+            start (float): default_timer() when the request was read.
+
+        Returns:
+            bytes: The JSON line to send back.
+        """
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be JSON objects")
+        except ValueError as e:
+            return self.encode({"error": str(e)})
+        res = {"id": request.get("id")}
+        if request.get("op") == "stats":
+            res.update(self.stats())
+            return self.encode(res)
+        try:
+            answer = await self.query(request.get("src"), request.get("dst"))
+        except Exception as e:
+            res["error"] = str(e)
+            return self.encode(res)
+        if request.get("dst") is None:
+            res["dist"] = answer.tolist()
+        else:
+            res["dist"], res["path"] = answer
+        self.queries += 1
+        self.latencies.append(default_timer() - start)
+        return self.encode(res)
+
+    @staticmethod
+    def encode(res: dict) -> bytes:
+        """Writes a response as a JSON line."""
+
+        return json.dumps(res).encode() + b"\n"
+
+    def stats(self) -> dict[str, any]:
+        """Reports how the server is doing.
+
+        Returns:
+            dict[str, any]: The number of queries and batches, and latency
+                percentiles in milliseconds over recent queries.
+        """
+
+        res = {"queries": self.queries, "batches": self.batches}
+        for label, t in percentiles(self.latencies).items():
+            res[label + "_ms"] = round(1000 * t, 3)
+        return res
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers the requests of one socket connection. Answers are sent
+        as they finish, so they carry the request's id.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's requests.
+            writer (asyncio.StreamWriter): The connection's responses.
+        """
+
+        async def reply(line: bytes, start: float) -> None:
+            writer.write(await self.respond(line, start))
+            await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    tasks.add(asyncio.ensure_future(reply(line, default_timer())))
+                    tasks = {task for task in tasks if not task.done()}
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_socket(self, path: Path) -> None:
+        """Serves connections on a Unix socket until cancelled.
+
+        Args:
+            path (Path): The socket file. An old one is replaced.
+        """
+
+        path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self.handle, path=str(path))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+
+    async def serve_stdin(self) -> None:
+        """Answers requests from stdin on stdout until stdin closes."""
+
+        async def reply(line: bytes, start: float) -> None:
+            sys.stdout.buffer.write(await self.respond(line, start))
+            sys.stdout.buffer.flush()
+
+        tasks = set()
+        # blocking reads run on a thread, so files work as well as pipes
+        while line := await asyncio.to_thread(sys.stdin.buffer.readline):
+            if line.strip():
+                tasks.add(asyncio.ensure_future(reply(line, default_timer())))
+                tasks = {task for task in tasks if not task.done()}
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+def query_latency(
+    graphdata: Path,
+    queries: int = 1000,
+    clients: int = 16,
+    workers: int = None,
+    batch: int = 64,
+    heap: str = None,
+) -> tuple[float, float, dict[str, any]]:
+    """Times point to point queries through a server against reading the
+    graph for each query. Clients each send one query at a time and wait for
+    the answer, and a tenth of the sources repeat.
+
+    Args:
+        graphdata (Path): The file with the graph.
+        queries (int, optional): The number of queries. Defaults to 1000.
+        clients (int, optional): The number of queries in flight. Defaults
+            to 16.
+        workers (int, optional): The number of processes. Defaults to the
+            number of CPUs.
+        batch (int, optional): The most queries sent to the pool at once.
+            Defaults to 64.
+        heap (str, optional): The name of a heap in heaps.HEAPS. Defaults to
+            heapq.
+
+    Raises:
+        Exception: If the test could not be read.
+
+    Returns:
+        tuple[float, float, dict[str, any]]: (time to read the graph in
+            seconds, time for one search in seconds, server stats)
+    """
+
+    start = default_timer()
+    g = run.read_csr_graph(graphdata)
+    read = default_timer() - start
+    start = default_timer()
+    ssspcache.solve(g, 0, heap)
+    search = default_timer() - start
+    n = len(g)
+    popular = [randrange(n) for _ in range(max(queries // 10, 1))]
+    pairs = [
+        (choice(popular) if randrange(10) == 0 else randrange(n), randrange(n))
+        for _ in range(queries)
+    ]
+
+    async def client(mine: list[tuple[int]]) -> None:
+        for src, dst in mine:
+            line = json.dumps({"src": src, "dst": dst}).encode()
+            await server.respond(line, default_timer())
+
+    async def drive() -> None:
+        await server.start()
+        await asyncio.gather(*(client(pairs[i::clients]) for i in range(clients)))
+
+    server = Server(g, heap, workers, batch)
+    try:
+        asyncio.run(drive())
+    finally:
+        server.close()
+    return read, search, server.stats()
+
+
+async def serve(server: Server, path: Path = None) -> None:
+    """Runs a server on a Unix socket, or on stdin and stdout.
+
+    Args:
+        server (Server): The server.
+        path (Path, optional): The socket file. Defaults to stdin.
+    """
+
+    await server.start()
+    if path:
+        await server.serve_socket(path)
+    else:
+        await server.serve_stdin()
+
+
+def main() -> None:
+    """Reads the graph and serves queries until stdin closes or Ctrl-C."""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("data", help="a graph in data/ or the path to one")
+    parser.add_argument("--socket", type=Path, help="serve on this Unix socket")
+    parser.add_argument("--heap", default="", help="heap code, default heapq")
+    parser.add_argument("--workers", type=int, help="processes, default CPUs")
+    parser.add_argument("--batch", type=int, default=64, help="queries per batch")
+    parser.add_argument("--window", type=float, default=2, help="batch wait in ms")
+    parser.add_argument("--cache", type=int, default=64, help="MB of trees per worker")
+    args = parser.parse_args()
+    data = Path(args.data)
+    if not data.is_file():
+        data = Path(__file__).parent.parent.absolute() / "data" / args.data
+    heap = heaps.by_code(args.heap) if args.heap else None
+    if args.heap and not heap:
+        parser.error(f"invalid heap code: {args.heap}")
+    start = default_timer()
+    g = run.read_csr_graph(data)
+    print(
+        f"Read {data.name} ({len(g):,} vertices, {len(g.targets):,} edges) in "
+        f"{default_timer() - start:.5} s",
+        file=sys.stderr,
+    )
+    server = Server(
+        g, heap, args.workers, args.batch, args.window / 1000, args.cache << 20
+    )
+    try:
+        asyncio.run(serve(server, args.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        print(json.dumps(server.stats()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
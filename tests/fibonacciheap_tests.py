@@ -141,9 +141,115 @@ def heap_test(
         ), "Failed add or pop operation: heap size mismatch"
 
 
+def add_many_test(
+    size: int = 10000,
+    rep: int = 10000,
+    minval: int = MIN_VAL,
+    maxval: int = MAX_VAL,
+) -> None:
+    """Tests adding many keys at once, followed by other operations.
+
+    Args:
+        size (int): The number of keys to add at once.
+        rep (int): The repetitions of add/decrease key/pop operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    fibonacci_heap = fibonacciheap.Heap()
+    arr = [randrange(minval, maxval + 1) for _ in range(size)]
+    # the second half is added to a heap that is not empty
+    nodes = fibonacci_heap.add_many(arr[: size // 2])
+    nodes += fibonacci_heap.add_many(arr[size // 2 :])
+    assert fibonacci_heap.add_many([]) == [], "Failed add many: empty add mismatch"
+    assert fibonacci_heap.size == size, "Failed add many: size mismatch"
+    assert [node.key for node in nodes] == arr, "Failed add many: order mismatch"
+    for _ in range(rep):
+        op = randrange(3)
+        if op == 0:
+            nodes.append(fibonacci_heap.add(randrange(minval, maxval + 1)))
+        elif op == 1:
+            node = choice(nodes)
+            if node.key is not None:
+                fibonacci_heap.decreasekey(node, randrange(minval, node.key + 1))
+        elif fibonacci_heap.size:
+            node = fibonacci_heap.pop()
+            alive = [n.key for n in nodes if n.key is not None]
+            assert node.key == min(alive), "Failed add many: pop mismatch"
+            node.key = None
+    assert fibonacci_heap.size == sum(
+        n.key is not None for n in nodes
+    ), "Failed add many: heap size mismatch"
+
+
+def batch_test(
+    size: int = 1000, rep: int = 2000, minval: int = MIN_VAL, maxval: int = MAX_VAL
+) -> None:
+    """Tests the batched and fused operations.
+
+    Args:
+        size (int): The initial size of the test heap.
+        rep (int): The repetitions of batched operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    fibonacci_heap = fibonacciheap.Heap()
+    nodes = fibonacci_heap.add_many([randrange(minval, maxval + 1) for _ in range(size)])
+    for _ in range(rep):
+        alive = sorted(n.key for n in nodes if n.key is not None)
+        op = randrange(4)
+        if op == 0:
+            k = randrange(10)
+            popped = fibonacci_heap.pop_many(k)
+            exp = alive[:k]
+            assert [n.key for n in popped] == exp, "Failed pop many: value mismatch"
+            for node in popped:
+                node.key = None
+        elif op == 1:
+            pairs = []
+            keys = {}
+            for node in (choice(nodes) for _ in range(randrange(20) * bool(nodes))):
+                if node.key is not None:
+                    keys[node] = randrange(minval, keys.get(node, node.key) + 1)
+                    pairs.append((node, keys[node]))
+            fibonacci_heap.decreasekey_many(pairs)
+            for node, key in keys.items():
+                assert node.key == key, "Failed decrease many: key mismatch"
+        else:
+            key = randrange(minval, maxval + 1)
+            if op == 2:
+                popped, added = fibonacci_heap.pushpop(key)
+                exp = min(alive + [key])
+            else:
+                popped, added = fibonacci_heap.replace(key)
+                exp = alive[0] if alive else None
+                assert (popped is None) == (exp is None), "Failed replace: empty"
+            assert added.key == key, "Failed fused operation: added key mismatch"
+            nodes.append(added)
+            if popped:
+                assert popped.key == exp, "Failed fused operation: value mismatch"
+                popped.key = None
+        assert fibonacci_heap.size == sum(
+            n.key is not None for n in nodes
+        ), "Failed batch operation: heap size mismatch"
+    alive = sorted(n.key for n in nodes if n.key is not None)
+    rest = [n.key for n in fibonacci_heap.pop_many(fibonacci_heap.size + 1)]
+    assert rest == alive, "Failed pop many: value mismatch"
+
+
 if __name__ == "__main__":
     heap_test()
     decrease_test()
     remove_test()
     remove_test(size=1000, rep=1000)
+    add_many_test()
+    batch_test()
+    batch_test(size=0)
     print("Fibonacci heap passed all tests")
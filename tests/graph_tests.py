@@ -3,7 +3,10 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.absolute()))
 
-from util import graph
+from array import array
+from random import choice, randrange, seed
+from tempfile import TemporaryDirectory
+from util import graph, heaps
 
 
 def dijkstra_ssp_pairingheap_test() -> None:
@@ -17,16 +20,16 @@ def dijkstra_ssp_pairingheap_test() -> None:
         [(1, 3)],
     ]
     ans = graph.dijkstra_ssp_pairingheap(adj_list, 0)
-    assert ans[0].key == 0, "Dijkstra pairing heap distance mismatch"
-    assert ans[1].key == 0, "Dijkstra pairing heap distance mismatch"
-    assert ans[2].key == 5, "Dijkstra pairing heap distance mismatch"
-    assert ans[3].key == 2, "Dijkstra pairing heap distance mismatch"
-    assert ans[4].key == 1, "Dijkstra pairing heap distance mismatch"
-    assert ans[0].pred == ans[0], "Dijkstra pairing heap predecessor mismatch"
-    assert ans[1].pred == ans[0], "Dijkstra pairing heap predecessor mismatch"
-    assert ans[2].pred == ans[3], "Dijkstra pairing heap predecessor mismatch"
-    assert ans[3].pred == ans[4], "Dijkstra pairing heap predecessor mismatch"
-    assert ans[4].pred == ans[1], "Dijkstra pairing heap predecessor mismatch"
+    assert ans.dist[0] == 0, "Dijkstra pairing heap distance mismatch"
+    assert ans.dist[1] == 0, "Dijkstra pairing heap distance mismatch"
+    assert ans.dist[2] == 5, "Dijkstra pairing heap distance mismatch"
+    assert ans.dist[3] == 2, "Dijkstra pairing heap distance mismatch"
+    assert ans.dist[4] == 1, "Dijkstra pairing heap distance mismatch"
+    assert ans.pred[0] == 0, "Dijkstra pairing heap predecessor mismatch"
+    assert ans.pred[1] == 0, "Dijkstra pairing heap predecessor mismatch"
+    assert ans.pred[2] == 3, "Dijkstra pairing heap predecessor mismatch"
+    assert ans.pred[3] == 4, "Dijkstra pairing heap predecessor mismatch"
+    assert ans.pred[4] == 1, "Dijkstra pairing heap predecessor mismatch"
 
 
 def dijkstra_ssp_fibonacciheap_test() -> None:
@@ -40,16 +43,132 @@ def dijkstra_ssp_fibonacciheap_test() -> None:
         [(1, 3)],
     ]
     ans = graph.dijkstra_ssp_fibonacciheap(adj_list, 0)
-    assert ans[0].key == 0, "Dijkstra Fibonacci heap distance mismatch"
-    assert ans[1].key == 0, "Dijkstra Fibonacci heap distance mismatch"
-    assert ans[2].key == 5, "Dijkstra Fibonacci heap distance mismatch"
-    assert ans[3].key == 2, "Dijkstra Fibonacci heap distance mismatch"
-    assert ans[4].key == 1, "Dijkstra Fibonacci heap distance mismatch"
-    assert ans[0].pred == ans[0], "Dijkstra Fibonacci heap predecessor mismatch"
-    assert ans[1].pred == ans[0], "Dijkstra Fibonacci heap predecessor mismatch"
-    assert ans[2].pred == ans[3], "Dijkstra Fibonacci heap predecessor mismatch"
-    assert ans[3].pred == ans[4], "Dijkstra Fibonacci heap predecessor mismatch"
-    assert ans[4].pred == ans[1], "Dijkstra Fibonacci heap predecessor mismatch"
+    assert ans.dist[0] == 0, "Dijkstra Fibonacci heap distance mismatch"
+    assert ans.dist[1] == 0, "Dijkstra Fibonacci heap distance mismatch"
+    assert ans.dist[2] == 5, "Dijkstra Fibonacci heap distance mismatch"
+    assert ans.dist[3] == 2, "Dijkstra Fibonacci heap distance mismatch"
+    assert ans.dist[4] == 1, "Dijkstra Fibonacci heap distance mismatch"
+    assert ans.pred[0] == 0, "Dijkstra Fibonacci heap predecessor mismatch"
+    assert ans.pred[1] == 0, "Dijkstra Fibonacci heap predecessor mismatch"
+    assert ans.pred[2] == 3, "Dijkstra Fibonacci heap predecessor mismatch"
+    assert ans.pred[3] == 4, "Dijkstra Fibonacci heap predecessor mismatch"
+    assert ans.pred[4] == 1, "Dijkstra Fibonacci heap predecessor mismatch"
+
+
+def dijkstra_ssp_indexedheap_test() -> None:
+    """A simple test for Dijkstra's using an indexed binary heap."""
+
+    adj_list = [
+        [(0, 1), (6, 4)],
+        [(10, 2), (1, 4)],
+        [(5, 0), (2, 3)],
+        [(3, 2)],
+        [(1, 3)],
+    ]
+    ans = graph.dijkstra_ssp_indexedheap(adj_list, 0)
+    assert ans.dist[0] == 0, "Dijkstra indexed heap distance mismatch"
+    assert ans.dist[1] == 0, "Dijkstra indexed heap distance mismatch"
+    assert ans.dist[2] == 5, "Dijkstra indexed heap distance mismatch"
+    assert ans.dist[3] == 2, "Dijkstra indexed heap distance mismatch"
+    assert ans.dist[4] == 1, "Dijkstra indexed heap distance mismatch"
+    assert ans.pred[0] == 0, "Dijkstra indexed heap predecessor mismatch"
+    assert ans.pred[1] == 0, "Dijkstra indexed heap predecessor mismatch"
+    assert ans.pred[2] == 3, "Dijkstra indexed heap predecessor mismatch"
+    assert ans.pred[3] == 4, "Dijkstra indexed heap predecessor mismatch"
+    assert ans.pred[4] == 1, "Dijkstra indexed heap predecessor mismatch"
+
+
+def dijkstra_ssp_daryheap_test() -> None:
+    """A simple test for Dijkstra's using d-ary heaps."""
+
+    adj_list = [
+        [(0, 1), (6, 4)],
+        [(10, 2), (1, 4)],
+        [(5, 0), (2, 3)],
+        [(3, 2)],
+        [(1, 3)],
+    ]
+    for arity in (2, 4, 8, 16):
+        ans = graph.dijkstra_ssp_daryheap(adj_list, 0, arity)
+        assert ans.dist[0] == 0, "Dijkstra d-ary heap distance mismatch"
+        assert ans.dist[1] == 0, "Dijkstra d-ary heap distance mismatch"
+        assert ans.dist[2] == 5, "Dijkstra d-ary heap distance mismatch"
+        assert ans.dist[3] == 2, "Dijkstra d-ary heap distance mismatch"
+        assert ans.dist[4] == 1, "Dijkstra d-ary heap distance mismatch"
+        assert ans.pred[0] == 0, "Dijkstra d-ary heap predecessor mismatch"
+        assert ans.pred[1] == 0, "Dijkstra d-ary heap predecessor mismatch"
+        assert ans.pred[2] == 3, "Dijkstra d-ary heap predecessor mismatch"
+        assert ans.pred[3] == 4, "Dijkstra d-ary heap predecessor mismatch"
+        assert ans.pred[4] == 1, "Dijkstra d-ary heap predecessor mismatch"
+
+
+def dijkstra_ssp_radixheap_test() -> None:
+    """A simple test for Dijkstra's using a radix heap."""
+
+    adj_list = [
+        [(0, 1), (6, 4)],
+        [(10, 2), (1, 4)],
+        [(5, 0), (2, 3)],
+        [(3, 2)],
+        [(1, 3)],
+    ]
+    ans = graph.dijkstra_ssp_radixheap(adj_list, 0)
+    assert ans.dist[0] == 0, "Dijkstra radix heap distance mismatch"
+    assert ans.dist[1] == 0, "Dijkstra radix heap distance mismatch"
+    assert ans.dist[2] == 5, "Dijkstra radix heap distance mismatch"
+    assert ans.dist[3] == 2, "Dijkstra radix heap distance mismatch"
+    assert ans.dist[4] == 1, "Dijkstra radix heap distance mismatch"
+    assert ans.pred[0] == 0, "Dijkstra radix heap predecessor mismatch"
+    assert ans.pred[1] == 0, "Dijkstra radix heap predecessor mismatch"
+    assert ans.pred[2] == 3, "Dijkstra radix heap predecessor mismatch"
+    assert ans.pred[3] == 4, "Dijkstra radix heap predecessor mismatch"
+    assert ans.pred[4] == 1, "Dijkstra radix heap predecessor mismatch"
+
+
+def dijkstra_ssp_hollowheap_test() -> None:
+    """A simple test for Dijkstra's using a hollow heap."""
+
+    adj_list = [
+        [(0, 1), (6, 4)],
+        [(10, 2), (1, 4)],
+        [(5, 0), (2, 3)],
+        [(3, 2)],
+        [(1, 3)],
+    ]
+    ans = graph.dijkstra_ssp_hollowheap(adj_list, 0)
+    assert ans.dist[0] == 0, "Dijkstra hollow heap distance mismatch"
+    assert ans.dist[1] == 0, "Dijkstra hollow heap distance mismatch"
+    assert ans.dist[2] == 5, "Dijkstra hollow heap distance mismatch"
+    assert ans.dist[3] == 2, "Dijkstra hollow heap distance mismatch"
+    assert ans.dist[4] == 1, "Dijkstra hollow heap distance mismatch"
+    assert ans.pred[0] == 0, "Dijkstra hollow heap predecessor mismatch"
+    assert ans.pred[1] == 0, "Dijkstra hollow heap predecessor mismatch"
+    assert ans.pred[2] == 3, "Dijkstra hollow heap predecessor mismatch"
+    assert ans.pred[3] == 4, "Dijkstra hollow heap predecessor mismatch"
+    assert ans.pred[4] == 1, "Dijkstra hollow heap predecessor mismatch"
+
+
+def dijkstra_ssp_rankpairingheap_test() -> None:
+    """A simple test for Dijkstra's using a rank-pairing heap."""
+
+    adj_list = [
+        [(0, 1), (6, 4)],
+        [(10, 2), (1, 4)],
+        [(5, 0), (2, 3)],
+        [(3, 2)],
+        [(1, 3)],
+    ]
+    ans = graph.dijkstra_ssp_rankpairingheap(adj_list, 0)
+    assert ans.dist[0] == 0, "Dijkstra rank-pairing heap distance mismatch"
+    assert ans.dist[1] == 0, "Dijkstra rank-pairing heap distance mismatch"
+    assert ans.dist[2] == 5, "Dijkstra rank-pairing heap distance mismatch"
+    assert ans.dist[3] == 2, "Dijkstra rank-pairing heap distance mismatch"
+    assert ans.dist[4] == 1, "Dijkstra rank-pairing heap distance mismatch"
+    assert ans.pred[0] == 0, "Dijkstra rank-pairing heap predecessor mismatch"
+    assert ans.pred[1] == 0, "Dijkstra rank-pairing heap predecessor mismatch"
+    assert ans.pred[2] == 3, "Dijkstra rank-pairing heap predecessor mismatch"
+    assert ans.pred[3] == 4, "Dijkstra rank-pairing heap predecessor mismatch"
+    assert ans.pred[4] == 1, "Dijkstra rank-pairing heap predecessor mismatch"
 
 
 def dijkstra_ssp_binaryheap_test() -> None:
@@ -74,6 +193,482 @@ def dijkstra_ssp_binaryheap_test() -> None:
     assert ans[3][1] == 4, "Dijkstra binary heap predecessor mismatch"
     assert ans[4][1] == 1, "Dijkstra binary heap predecessor mismatch"
 
+
+def path_length(adj: list[list[tuple[int]]], path: list[int]) -> int:
+    """Adds up the lightest edge between each pair of vertices on a path.
+
+    Args:
+        adj (list[list[tuple[int]]]): The graph in adjacency list format.
+        path (list[int]): The vertices on the path, in order.
+
+    Returns:
+        int: The length of the path.
+    """
+
+    return sum(min(w for w, v in adj[a] if v == b) for a, b in zip(path, path[1:]))
+
+
+def shortest_paths_test(vertices: int = 200, edges: int = 600) -> None:
+    """Tests that every Dijkstra's returns the same compact result, and the
+    result's paths and export.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    # drop some edges so some vertices cannot be reached
+    adj = [[e for e in edges if randrange(4)] for edges in adj]
+    g = graph.CSRGraph.from_adj_list(adj)
+    src = randrange(vertices)
+    exp = graph.dijkstra_ssp_binaryheap(adj, src)
+    results = [
+        graph.dijkstra_ssp_noheap(adj, src),
+        graph.dijkstra_ssp_csr_binaryheap(g, src),
+        graph.dijkstra_ssp_pairingheap(adj, src),
+        graph.dijkstra_ssp_fibonacciheap(adj, src),
+        graph.dijkstra_ssp_indexedheap(adj, src),
+        graph.dijkstra_ssp_daryheap(adj, src),
+        graph.dijkstra_ssp_radixheap(adj, src),
+        graph.dijkstra_ssp_hollowheap(adj, src),
+        graph.dijkstra_ssp_rankpairingheap(adj, src),
+    ]
+    results += [
+        graph.dijkstra_ssp_csr(g, src, heaps.make(name)) for name in heaps.HEAPS
+    ]
+    if graph.np is not None:
+        results.append(graph.dijkstra_ssp_dense(graph.dense_matrix(g), src))
+    for act in results:
+        assert isinstance(act, graph.ShortestPaths), "Shortest paths type mismatch"
+        assert act.src == src and len(act) == vertices, "Shortest paths size mismatch"
+        assert act.dist == exp.dist, "Shortest paths distance mismatch"
+        for v in range(vertices):
+            path = act.path(v)
+            if act.dist[v] < 0:
+                assert path is None and act[v] is None, "Shortest paths unreachable"
+                continue
+            assert path[0] == src and path[-1] == v, "Shortest paths path ends"
+            assert path_length(adj, path) == act.dist[v], "Shortest paths path mismatch"
+    assert exp.reached() == vertices - exp.dist.count(-1), "Shortest paths reached"
+    assert exp.nbytes() == 16 * vertices, "Shortest paths size in bytes"
+    copy = graph.ShortestPaths.frombytes(exp.tobytes())
+    assert (copy.src, copy.dist, copy.pred) == (src, exp.dist, exp.pred), (
+        "Shortest paths export mismatch"
+    )
+    try:
+        graph.ShortestPaths.frombytes(exp.tobytes()[:-8])
+        assert False, "Shortest paths accepted truncated data"
+    except ValueError:
+        pass
+
+
+def csr_graph_test(vertices: int = 200, edges: int = 1000) -> None:
+    """Tests building CSR graphs and Dijkstra's on them against the
+    adjacency list versions.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj_list = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    g = graph.CSRGraph.from_adj_list(adj_list)
+    assert len(g) == vertices, "CSR graph vertex count mismatch"
+    for u, adj in enumerate(adj_list):
+        start, stop = g.offsets[u], g.offsets[u + 1]
+        assert list(zip(g.weights[start:stop], g.targets[start:stop])) == adj, (
+            "CSR graph edge mismatch"
+        )
+    # the same edges given once per direction
+    tails, heads, weights = array("i"), array("i"), array("q")
+    for u, adj in enumerate(adj_list):
+        for w, v in adj:
+            tails.append(u)
+            heads.append(v)
+            weights.append(w)
+    h = graph.CSRGraph.from_edges(vertices, tails, heads, weights)
+    assert h.targets == g.targets and h.weights == g.weights, "CSR from edges mismatch"
+    exp = graph.dijkstra_ssp_binaryheap(adj_list, 0)
+    act = graph.dijkstra_ssp_csr_binaryheap(g, 0)
+    assert exp.dist == act.dist, "CSR binary heap mismatch"
+    for name in heaps.HEAPS:
+        ans = graph.dijkstra_ssp_csr(g, 0, heaps.make(name))
+        assert ans.dist == exp.dist, f"CSR {name} heap distance mismatch"
+        for v, (d, u) in enumerate(ans):
+            assert v == 0 or ans.dist[u] + min(
+                w for w, x in adj_list[u] if x == v
+            ) == d, f"CSR {name} heap predecessor mismatch"
+    try:
+        graph.CSRGraph(array("q", [0, 2]), array("i", [1]), array("q", [1]))
+        assert False, "CSR graph accepted mismatched arrays"
+    except ValueError:
+        pass
+
+
+def dijkstra_ssp_dense_test(vertices: int = 100, edges: int = 4000) -> None:
+    """Tests Dijkstra's on an adjacency matrix against a binary heap. Skipped
+    if NumPy is not installed.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    if graph.np is None:
+        print("NumPy not installed: skipping dense Dijkstra test")
+        return
+    adj_list = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    matrix = graph.dense_matrix(graph.CSRGraph.from_adj_list(adj_list))
+    exp = graph.dijkstra_ssp_binaryheap(adj_list, 0)
+    act = graph.dijkstra_ssp_dense(matrix, 0)
+    for v, (d, u) in enumerate(act):
+        assert d == exp[v][0], "Dijkstra dense distance mismatch"
+        assert v == 0 or act[u][0] + matrix[u, v] == d, (
+            "Dijkstra dense predecessor mismatch"
+        )
+    # an unreachable vertex
+    act = graph.dijkstra_ssp_dense(graph.np.full((2, 2), graph.np.inf), 0)
+    assert list(act) == [(0, 0), None], "Dijkstra dense unreachable mismatch"
+
+
+def dijkstra_msp_test(vertices: int = 100, edges: int = 500) -> None:
+    """Tests Dijkstra's from many sources on a process pool against one
+    source at a time.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj_list = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    g = graph.CSRGraph.from_adj_list(adj_list)
+    sources = list(range(0, vertices, 7))
+    exp = [
+        [d[0] for d in graph.dijkstra_ssp_binaryheap(adj_list, src)] for src in sources
+    ]
+    for heap, workers, chunksize in (
+        (None, 1, None),
+        (None, 2, 1),
+        ("pairing", 2, None),
+    ):
+        rows = list(graph.dijkstra_msp(g, sources, heap, workers, chunksize))
+        assert [src for src, _ in rows] == sources, "Multi-source order mismatch"
+        assert [list(dist) for _, dist in rows] == exp, "Multi-source distance mismatch"
+    # stopping early shuts the pool down
+    rows = graph.dijkstra_msp(g, sources, workers=2, chunksize=1)
+    next(rows)
+    rows.close()
+
+
+def delta_stepping_test(vertices: int = 200, edges: int = 2000) -> None:
+    """Tests delta-stepping against Dijkstra's with several bucket widths,
+    in this process and on a process pool.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 1000)
+    # some vertices cannot be reached
+    adj += [[(1, 0)], []]
+    g = graph.CSRGraph.from_adj_list(adj)
+    exp = next(graph.dijkstra_msp(g, [0], workers=1))[1]
+    for delta in (None, 1, 50, 1001):
+        act = graph.delta_stepping(g, 0, delta, workers=1)
+        assert act == exp, f"Delta-stepping mismatch with delta {delta}"
+        act = graph.delta_stepping(g, 0, delta, workers=2, grain=8)
+        assert act == exp, f"Parallel delta-stepping mismatch with delta {delta}"
+
+
+def dijkstra_st_test(vertices: int = 300, edges: int = 900, rep: int = 50) -> None:
+    """Tests early exit and bidirectional Dijkstra's between two vertices
+    against Dijkstra's from the source, on undirected and directed graphs.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+        rep (int): The number of queries per graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    directed = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    # the weights differ by direction, so add every edge both ways
+    undirected = [[] for _ in range(vertices)]
+    for u, edges in enumerate(directed):
+        for w, v in edges:
+            undirected[u].append((w, v))
+            undirected[v].append((w, u))
+    # drop some edges so the directed graph is partly unreachable
+    directed = [[e for e in edges if randrange(3)] for edges in directed]
+    for adj, radj in ((undirected, None), (directed, graph.reverse_graph(directed))):
+        for _ in range(rep):
+            src = randrange(vertices)
+            dst = randrange(vertices)
+            exp = graph.dijkstra_ssp_binaryheap(adj, src)[dst]
+            exp = exp[0] if exp else None
+            for name in heaps.HEAPS:
+                for dist, path, settled in (
+                    graph.dijkstra_st(adj, src, dst, heaps.make(name)),
+                    graph.dijkstra_bidirectional(adj, src, dst, name, radj),
+                ):
+                    assert dist == exp, f"Dijkstra s-t {name} distance mismatch"
+                    assert 0 < settled <= 2 * vertices, "Dijkstra s-t settled count"
+                    if dist is None:
+                        assert path is None, "Dijkstra s-t path to unreachable"
+                        continue
+                    assert path[0] == src and path[-1] == dst, "Dijkstra s-t path ends"
+                    assert path_length(adj, path) == dist, (
+                        f"Dijkstra s-t {name} path mismatch"
+                    )
+
+
+def astar_test(vertices: int = 300, edges: int = 900, rep: int = 50) -> None:
+    """Tests the geometric graph generator and A* against Dijkstra's from the
+    source on every registered heap.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The rough number of edges in the random graph.
+        rep (int): The number of queries.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    coords, adj = graph.rand_geometric_graph(vertices, edges, 1000)
+    for u, edges in enumerate(adj):
+        (x, y) = coords[u]
+        for w, v in edges:
+            assert (w, u) in adj[v], "Geometric graph edge not undirected"
+            assert w * w >= (x - coords[v][0]) ** 2 + (y - coords[v][1]) ** 2, (
+                "Geometric graph weight shorter than the distance"
+            )
+    for _ in range(rep):
+        src = randrange(vertices)
+        dst = randrange(vertices)
+        exp = graph.dijkstra_ssp_binaryheap(adj, src)[dst]
+        assert exp, "Geometric graph not connected"
+        heuristic = graph.euclidean(coords, dst)
+        for name in heaps.HEAPS:
+            q = heaps.make(name)
+            dist, path, settled = graph.astar(adj, src, dst, q, heuristic)
+            assert dist == exp[0], f"A* {name} distance mismatch"
+            assert 0 < settled <= vertices, "A* settled count"
+            assert path[0] == src and path[-1] == dst, "A* path ends"
+            assert path_length(adj, path) == dist, f"A* {name} path mismatch"
+
+
+def landmarks_test(vertices: int = 300, edges: int = 900, rep: int = 50) -> None:
+    """Tests A* with landmark bounds against Dijkstra's from the source, and
+    that the landmark index survives a round trip through a file.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+        rep (int): The number of queries.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    directed = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    adj = [[] for _ in range(vertices)]
+    for u, edges in enumerate(directed):
+        for w, v in edges:
+            adj[u].append((w, v))
+            adj[v].append((w, u))
+    # a second component that no landmark is needed to reach
+    adj += [[(5, vertices + 1)], [(5, vertices)]]
+    index = graph.Landmarks.build(adj, 4)
+    assert len(index) == 4, "Landmarks count mismatch"
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "graph.alt"
+        index.save(path, "graph")
+        loaded = graph.Landmarks.load(path, "graph")
+        try:
+            graph.Landmarks.load(path, "other graph")
+            assert False, "Landmarks of another graph loaded"
+        except ValueError:
+            pass
+    assert loaded.vertices == index.vertices, "Landmarks vertices not saved"
+    assert loaded.dist == index.dist, "Landmarks distances not saved"
+    for _ in range(rep):
+        src = randrange(len(adj))
+        dst = randrange(len(adj))
+        exp = graph.dijkstra_ssp_binaryheap(adj, src)[dst]
+        exp = exp[0] if exp else None
+        for name in heaps.HEAPS:
+            q = heaps.make(name)
+            dist, path, _ = graph.astar(adj, src, dst, q, loaded.heuristic(dst))
+            assert dist == exp, f"Landmarks {name} distance mismatch"
+            if dist is not None:
+                assert path_length(adj, path) == dist, f"Landmarks {name} path mismatch"
+
+
+def hierarchy_test(vertices: int = 300, edges: int = 900, rep: int = 50) -> None:
+    """Tests contraction hierarchies built with every heap that can order
+    vertices against Dijkstra's from the source, with a core left by a low
+    degree limit, and after a round trip through a file.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+        rep (int): The number of queries per hierarchy.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    directed = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    adj = [[] for _ in range(vertices)]
+    for u, edges in enumerate(directed):
+        for w, v in edges:
+            adj[u].append((w, v))
+            adj[v].append((w, u))
+    # a second component
+    adj += [[(5, vertices + 1)], [(5, vertices)]]
+    chs = [
+        graph.Hierarchy.build(adj, name)
+        for name, info in heaps.HEAPS.items()
+        if not info.monotone
+    ]
+    chs.append(graph.Hierarchy.build(adj, max_degree=4, witness_limit=5))
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "graph.ch"
+        chs[0].save(path, "graph")
+        chs.append(graph.Hierarchy.load(path, "graph"))
+        try:
+            graph.Hierarchy.load(path, "other graph")
+            assert False, "Hierarchy of another graph loaded"
+        except ValueError:
+            pass
+    assert chs[-1].via == chs[0].via, "Hierarchy shortcuts not saved"
+    for _ in range(rep):
+        src = randrange(len(adj))
+        dst = randrange(len(adj))
+        exp = graph.dijkstra_ssp_binaryheap(adj, src)[dst]
+        exp = exp[0] if exp else None
+        for ch in chs:
+            dist, path, settled = ch.query(src, dst)
+            assert dist == exp, "Hierarchy distance mismatch"
+            assert settled > 0, "Hierarchy settled count"
+            if dist is None:
+                assert path is None, "Hierarchy path to unreachable"
+                continue
+            assert path[0] == src and path[-1] == dst, "Hierarchy path ends"
+            assert path_length(adj, path) == dist, "Hierarchy path mismatch"
+
+
+def dynamic_shortest_paths_test(
+    vertices: int = 150, edges: int = 400, rep: int = 5
+) -> None:
+    """Tests repairing shortest paths with every heap against Dijkstra's
+    after batches of added, removed, raised and lowered edges.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+        rep (int): The number of graphs per heap.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    for name in heaps.HEAPS:
+        for _ in range(rep):
+            adj = graph.rand_graph(vertices, edges)
+            adj = graph.assign_random_weights(adj, 0, 100)
+            src = randrange(vertices)
+            dyn = graph.DynamicShortestPaths(adj, src, name)
+            for batch in (1, 3, 10, 30):
+                changes = []
+                for _ in range(batch):
+                    u = randrange(vertices)
+                    op = randrange(10)
+                    if op < 3 or not dyn.out[u]:
+                        changes.append((u, randrange(vertices), randrange(101)))
+                        continue
+                    v = choice(list(dyn.out[u]))
+                    if op < 4:
+                        changes.append((u, v, None))
+                    else:
+                        changes.append((u, v, randrange(2 * dyn.out[u][v] + 2)))
+                dyn.update(changes)
+                exp = graph.dijkstra_ssp_binaryheap(dyn.adj_list(), src)
+                act = dyn.result()
+                assert act.dist == exp.dist, f"Failed {name} repair: dist mismatch"
+                for v in range(vertices):
+                    if act.dist[v] < 0 or v == src:
+                        continue
+                    u = act.pred[v]
+                    assert act.dist[u] + dyn.out[u][v] == act.dist[v], (
+                        f"Failed {name} repair: pred mismatch"
+                    )
+                    assert v in dyn.children[u], f"Failed {name} repair: tree"
+
+
+def yen_test(vertices: int = 7, rep: int = 50) -> None:
+    """Tests Yen's algorithm on every heap, with and without the tree of
+    distances to the target, against every simple path of small graphs.
+
+    Args:
+        vertices (int): The number of vertices in each random graph.
+        rep (int): The number of graphs.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    def simple_paths(u: int, path: list[int], cost: int) -> None:
+        if u == dst:
+            exp.append((cost, path))
+            return
+        for w, v in adj[u]:
+            if v not in path:
+                simple_paths(v, path + [v], cost + w)
+
+    for _ in range(rep):
+        edges = randrange(vertices - 1, vertices * (vertices - 1) // 2 + 1)
+        adj = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 10)
+        src = randrange(vertices)
+        dst = randrange(vertices)
+        exp = []
+        simple_paths(src, [src], 0)
+        exp.sort()
+        k = randrange(1, 12)
+        radj = graph.reverse_graph(adj)
+        for name in heaps.HEAPS:
+            for reuse in (True, False):
+                act, _ = graph.yen(adj, src, dst, k, name, reuse, radj)
+                assert [d for d, _ in act] == [d for d, _ in exp[:k]], (
+                    f"Failed {name} Yen's: distance mismatch"
+                )
+                assert len({tuple(p) for _, p in act}) == len(act), (
+                    f"Failed {name} Yen's: repeated path"
+                )
+                for d, p in act:
+                    assert (d, p) in exp, f"Failed {name} Yen's: path mismatch"
+
+
 def dijkstra_ssp_noheap_test() -> None:
     """A simple test for Dijkstra's without using a heap."""
 
@@ -97,6 +692,46 @@ def dijkstra_ssp_noheap_test() -> None:
     assert ans[4][1] == 1, "Dijkstra no heap predecessor mismatch"
 
 
+def rand_graph_test(vertices: int = 30, rep: int = 200) -> None:
+    """Tests that random graphs, sparse and dense, are connected and have
+    the right number of distinct edges, and that weights are in range and
+    repeat under the same seed.
+
+    Args:
+        vertices (int): The most vertices in a random graph.
+        rep (int): The number of graphs.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    for _ in range(rep):
+        n = randrange(1, vertices + 1)
+        edges = randrange(n - 1, n * (n - 1) // 2 + 1) if n > 1 else 0
+        adj_list = graph.rand_graph(n, edges)
+        assert sum(map(len, adj_list)) == 2 * edges, "Random graph edge count"
+        for u, adj in enumerate(adj_list):
+            assert u not in adj, "Random graph self loop"
+            assert len(set(adj)) == len(adj), "Random graph repeated edge"
+            assert all(u in adj_list[v] for v in adj), "Random graph not undirected"
+        seen = {0}
+        stack = [0]
+        while stack:
+            for v in adj_list[stack.pop()]:
+                if v not in seen:
+                    seen.add(v)
+                    stack.append(v)
+        assert len(seen) == n, "Random graph not connected"
+        graph.assign_random_weights(adj_list, 3, 7)
+        assert all(3 <= w <= 7 for adj in adj_list for w, _ in adj), "Weight range"
+    weights = []
+    for _ in range(2):
+        seed(vertices)
+        weights.append(graph.assign_random_weights(graph.rand_graph(vertices, 60)))
+    seed()
+    assert weights[0] == weights[1], "Random weights not seeded"
+
+
 def see_random_weights(size: int):
     adj_list = graph.rand_tree(size)
     graph.assign_random_weights(adj_list)
@@ -139,5 +774,23 @@ if __name__ == "__main__":
     dijkstra_ssp_pairingheap_test()
     dijkstra_ssp_fibonacciheap_test()
     dijkstra_ssp_binaryheap_test()
-    dijkstra_ssp_noheap_test
+    dijkstra_ssp_indexedheap_test()
+    dijkstra_ssp_daryheap_test()
+    dijkstra_ssp_radixheap_test()
+    dijkstra_ssp_hollowheap_test()
+    dijkstra_ssp_rankpairingheap_test()
+    dijkstra_ssp_noheap_test()
+    shortest_paths_test()
+    csr_graph_test()
+    csr_graph_test(vertices=50, edges=1000)
+    dijkstra_ssp_dense_test()
+    dijkstra_msp_test()
+    delta_stepping_test()
+    dijkstra_st_test()
+    astar_test()
+    landmarks_test()
+    hierarchy_test()
+    dynamic_shortest_paths_test()
+    yen_test()
+    rand_graph_test()
     print("All graph tests passed")
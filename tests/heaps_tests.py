@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from random import randrange, choice
+from util import heaps
+
+MAX_VAL = int(1e9)
+
+
+def protocol_test(rep: int = 5000, maxval: int = MAX_VAL) -> None:
+    """Tests every registered heap through the shared interface only. Keys
+    never drop below the last popped key, so monotone heaps are tested too.
+
+    Args:
+        rep (int): The repetitions of operations per heap.
+        maxval (int): The maximum amount a key may exceed the last popped key.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    for name in heaps.HEAPS:
+        heap = heaps.make(name)
+        keys = {}
+        last = 0
+        for i in range(rep):
+            op = randrange(4)
+            if op == 0 or not keys:
+                node = heap.add(last + randrange(maxval + 1), i)
+                assert node.value == i, f"Failed {name} add: value mismatch"
+                keys[node] = node.key
+            elif op == 1:
+                act = heap.pop()
+                assert act.key == min(keys.values()), f"Failed {name} pop: key mismatch"
+                del keys[act]
+                last = act.key
+            elif op == 2:
+                node = choice(tuple(keys))
+                key = randrange(last, keys[node] + 1)
+                assert heap.decreasekey(node, key) is node, f"Failed {name} decrease"
+                keys[node] = key
+            else:
+                node = choice(tuple(keys))
+                assert heap.remove(node) is node, f"Failed {name} remove"
+                del keys[node]
+            assert heap.size == len(keys), f"Failed {name}: size mismatch"
+        while keys:
+            del keys[heap.pop()]
+        assert heap.pop() is None, f"Failed {name}: heap not empty"
+
+
+def register_test() -> None:
+    """Tests that names and run codes cannot be registered twice.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    name = next(iter(heaps.HEAPS))
+    info = heaps.HEAPS[name]
+    assert heaps.by_code(info.code) == name, "Failed register test: code lookup"
+    assert heaps.by_code("") is None, "Failed register test: empty code found"
+    try:
+        heaps.register(name, info.factory)
+        assert False, "Failed register test: duplicate name accepted"
+    except ValueError:
+        pass
+    try:
+        heaps.register(name + " copy", info.factory, info.code)
+        assert False, "Failed register test: duplicate code accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    protocol_test()
+    protocol_test(maxval=10)
+    register_test()
+    print("All registered heaps passed all tests")
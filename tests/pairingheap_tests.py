@@ -12,7 +12,11 @@ MAX_VAL = int(1e9)
 
 
 def remove_test(
-    size: int = 10000, rep: int = 1000, minval: int = MIN_VAL, maxval: int = MAX_VAL
+    size: int = 10000,
+    rep: int = 1000,
+    minval: int = MIN_VAL,
+    maxval: int = MAX_VAL,
+    strategy: str = pairingheap.TWO_PASS,
 ) -> bool:
     """Tests the remove operation.
 
@@ -21,13 +25,14 @@ def remove_test(
         rep (int): The repetitions of remove operations.
         minval (int): The minimum value to be added.
         maxval (int): The maximum value to be added.
+        strategy (str): The pairing heap strategy.
 
     Raises:
         AssertionError: Test failed.
     """
 
     binary_heap = []
-    pairing_heap = pairingheap.Heap()
+    pairing_heap = pairingheap.Heap(strategy)
     nodes = set()
     removed = set()
     for i in range(size):
@@ -47,11 +52,15 @@ def remove_test(
         if not exp[1] in removed:
             act = pairing_heap.pop()
             assert exp[0] == act.key, "Failed removal test: value mismatch"
-    assert pairing_heap.root == None, "Failed removal test: heap not empty"
+    assert pairing_heap.peek() == None, "Failed removal test: heap not empty"
 
 
 def decrease_test(
-    size: int = 1000, rep: int = 10000, minval: int = MIN_VAL, maxval: int = MAX_VAL
+    size: int = 1000,
+    rep: int = 10000,
+    minval: int = MIN_VAL,
+    maxval: int = MAX_VAL,
+    strategy: str = pairingheap.TWO_PASS,
 ) -> None:
     """Tests the decrease key operation.
 
@@ -60,13 +69,14 @@ def decrease_test(
         rep (int): The repetitions of decrease key operations.
         minval (int): The minimum value to be added.
         maxval (int): The maximum value to be added.
+        strategy (str): The pairing heap strategy.
 
     Raises:
         AssertionError: Test failed.
     """
 
     binary_heap = []
-    pairing_heap = pairingheap.Heap()
+    pairing_heap = pairingheap.Heap(strategy)
     nodes = []
     arr = []
     for i in range(size):
@@ -89,7 +99,7 @@ def decrease_test(
             arr[exp[1]] = -1
             act = pairing_heap.pop()
             assert exp[0] == act.key, "Failed decrease key test: value mismatch"
-    assert pairing_heap.root == None, "Failed decrease key test: heap not empty"
+    assert pairing_heap.peek() == None, "Failed decrease key test: heap not empty"
 
 
 def heap_test(
@@ -98,6 +108,7 @@ def heap_test(
     popfreq: int = 1,
     minval: int = MIN_VAL,
     maxval: int = MAX_VAL,
+    strategy: str = pairingheap.TWO_PASS,
 ) -> None:
     """Tests add and pop operations.
 
@@ -107,6 +118,7 @@ def heap_test(
         popfreq (int): The weighted frequency of pop operations.
         minval (int): The minimum value to be added.
         maxval (int): The maximum value to be added.
+        strategy (str): The pairing heap strategy.
 
     Raises:
         AssertionError: Test failed.
@@ -114,7 +126,7 @@ def heap_test(
 
     totalfreq = addfreq + popfreq
     binary_heap = []
-    pairing_heap = pairingheap.Heap()
+    pairing_heap = pairingheap.Heap(strategy)
     for _ in range(rep):
         add = randrange(totalfreq) < addfreq
         if add or len(binary_heap) == 0:
@@ -122,7 +134,7 @@ def heap_test(
             heappush(binary_heap, num)
             pairing_heap.add(num)
             assert (
-                binary_heap[0] == pairing_heap.root.key
+                binary_heap[0] == pairing_heap.peek().key
             ), "Failed add operation: min value mismatch"
         else:
             a = heappop(binary_heap)
@@ -130,18 +142,132 @@ def heap_test(
             assert a == b, "Failed pop operation: value mismatch"
             if binary_heap:
                 assert (
-                    binary_heap[0] == pairing_heap.root.key
+                    binary_heap[0] == pairing_heap.peek().key
                 ), "Failed pop operation: new min value mismatch"
             else:
-                assert pairing_heap.root == None, "Failed pop operation: heap not empty"
+                assert pairing_heap.peek() == None, "Failed pop operation: heap not empty"
         assert (
             len(binary_heap) == pairing_heap.size
         ), "Failed add or pop operation: heap size mismatch"
 
 
+def add_many_test(
+    size: int = 10000,
+    rep: int = 10000,
+    minval: int = MIN_VAL,
+    maxval: int = MAX_VAL,
+    strategy: str = pairingheap.TWO_PASS,
+) -> None:
+    """Tests adding many keys at once, followed by other operations.
+
+    Args:
+        size (int): The number of keys to add at once.
+        rep (int): The repetitions of add/decrease key/pop operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+        strategy (str): The pairing heap strategy.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    pairing_heap = pairingheap.Heap(strategy)
+    arr = [randrange(minval, maxval + 1) for _ in range(size)]
+    # the second half is added to a heap that is not empty
+    nodes = pairing_heap.add_many(arr[: size // 2])
+    nodes += pairing_heap.add_many(arr[size // 2 :])
+    assert pairing_heap.add_many([]) == [], "Failed add many: empty add mismatch"
+    assert pairing_heap.size == size, "Failed add many: size mismatch"
+    assert [node.key for node in nodes] == arr, "Failed add many: order mismatch"
+    for _ in range(rep):
+        op = randrange(3)
+        if op == 0:
+            nodes.append(pairing_heap.add(randrange(minval, maxval + 1)))
+        elif op == 1:
+            node = choice(nodes)
+            if node.key is not None:
+                pairing_heap.decreasekey(node, randrange(minval, node.key + 1))
+        elif pairing_heap.size:
+            node = pairing_heap.pop()
+            alive = [n.key for n in nodes if n.key is not None]
+            assert node.key == min(alive), "Failed add many: pop mismatch"
+            node.key = None
+    assert pairing_heap.size == sum(
+        n.key is not None for n in nodes
+    ), "Failed add many: heap size mismatch"
+
+
+def batch_test(
+    size: int = 1000,
+    rep: int = 2000,
+    minval: int = MIN_VAL,
+    maxval: int = MAX_VAL,
+    strategy: str = pairingheap.TWO_PASS,
+) -> None:
+    """Tests the batched and fused operations.
+
+    Args:
+        size (int): The initial size of the test heap.
+        rep (int): The repetitions of batched operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+        strategy (str): The pairing heap strategy.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    pairing_heap = pairingheap.Heap(strategy)
+    nodes = pairing_heap.add_many([randrange(minval, maxval + 1) for _ in range(size)])
+    for _ in range(rep):
+        alive = sorted(n.key for n in nodes if n.key is not None)
+        op = randrange(4)
+        if op == 0:
+            k = randrange(10)
+            popped = pairing_heap.pop_many(k)
+            exp = alive[:k]
+            assert [n.key for n in popped] == exp, "Failed pop many: value mismatch"
+            for node in popped:
+                node.key = None
+        elif op == 1:
+            pairs = []
+            keys = {}
+            for node in (choice(nodes) for _ in range(randrange(20) * bool(nodes))):
+                if node.key is not None:
+                    keys[node] = randrange(minval, keys.get(node, node.key) + 1)
+                    pairs.append((node, keys[node]))
+            pairing_heap.decreasekey_many(pairs)
+            for node, key in keys.items():
+                assert node.key == key, "Failed decrease many: key mismatch"
+        else:
+            key = randrange(minval, maxval + 1)
+            if op == 2:
+                popped, added = pairing_heap.pushpop(key)
+                exp = min(alive + [key])
+            else:
+                popped, added = pairing_heap.replace(key)
+                exp = alive[0] if alive else None
+                assert (popped is None) == (exp is None), "Failed replace: empty"
+            assert added.key == key, "Failed fused operation: added key mismatch"
+            nodes.append(added)
+            if popped:
+                assert popped.key == exp, "Failed fused operation: value mismatch"
+                popped.key = None
+        assert pairing_heap.size == sum(
+            n.key is not None for n in nodes
+        ), "Failed batch operation: heap size mismatch"
+    alive = sorted(n.key for n in nodes if n.key is not None)
+    rest = [n.key for n in pairing_heap.pop_many(pairing_heap.size + 1)]
+    assert rest == alive, "Failed pop many: value mismatch"
+
+
 if __name__ == "__main__":
-    heap_test()
-    decrease_test()
-    remove_test()
-    remove_test(size=1000, rep=1000)
+    for strategy in pairingheap.STRATEGIES:
+        heap_test(strategy=strategy)
+        decrease_test(strategy=strategy)
+        remove_test(strategy=strategy)
+        remove_test(size=1000, rep=1000, strategy=strategy)
+        add_many_test(strategy=strategy)
+        batch_test(strategy=strategy)
+        batch_test(size=0, strategy=strategy)
     print("Pairing heap passed all tests")
@@ -0,0 +1,170 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from random import randrange, choice
+from heapq import heappop, heappush
+from util import radixheap
+
+MAX_VAL = int(1e9)
+
+
+def remove_test(size: int = 10000, rep: int = 1000, maxval: int = MAX_VAL) -> None:
+    """Tests the remove operation.
+
+    Args:
+        size (int): The size of the test heap.
+        rep (int): The repetitions of remove operations.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    binary_heap = []
+    radix_heap = radixheap.Heap()
+    nodes = set()
+    removed = set()
+    for i in range(size):
+        num = randrange(maxval + 1)
+        heappush(binary_heap, (num, i))
+        nodes.add((radix_heap.add(num), i))
+    for i in range(rep):
+        rem = choice(tuple(nodes))
+        nodes.remove(rem)
+        radix_heap.remove(rem[0])
+        removed.add(rem[1])
+        assert radix_heap.size == size - i - 1, "Failed remove node: size mismatch"
+    while binary_heap:
+        exp = heappop(binary_heap)
+        while binary_heap and exp[1] in removed:
+            exp = heappop(binary_heap)
+        if not exp[1] in removed:
+            act = radix_heap.pop()
+            assert exp[0] == act.key, "Failed removal test: value mismatch"
+    assert radix_heap.size == 0, "Failed removal test: heap not empty"
+
+
+def decrease_test(
+    size: int = 1000, rep: int = 10000, popfreq: int = 10, maxval: int = MAX_VAL
+) -> None:
+    """Tests the decrease key operation with keys that never drop below the
+    last popped key.
+
+    Args:
+        size (int): The size of the test heap. Must be greater than 0.
+        rep (int): The repetitions of decrease key operations.
+        popfreq (int): One in popfreq decrease key operations is followed
+            by a pop.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    binary_heap = []
+    radix_heap = radixheap.Heap()
+    nodes = []
+    arr = []
+    for i in range(size):
+        num = randrange(maxval + 1)
+        heappush(binary_heap, (num, i))
+        nodes.append(radix_heap.add(num))
+        arr.append(num)
+    for _ in range(rep):
+        if radix_heap.size == 0:
+            break
+        i = randrange(size)
+        while arr[i] is None:
+            i = randrange(size)
+        key = randrange(radix_heap.last, arr[i] + 1)
+        radix_heap.decreasekey(nodes[i], key)
+        heappush(binary_heap, (key, i))
+        arr[i] = key
+        if randrange(popfreq) == 0:
+            exp = min(key for key in arr if key is not None)
+            act = radix_heap.pop()
+            assert exp == act.key, "Failed decrease key test: value mismatch"
+            # equal keys may pop in any order
+            arr[nodes.index(act)] = None
+    while binary_heap:
+        exp = heappop(binary_heap)
+        if arr[exp[1]] == exp[0]:
+            arr[exp[1]] = None
+            act = radix_heap.pop()
+            assert exp[0] == act.key, "Failed decrease key test: value mismatch"
+    assert radix_heap.size == 0, "Failed decrease key test: heap not empty"
+
+
+def heap_test(
+    rep: int = 10000, addfreq: int = 1, popfreq: int = 1, maxval: int = MAX_VAL
+) -> None:
+    """Tests add and pop operations with keys that never drop below the last
+    popped key.
+
+    Args:
+        rep (int): The repetitions of add/pop operations.
+        addfreq (int): The weighted frequency of add operations.
+        popfreq (int): The weighted frequency of pop operations.
+        maxval (int): The maximum amount a key may exceed the last popped key.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    totalfreq = addfreq + popfreq
+    binary_heap = []
+    radix_heap = radixheap.Heap()
+    for _ in range(rep):
+        add = randrange(totalfreq) < addfreq
+        if add or len(binary_heap) == 0:
+            num = radix_heap.last + randrange(maxval + 1)
+            heappush(binary_heap, num)
+            radix_heap.add(num)
+        else:
+            a = heappop(binary_heap)
+            b = radix_heap.pop().key
+            assert a == b, "Failed pop operation: value mismatch"
+            assert a == radix_heap.last, "Failed pop operation: last key mismatch"
+        assert (
+            len(binary_heap) == radix_heap.size
+        ), "Failed add or pop operation: heap size mismatch"
+    while binary_heap:
+        assert (
+            heappop(binary_heap) == radix_heap.pop().key
+        ), "Failed pop operation: value mismatch"
+    assert radix_heap.pop() == None, "Failed pop operation: heap not empty"
+
+
+def monotone_test() -> None:
+    """Tests that keys smaller than the last popped key are rejected.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    radix_heap = radixheap.Heap()
+    node = radix_heap.add(10)
+    radix_heap.add(5)
+    radix_heap.pop()
+    try:
+        radix_heap.add(4)
+        assert False, "Failed monotone test: smaller add accepted"
+    except ValueError:
+        pass
+    try:
+        radix_heap.decreasekey(node, 4)
+        assert False, "Failed monotone test: smaller decrease key accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    heap_test()
+    heap_test(maxval=10)
+    decrease_test()
+    remove_test()
+    remove_test(size=1000, rep=1000)
+    monotone_test()
+    print("Radix heap passed all tests")
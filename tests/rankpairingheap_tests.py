@@ -0,0 +1,191 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from random import randrange, choice
+from heapq import heappop, heappush
+from util import rankpairingheap
+
+MIN_VAL = int(-1e9)
+MAX_VAL = int(1e9)
+
+
+def remove_test(
+    size: int = 10000, rep: int = 1000, minval: int = MIN_VAL, maxval: int = MAX_VAL
+) -> bool:
+    """Tests the remove operation.
+
+    Args:
+        size (int): The size of the test heap.
+        rep (int): The repetitions of remove operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    binary_heap = []
+    rp_heap = rankpairingheap.Heap()
+    nodes = set()
+    removed = set()
+    for i in range(size):
+        num = randrange(minval, maxval + 1)
+        heappush(binary_heap, (num, i))
+        nodes.add((rp_heap.add(num), i))
+    for i in range(rep):
+        rem = choice(tuple(nodes))
+        nodes.remove(rem)
+        rp_heap.remove(rem[0])
+        removed.add(rem[1])
+        assert rp_heap.size == size - i - 1, "Failed remove node: size mismatch"
+    while binary_heap:
+        exp = heappop(binary_heap)
+        while binary_heap and exp[1] in removed:
+            exp = heappop(binary_heap)
+        if not exp[1] in removed:
+            act = rp_heap.pop()
+            assert exp[0] == act.key, "Failed removal test: value mismatch"
+    assert rp_heap.size == 0, "Failed removal test: heap not empty"
+
+
+def decrease_test(
+    size: int = 1000, rep: int = 10000, minval: int = MIN_VAL, maxval: int = MAX_VAL
+) -> None:
+    """Tests the decrease key operation.
+
+    Args:
+        size (int): The size of the test heap. Must be greater than 0.
+        rep (int): The repetitions of decrease key operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    binary_heap = []
+    rp_heap = rankpairingheap.Heap()
+    nodes = []
+    arr = []
+    for i in range(size):
+        num = randrange(minval, maxval + 1)
+        heappush(binary_heap, (num, i))
+        nodes.append(rp_heap.add(num))
+        arr.append(num)
+    for _ in range(rep):
+        i = randrange(size)
+        node = nodes[i]
+        key = randrange(minval, node.key + 1)
+        rp_heap.decreasekey(node, key)
+        heappush(binary_heap, (key, i))
+        arr[i] = key
+    while binary_heap:
+        exp = heappop(binary_heap)
+        while binary_heap and arr[exp[1]] != exp[0]:
+            exp = heappop(binary_heap)
+        if arr[exp[1]] == exp[0]:
+            arr[exp[1]] = -1
+            act = rp_heap.pop()
+            assert exp[0] == act.key, "Failed decrease key test: value mismatch"
+    assert rp_heap.size == 0, "Failed decrease key test: heap not empty"
+
+
+def heap_test(
+    rep: int = 10000,
+    addfreq: int = 1,
+    popfreq: int = 1,
+    minval: int = MIN_VAL,
+    maxval: int = MAX_VAL,
+) -> None:
+    """Tests add and pop operations.
+
+    Args:
+        rep (int): The repetitions of add/pop operations.
+        addfreq (int): The weighted frequency of add operations.
+        popfreq (int): The weighted frequency of pop operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    totalfreq = addfreq + popfreq
+    binary_heap = []
+    rp_heap = rankpairingheap.Heap()
+    for _ in range(rep):
+        add = randrange(totalfreq) < addfreq
+        if add or len(binary_heap) == 0:
+            num = randrange(minval, maxval + 1)
+            heappush(binary_heap, num)
+            rp_heap.add(num)
+            assert (
+                binary_heap[0] == rp_heap.minroot.key
+            ), "Failed add operation: min value mismatch"
+        else:
+            a = heappop(binary_heap)
+            b = rp_heap.pop().key
+            assert a == b, "Failed pop operation: value mismatch"
+            if binary_heap:
+                assert (
+                    binary_heap[0] == rp_heap.minroot.key
+                ), "Failed pop operation: new min value mismatch"
+            else:
+                assert rp_heap.size == 0, "Failed pop operation: heap not empty"
+        assert (
+            len(binary_heap) == rp_heap.size
+        ), "Failed add or pop operation: heap size mismatch"
+
+
+def mixed_test(
+    rep: int = 20000, minval: int = MIN_VAL, maxval: int = MAX_VAL
+) -> None:
+    """Tests add, pop, decrease key and remove operations interleaved.
+
+    Args:
+        rep (int): The repetitions of operations.
+        minval (int): The minimum value to be added.
+        maxval (int): The maximum value to be added.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    rp_heap = rankpairingheap.Heap()
+    keys = {}
+    for _ in range(rep):
+        op = randrange(4)
+        if op == 0 or not keys:
+            node = rp_heap.add(randrange(minval, maxval + 1))
+            keys[node] = node.key
+        elif op == 1:
+            act = rp_heap.pop()
+            assert act.key == min(keys.values()), "Failed mixed test: value mismatch"
+            assert keys.pop(act) == act.key, "Failed mixed test: key mismatch"
+        elif op == 2:
+            node = choice(tuple(keys))
+            key = randrange(minval, keys[node] + 1)
+            rp_heap.decreasekey(node, key)
+            keys[node] = key
+        else:
+            node = choice(tuple(keys))
+            rp_heap.remove(node)
+            del keys[node]
+        assert rp_heap.size == len(keys), "Failed mixed test: size mismatch"
+    while keys:
+        act = rp_heap.pop()
+        assert act.key == min(keys.values()), "Failed mixed test: value mismatch"
+        del keys[act]
+    assert rp_heap.pop() == None, "Failed mixed test: heap not empty"
+
+
+if __name__ == "__main__":
+    heap_test()
+    decrease_test()
+    remove_test()
+    remove_test(size=1000, rep=1000)
+    mixed_test()
+    mixed_test(minval=0, maxval=10)
+    print("Rank-pairing heap passed all tests")
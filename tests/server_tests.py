@@ -0,0 +1,215 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+sys.path.append(str(Path(__file__).parent.parent.absolute() / "app"))
+
+import asyncio
+import json
+from random import randrange
+from timeit import default_timer
+from util import graph
+import server
+
+
+def serve(
+    g: graph.CSRGraph, requests: list, window: float = 0.002
+) -> tuple[list[dict], dict]:
+    """Starts a server with one worker, sends it every request at once and
+    stops it.
+
+    Args:
+        g (graph.CSRGraph): The graph.
+        requests (list): The requests. Strings are sent as they are and
+            anything else as JSON.
+        window (float, optional): The longest time in seconds a query waits
+            for a batch to fill. Defaults to 2 ms.
+
+    Returns:
+        tuple[list[dict], dict]: (the responses in order, the server's
+            stats after the last response)
+    """
+
+    async def run() -> tuple[list[dict], dict]:
+        s = server.Server(g, workers=1, window=window)
+        try:
+            await s.start()
+            lines = [
+                req.encode() if isinstance(req, str) else json.dumps(req).encode()
+                for req in requests
+            ]
+            res = await asyncio.gather(
+                *(s.respond(line, default_timer()) for line in lines)
+            )
+            for line in res:
+                assert line.endswith(b"\n"), "Failed server: response not a line"
+            return [json.loads(line) for line in res], s.stats()
+        finally:
+            s.close()
+
+    return asyncio.run(run())
+
+
+def random_graph(vertices: int, edges: int) -> list[list[tuple[int]]]:
+    """Makes a random weighted graph with one more vertex that no edge
+    reaches.
+
+    Args:
+        vertices (int): The number of connected vertices.
+        edges (int): The number of edges.
+
+    Returns:
+        list[list[tuple[int]]]: The graph in adjacency list format.
+    """
+
+    adj = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    return adj + [[]]
+
+
+def query_test(vertices: int = 50, edges: int = 150, rep: int = 20) -> None:
+    """Tests single target and all target queries against Dijkstra's,
+    including a vertex that cannot be reached.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+        rep (int): The number of single target queries.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj = random_graph(vertices, edges)
+    g = graph.CSRGraph.from_adj_list(adj)
+    src = randrange(vertices)
+    dsts = [randrange(vertices) for _ in range(rep)] + [vertices]
+    requests = [{"id": i, "src": src, "dst": dst} for i, dst in enumerate(dsts)]
+    requests.append({"id": "all", "src": src})
+    res, stats = serve(g, requests)
+    exp = graph.dijkstra_ssp_binaryheap(adj, src)
+    for req, act in zip(requests, res):
+        assert act["id"] == req["id"], "Failed server: id mismatch"
+        assert "error" not in act, f"Failed server: {act.get('error')}"
+    for dst, act in zip(dsts, res):
+        if exp.dist[dst] < 0:
+            assert act["dist"] is None and act["path"] is None, (
+                "Failed server: unreachable vertex"
+            )
+            continue
+        assert act["dist"] == exp.dist[dst], "Failed server: distance mismatch"
+        path = act["path"]
+        assert path[0] == src and path[-1] == dst, "Failed server: path ends"
+        assert (
+            sum(min(w for w, v in adj[a] if v == b) for a, b in zip(path, path[1:]))
+            == act["dist"]
+        ), "Failed server: path mismatch"
+    assert res[-2]["path"] is None, "Failed server: isolated vertex reached"
+    assert res[-1]["dist"] == list(exp.dist), "Failed server: all distances"
+    assert res[-1]["dist"][vertices] == -1, "Failed server: all unreachable"
+    assert stats["queries"] == len(requests), "Failed server: query count"
+
+
+def error_test(vertices: int = 20, edges: int = 40) -> None:
+    """Tests that bad requests get an error and are not counted, and that
+    the server keeps answering after them.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    g = graph.CSRGraph.from_adj_list(random_graph(vertices, edges))
+    requests = [
+        "{not json",
+        "[1, 2]",
+        {"id": 1, "src": True, "dst": 0},
+        {"id": 2, "src": 0, "dst": False},
+        {"id": 3, "src": "0", "dst": 1},
+        {"id": 4, "src": 0.0},
+        {"id": 5, "src": vertices + 1, "dst": 0},
+        {"id": 6, "src": 0, "dst": -1},
+        {"id": 7},
+        {"id": 8, "src": 0, "dst": 1},
+    ]
+    res, stats = serve(g, requests)
+    assert list(res[0]) == ["error"], "Failed server: bad JSON"
+    assert list(res[1]) == ["error"], "Failed server: request not an object"
+    for i, act in enumerate(res[2:-1], 1):
+        assert act["id"] == i, "Failed server: error id mismatch"
+        assert act["error"].startswith("Not a vertex"), (
+            f"Failed server: request {i} accepted"
+        )
+        assert "dist" not in act, f"Failed server: request {i} answered"
+    assert "error" not in res[-1] and res[-1]["path"][0] == 0, (
+        "Failed server: no answer after errors"
+    )
+    assert stats["queries"] == 1 and stats["batches"] == 1, (
+        "Failed server: errors counted"
+    )
+
+
+def stats_test(vertices: int = 20, edges: int = 40, rep: int = 10) -> None:
+    """Tests the stats request, and that queries with the same source in one
+    batch are all answered by one batch.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+        rep (int): The number of queries in the batch.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj = random_graph(vertices, edges)
+    g = graph.CSRGraph.from_adj_list(adj)
+    exp = graph.dijkstra_ssp_binaryheap(adj, 0)
+    requests = [{"id": i, "src": 0, "dst": i % vertices} for i in range(rep)]
+    # a long window so every query lands in the first batch
+    res, stats = serve(g, requests + [{"id": "s", "op": "stats"}], window=1)
+    for i, act in enumerate(res[:-1]):
+        assert act["id"] == i, "Failed server: batch id mismatch"
+        assert act["dist"] == exp.dist[i % vertices], "Failed server: batch answer"
+    # stats is answered at once, before the batch comes back
+    assert res[-1]["id"] == "s", "Failed server: stats id"
+    assert res[-1]["queries"] == 0, "Failed server: stats counted early"
+    assert stats["queries"] == rep, "Failed server: stats query count"
+    assert stats["batches"] == 1, "Failed server: batch not shared"
+    for label in ("p50_ms", "p90_ms", "p99_ms", "max_ms"):
+        assert 0 <= stats[label] <= stats["max_ms"], f"Failed server: {label}"
+
+
+def percentiles_test() -> None:
+    """Tests latency percentiles on no latencies and known ones.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    assert server.percentiles([]) == {"p50": 0, "p90": 0, "p99": 0, "max": 0}, (
+        "Failed percentiles: empty"
+    )
+    assert server.percentiles([0.25]) == {
+        "p50": 0.25,
+        "p90": 0.25,
+        "p99": 0.25,
+        "max": 0.25,
+    }, "Failed percentiles: one latency"
+    latencies = [i / 1000 for i in range(100, 0, -1)]
+    assert server.percentiles(latencies) == {
+        "p50": 0.051,
+        "p90": 0.091,
+        "p99": 0.1,
+        "max": 0.1,
+    }, "Failed percentiles: 1 to 100 ms"
+
+
+if __name__ == "__main__":
+    query_test()
+    error_test()
+    stats_test()
+    percentiles_test()
+    print("Server passed all tests")
@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from tempfile import TemporaryDirectory
+from util import graph, ssspcache
+
+
+def fingerprint_test(vertices: int = 100, edges: int = 400) -> None:
+    """Tests that fingerprints follow the content of a graph.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    copy = [list(edges) for edges in adj]
+    key = ssspcache.fingerprint(adj)
+    assert ssspcache.fingerprint(copy) == key, "Failed fingerprint: copy differs"
+    w, v = copy[0][0]
+    copy[0][0] = (w + 1, v)
+    assert ssspcache.fingerprint(copy) != key, "Failed fingerprint: weight ignored"
+    g = graph.CSRGraph.from_adj_list(adj)
+    assert ssspcache.fingerprint(g) == ssspcache.fingerprint(
+        graph.CSRGraph.from_adj_list(adj)
+    ), "Failed fingerprint: CSR copy differs"
+
+
+def cache_test(vertices: int = 100, edges: int = 400) -> None:
+    """Tests hits, misses and eviction by bytes, with and without a disk
+    tier, against Dijkstra's on every call, and eviction from the disk tier.
+
+    Args:
+        vertices (int): The number of vertices in the random graph.
+        edges (int): The number of edges in the random graph.
+
+    Raises:
+        AssertionError: Test failed.
+    """
+
+    adj = graph.assign_random_weights(graph.rand_graph(vertices, edges), 0, 100)
+    g = graph.CSRGraph.from_adj_list(adj)
+    key = ssspcache.fingerprint(adj)
+    tree = 16 * vertices
+    with TemporaryDirectory() as tmp:
+        for directory in (None, Path(tmp)):
+            cache = ssspcache.Cache(max_bytes=3 * tree, directory=directory)
+            for src in (0, 1, 2, 0, 3, 1, 0):
+                act = cache.sssp(adj, src, key)
+                dist, pred = act.dist, act.pred
+                exp = graph.dijkstra_ssp_binaryheap(adj, src)
+                assert dist == exp.dist, "Failed cache: dist"
+                assert pred[src] == src, "Failed cache: source pred"
+                for v, d in enumerate(dist):
+                    if v != src:
+                        assert d == dist[pred[v]] + min(
+                            w for w, u in adj[pred[v]] if u == v
+                        ), "Failed cache: pred"
+            # 0 1 2 miss, 0 hits, 3 evicts 1, 1 evicts 2, 0 hits
+            assert cache.hits == 2, "Failed cache: hit count"
+            assert cache.misses + cache.disk_hits == 5, "Failed cache: miss count"
+            assert cache.disk_hits == (1 if directory else 0), "Failed cache: disk"
+            assert cache.evictions == 2, "Failed cache: eviction count"
+            assert cache.size == 3 * tree, "Failed cache: size"
+            # a CSR graph has its own key but the same trees
+            dist = cache.sssp(g, 0).dist
+            assert dist == cache.sssp(adj, 0, key).dist, "Failed cache: CSR dist"
+            cache.clear()
+            assert not cache.trees and cache.size == 0, "Failed cache: clear"
+        assert not list(Path(tmp).iterdir()), "Failed cache: disk not cleared"
+    # the disk tier holds two files and deletes the least recently used
+    size = len(graph.dijkstra_ssp_binaryheap(adj, 0).tobytes())
+    with TemporaryDirectory() as tmp:
+        cache = ssspcache.Cache(tree - 1, Path(tmp), max_disk_bytes=2 * size)
+        for src in (0, 1, 0, 2):
+            cache.sssp(adj, src, key)
+        files = {path.name for path in Path(tmp).iterdir()}
+        assert files == {f"{key}-0.sssp", f"{key}-2.sssp"}, "Failed cache: disk LRU"
+        assert cache.disk_evictions == 1, "Failed cache: disk eviction count"
+        assert cache.disk_size == 2 * size, "Failed cache: disk size"
+        # a new cache on the same directory measures and trims it
+        cache = ssspcache.Cache(tree - 1, Path(tmp), max_disk_bytes=size)
+        assert cache.disk_size == size, "Failed cache: disk not trimmed"
+        assert cache.disk_evictions == 1, "Failed cache: old file kept"
+        assert cache.sssp(adj, 2, key) and cache.disk_hits == 1, "Failed cache: LRU"
+    # a tree larger than the cache is not kept
+    cache = ssspcache.Cache(max_bytes=tree - 1, heap="pairing")
+    cache.sssp(adj, 0, key)
+    cache.sssp(adj, 0, key)
+    assert cache.misses == 2 and not cache.trees, "Failed cache: oversized tree"
+
+
+if __name__ == "__main__":
+    fingerprint_test()
+    cache_test()
+    print("SSSP cache passed all tests")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3.9
+
+"""A pairing heap stored as columns of machine integers.
+
+Attributes:
+    NIL (int): The handle used for a missing node.
+"""
+
+from array import array
+
+NIL = -1
+
+
+class Heap:
+    """A minheap implemented using a pairing heap. Nodes are not objects.
+    A node is an integer handle that indexes into one array per field, so
+    adding a key only writes four integers.
+
+    Handles are given out in order starting from 0 and are never reused.
+
+    Attributes:
+        keys (array[int]): keys[node] is the key of the node.
+        child (array[int]): child[node] is the first child of the node or
+            NIL.
+        sibling (array[int]): sibling[node] is the next sibling of the node
+            or NIL.
+        parent (array[int]): parent[node] is the parent of the node if it is
+            a first child, else its previous sibling. NIL for the root.
+        root (int): The node containing the minimum key. NIL if the heap is
+            empty.
+        count (int): The number of handles given out.
+        size (int): The size of the heap.
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        """Inits an empty minheap.
+
+        Args:
+            capacity (int, optional): The number of nodes to allocate room
+                for. The heap grows past this if needed. Defaults to 16.
+        """
+
+        capacity = max(capacity, 1)
+        self.keys = array("q", bytes(8 * capacity))
+        self.child = array("q", bytes(8 * capacity))
+        self.sibling = array("q", bytes(8 * capacity))
+        self.parent = array("q", bytes(8 * capacity))
+        self.root = NIL
+        self.count = 0
+        self.size = 0
+
+    def grow(self) -> None:
+        """Doubles the room in every column."""
+
+        extra = bytes(8 * len(self.keys))
+        self.keys.frombytes(extra)
+        self.child.frombytes(extra)
+        self.sibling.frombytes(extra)
+        self.parent.frombytes(extra)
+
+    def meld(self, a: int, b: int) -> int:
+        """Melds two trees together.
+
+        Args:
+            a (int): The root of a disjoint tree.
+            b (int): The root of a disjoint tree.
+
+        Returns:
+            int: The root of the combined tree.
+        """
+
+        keys = self.keys
+        if keys[a] > keys[b]:
+            a, b = b, a
+        child = self.child
+        parent = self.parent
+        c = child[a]
+        parent[b] = a
+        self.sibling[b] = c
+        if c != NIL:
+            parent[c] = b
+        child[a] = b
+        return a
+
+    def combine(self, first: int) -> int:
+        """Links a list of sibling trees into one tree using two passes.
+
+        Args:
+            first (int): The first tree in the list.
+
+        Returns:
+            int: The root of the combined tree. Its parent is NIL.
+        """
+
+        sibling = self.sibling
+        meld = self.meld
+        # link pairs of subtrees by their roots
+        crawl = first
+        roots = []
+        while crawl != NIL and sibling[crawl] != NIL:
+            a = crawl
+            b = sibling[crawl]
+            crawl = sibling[b]
+            sibling[a] = NIL
+            sibling[b] = NIL
+            roots.append(meld(a, b))
+        if crawl != NIL:
+            sibling[crawl] = NIL
+            roots.append(crawl)
+        # link all pairs together to make one tree
+        res = roots.pop()
+        for node in reversed(roots):
+            res = meld(res, node)
+        self.parent[res] = NIL
+        return res
+
+    def add(self, key: int) -> int:
+        """Adds a key to the heap.
+
+        Args:
+            key (int): The key to add.
+
+        Returns:
+            int: The node that stores the key.
+        """
+
+        node = self.count
+        if node == len(self.keys):
+            self.grow()
+        self.count += 1
+        self.keys[node] = key
+        self.child[node] = NIL
+        self.sibling[node] = NIL
+        self.parent[node] = NIL
+        if self.root == NIL:
+            self.root = node
+        else:
+            self.root = self.meld(self.root, node)
+        self.size += 1
+        return node
+
+    def pop(self) -> int:
+        """Returns and removes the minimum node in this heap.
+
+        Returns:
+            int or None: The node with the minimum key. None if the heap is
+                empty.
+        """
+
+        res = self.root
+        if res == NIL:
+            return None
+        self.size -= 1
+        first = self.child[res]
+        self.child[res] = NIL
+        self.root = NIL if first == NIL else self.combine(first)
+        return res
+
+    def cut(self, node: int) -> None:
+        """Cuts a node from its parent. The node must not be the root.
+
+        Args:
+            node (int): The node to cut.
+        """
+
+        p = self.parent[node]
+        s = self.sibling[node]
+        if self.child[p] == node:
+            self.child[p] = s
+        else:
+            self.sibling[p] = s
+        if s != NIL:
+            self.parent[s] = p
+        self.parent[node] = NIL
+        self.sibling[node] = NIL
+
+    def decreasekey(self, node: int, key: int) -> int:
+        """Decreases the key stored in a node.
+
+        Args:
+            node (int): The node to decrease.
+            key (int): The new key for the node. Must be less than the
+                original key.
+
+        Returns:
+            int: The decreased node.
+        """
+
+        self.keys[node] = key
+        p = self.parent[node]
+        if p == NIL or self.keys[p] <= key:
+            return node
+        self.cut(node)
+        self.root = self.meld(self.root, node)
+        return node
+
+    def remove(self, node: int) -> int:
+        """Removes a node from the heap.
+
+        Args:
+            node (int): The node to remove.
+
+        Returns:
+            int: The removed node.
+        """
+
+        if node == self.root:
+            return self.pop()
+        self.cut(node)
+        self.size -= 1
+        first = self.child[node]
+        if first != NIL:
+            self.child[node] = NIL
+            self.root = self.meld(self.root, self.combine(first))
+        return node
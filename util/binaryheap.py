@@ -0,0 +1,175 @@
+#!/usr/bin/env python3.9
+
+
+class HeapNode:
+    """A node in an indexed binary heap.
+
+    Attributes:
+        key (int): The key value stored by this node.
+        value (any): The payload stored with the key.
+        pos (int): The index of this node in the heap array. -1 if the node
+            is not in a heap.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link nodes together.
+    """
+
+    __slots__ = ("key", "value", "pos", "pred")
+
+    def __init__(self, key: int, value: any = None) -> None:
+        """Inits a node that is not yet in a heap.
+
+        Args:
+            key (int): The key stored in the node.
+            value (any, optional): The payload stored in the node. Defaults
+                to None.
+        """
+
+        self.key = key
+        self.value = value
+        self.pos = -1
+        self.pred = None
+
+
+class Heap:
+    """A minheap implemented using an implicit binary heap. Every node knows
+    its position in the array, so decrease key and remove work in place
+    instead of pushing duplicate entries.
+
+    Attributes:
+        nodes (list[HeapNode]): The heap array. nodes[0] has the minimum key.
+        size (int): The size of the heap.
+    """
+
+    def __init__(self) -> None:
+        """Inits an empty minheap."""
+
+        self.nodes = []
+        self.size = 0
+
+    def siftup(self, node: HeapNode) -> None:
+        """Moves a node towards the root until its parent is not greater.
+
+        Args:
+            node (HeapNode): A node in this heap.
+        """
+
+        nodes = self.nodes
+        key = node.key
+        pos = node.pos
+        while pos > 0:
+            ppos = (pos - 1) >> 1
+            parent = nodes[ppos]
+            if parent.key <= key:
+                break
+            nodes[pos] = parent
+            parent.pos = pos
+            pos = ppos
+        nodes[pos] = node
+        node.pos = pos
+
+    def siftdown(self, node: HeapNode) -> None:
+        """Moves a node towards the leaves until no child is smaller.
+
+        Args:
+            node (HeapNode): A node in this heap.
+        """
+
+        nodes = self.nodes
+        size = self.size
+        key = node.key
+        pos = node.pos
+        cpos = 2 * pos + 1
+        while cpos < size:
+            child = nodes[cpos]
+            if cpos + 1 < size and nodes[cpos + 1].key < child.key:
+                cpos += 1
+                child = nodes[cpos]
+            if key <= child.key:
+                break
+            nodes[pos] = child
+            child.pos = pos
+            pos = cpos
+            cpos = 2 * pos + 1
+        nodes[pos] = node
+        node.pos = pos
+
+    def add(self, key: int, value: any = None) -> HeapNode:
+        """Adds a key to the heap.
+
+        Args:
+            key (int): The key to add.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
+
+        Returns:
+            HeapNode: The node that stores the key.
+        """
+
+        node = HeapNode(key, value)
+        node.pos = self.size
+        self.nodes.append(node)
+        self.size += 1
+        self.siftup(node)
+        return node
+
+    def pop(self) -> HeapNode:
+        """Returns and removes the minimum node in this heap.
+
+        Returns:
+            HeapNode or None: The node with the minimum key. None if the
+                heap is empty.
+        """
+
+        if not self.size:
+            return None
+        nodes = self.nodes
+        res = nodes[0]
+        last = nodes.pop()
+        self.size -= 1
+        if last is not res:
+            last.pos = 0
+            self.siftdown(last)
+        res.pos = -1
+        return res
+
+    def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
+        """Decreases the key stored in a node.
+
+        Args:
+            node (HeapNode): The node to decrease.
+            key (int): The new key for the node. Must be less than the
+                original key.
+
+        Returns:
+            HeapNode: The decreased node.
+        """
+
+        # if node.key < key:
+        #     raise ValueError("Cannot increase key")
+        node.key = key
+        self.siftup(node)
+        return node
+
+    def remove(self, node: HeapNode) -> HeapNode:
+        """Removes a node from the heap.
+
+        Args:
+            node (HeapNode): The node to remove.
+
+        Returns:
+            HeapNode: The removed node.
+        """
+
+        nodes = self.nodes
+        last = nodes.pop()
+        self.size -= 1
+        if last is not node:
+            # move the last node into the hole and restore heap order
+            last.pos = node.pos
+            nodes[last.pos] = last
+            if last.key < node.key:
+                self.siftup(last)
+            else:
+                self.siftdown(last)
+        node.pos = -1
+        return node
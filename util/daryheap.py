@@ -0,0 +1,217 @@
+#!/usr/bin/env python3.9
+
+"""A d-ary implicit heap.
+
+Attributes:
+    DEFAULT_ARITY (int): The number of children per node used if none is
+        given.
+"""
+
+DEFAULT_ARITY = 4
+
+
+class HeapNode:
+    """A node in a d-ary heap.
+
+    Attributes:
+        key (int): The key value stored by this node.
+        value (any): The payload stored with the key.
+        pos (int): The index of this node in the heap array. -1 if the node
+            is not in a heap.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link nodes together.
+    """
+
+    __slots__ = ("key", "value", "pos", "pred")
+
+    def __init__(self, key: int, value: any = None) -> None:
+        """Inits a node that is not yet in a heap.
+
+        Args:
+            key (int): The key stored in the node.
+            value (any, optional): The payload stored in the node. Defaults
+                to None.
+        """
+
+        self.key = key
+        self.value = value
+        self.pos = -1
+        self.pred = None
+
+
+class Heap:
+    """A minheap implemented using an implicit d-ary heap. The children of
+    the node at index i are at indices d * i + 1 to d * i + d. Keys are kept
+    in their own array next to the nodes so picking the smallest child scans
+    one contiguous slice of ints.
+
+    Attributes:
+        arity (int): The number of children per node.
+        keys (list[int]): The keys of the heap array. keys[i] == nodes[i].key
+        nodes (list[HeapNode]): The heap array. nodes[0] has the minimum key.
+        size (int): The size of the heap.
+    """
+
+    def __init__(self, arity: int = DEFAULT_ARITY) -> None:
+        """Inits an empty minheap.
+
+        Args:
+            arity (int, optional): The number of children per node. Defaults
+                to DEFAULT_ARITY.
+
+        Raises:
+            ValueError: If arity is less than 2.
+        """
+
+        if arity < 2:
+            raise ValueError("Arity must be at least 2")
+        self.arity = arity
+        self.keys = []
+        self.nodes = []
+        self.size = 0
+
+    def siftup(self, pos: int) -> None:
+        """Moves the node at an index towards the root until its parent is
+        not greater.
+
+        Args:
+            pos (int): The index of the node to move.
+        """
+
+        keys = self.keys
+        nodes = self.nodes
+        d = self.arity
+        node = nodes[pos]
+        key = keys[pos]
+        while pos > 0:
+            ppos = (pos - 1) // d
+            if keys[ppos] <= key:
+                break
+            parent = nodes[ppos]
+            keys[pos] = keys[ppos]
+            nodes[pos] = parent
+            parent.pos = pos
+            pos = ppos
+        keys[pos] = key
+        nodes[pos] = node
+        node.pos = pos
+
+    def siftdown(self, pos: int) -> None:
+        """Moves the node at an index towards the leaves until no child is
+        smaller.
+
+        Args:
+            pos (int): The index of the node to move.
+        """
+
+        keys = self.keys
+        nodes = self.nodes
+        d = self.arity
+        size = self.size
+        node = nodes[pos]
+        key = keys[pos]
+        first = d * pos + 1
+        while first < size:
+            children = keys[first : first + d]
+            least = min(children)
+            if key <= least:
+                break
+            cpos = first + children.index(least)
+            child = nodes[cpos]
+            keys[pos] = least
+            nodes[pos] = child
+            child.pos = pos
+            pos = cpos
+            first = d * pos + 1
+        keys[pos] = key
+        nodes[pos] = node
+        node.pos = pos
+
+    def add(self, key: int, value: any = None) -> HeapNode:
+        """Adds a key to the heap.
+
+        Args:
+            key (int): The key to add.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
+
+        Returns:
+            HeapNode: The node that stores the key.
+        """
+
+        node = HeapNode(key, value)
+        node.pos = self.size
+        self.keys.append(key)
+        self.nodes.append(node)
+        self.size += 1
+        self.siftup(node.pos)
+        return node
+
+    def pop(self) -> HeapNode:
+        """Returns and removes the minimum node in this heap.
+
+        Returns:
+            HeapNode or None: The node with the minimum key. None if the
+                heap is empty.
+        """
+
+        if not self.size:
+            return None
+        res = self.nodes[0]
+        self.detach(0)
+        return res
+
+    def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
+        """Decreases the key stored in a node.
+
+        Args:
+            node (HeapNode): The node to decrease.
+            key (int): The new key for the node. Must be less than the
+                original key.
+
+        Returns:
+            HeapNode: The decreased node.
+        """
+
+        # if node.key < key:
+        #     raise ValueError("Cannot increase key")
+        node.key = key
+        self.keys[node.pos] = key
+        self.siftup(node.pos)
+        return node
+
+    def remove(self, node: HeapNode) -> HeapNode:
+        """Removes a node from the heap.
+
+        Args:
+            node (HeapNode): The node to remove.
+
+        Returns:
+            HeapNode: The removed node.
+        """
+
+        self.detach(node.pos)
+        return node
+
+    def detach(self, pos: int) -> None:
+        """Removes the node at an index by moving the last node into its
+        place and restoring heap order.
+
+        Args:
+            pos (int): The index of the node to remove.
+        """
+
+        node = self.nodes[pos]
+        key = self.keys.pop()
+        last = self.nodes.pop()
+        self.size -= 1
+        node.pos = -1
+        if last is node:
+            return
+        self.keys[pos] = key
+        self.nodes[pos] = last
+        last.pos = pos
+        if key < node.key:
+            self.siftup(pos)
+        else:
+            self.siftdown(pos)
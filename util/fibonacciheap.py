@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 import math
-
-PHI = (1 + 5 ** 0.5) / 2
+from operator import attrgetter
 
 
 class HeapNode:
@@ -12,6 +11,7 @@ class HeapNode:
     Attributes:
         key (int): The key value stored by this node. Guaranteed to be less
             than or equal to all keys in this subheap.
+        value (any): The payload stored with the key.
         parent (HeapNode or None): The parent of the node.
         child (HeapNode or None): An arbitrary child of the node.
         left (HeapNode): The left sibling of this node. Creates a circular
@@ -21,22 +21,40 @@ class HeapNode:
         degree (int): The height of this node.
         marked (bool): Whether this node lost a direct child. False if this
             node is a root.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link nodes together.
     """
 
-    def __init__(self, key: int) -> None:
+    __slots__ = (
+        "key",
+        "value",
+        "parent",
+        "child",
+        "left",
+        "right",
+        "degree",
+        "marked",
+        "pred",
+    )
+
+    def __init__(self, key: int, value: any = None) -> None:
         """Inits a solitary node of a heap.
 
         Args:
             key (int): The key stored in the node.
+            value (any, optional): The payload stored in the node. Defaults
+                to None.
         """
 
         self.key = key
+        self.value = value
         self.parent = None
         self.child = None
         self.left = self
         self.right = self
         self.degree = 0
         self.marked = False
+        self.pred = None
 
     def addleft(self, node: HeapNode) -> None:
         """Merges another node with this node. Merging happens to the left
@@ -66,6 +84,8 @@ class Heap:
     Attributes:
         minroot (HeapNode or None): The minimum node in the heap.
         size (int): The number of nodes in the heap.
+        degrees (list[HeapNode or None]): The table used to consolidate
+            roots by degree. All None between pops.
     """
 
     def __init__(self) -> None:
@@ -73,18 +93,21 @@ class Heap:
 
         self.minroot = None
         self.size = 0
+        self.degrees = []
 
-    def add(self, key: int) -> HeapNode:
+    def add(self, key: int, value: any = None) -> HeapNode:
         """Adds a key into the heap.
 
         Args:
             key (int): The key to be added.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
 
         Returns:
             HeapNode: The node containing the key.
         """
 
-        node = HeapNode(key)
+        node = HeapNode(key, value)
         if self.minroot:
             self.minroot.addleft(node)
             if key < self.minroot.key:
@@ -94,6 +117,35 @@ class Heap:
         self.size += 1
         return node
 
+    def add_many(self, keys: list[int]) -> list[HeapNode]:
+        """Adds many keys into the heap in linear time. The new nodes are
+        linked into one circular list, which is spliced into the root list.
+
+        Args:
+            keys (list[int]): The keys to be added.
+
+        Returns:
+            list[HeapNode]: The nodes containing the keys, in order.
+        """
+
+        nodes = [HeapNode(key) for key in keys]
+        if not nodes:
+            return nodes
+        prev = nodes[-1]
+        for node in nodes:
+            node.right = prev
+            prev.left = node
+            prev = node
+        least = min(nodes, key=attrgetter("key"))
+        if self.minroot:
+            self.minroot.addleft(nodes[0])
+            if least.key < self.minroot.key:
+                self.minroot = least
+        else:
+            self.minroot = least
+        self.size += len(nodes)
+        return nodes
+
     def union(self, heap: Heap) -> Heap:
         """Unions another heap with this heap.
 
@@ -138,12 +190,65 @@ class Heap:
         self.size -= 1
         return res
 
+    def pop_many(self, k: int) -> list[HeapNode]:
+        """Returns and removes the k minimum nodes in this heap.
+
+        Args:
+            k (int): The number of nodes to pop.
+
+        Returns:
+            list[HeapNode]: The popped nodes in increasing key order. Shorter
+                than k if the heap runs out of nodes.
+        """
+
+        pop = self.pop
+        return [pop() for _ in range(min(k, self.size))]
+
+    def replace(self, key: int) -> tuple[HeapNode, HeapNode]:
+        """Pops the minimum node and adds a key. The new node joins the root
+        list before the pop consolidates it.
+
+        Args:
+            key (int): The key to add.
+
+        Returns:
+            tuple[HeapNode, HeapNode]: (popped node or None if the heap was
+                empty, node that stores the key)
+        """
+
+        if not self.minroot:
+            return None, self.add(key)
+        node = HeapNode(key)
+        self.minroot.addleft(node)
+        self.size += 1
+        return self.pop(), node
+
+    def pushpop(self, key: int) -> tuple[HeapNode, HeapNode]:
+        """Adds a key and then pops the minimum node. The heap is not touched
+        if the key is not greater than the minimum.
+
+        Args:
+            key (int): The key to add.
+
+        Returns:
+            tuple[HeapNode, HeapNode]: (popped node, node that stores the
+                key) Both are the same node if the key was popped.
+        """
+
+        if not self.minroot or key <= self.minroot.key:
+            node = HeapNode(key)
+            return node, node
+        return self.replace(key)
+
     def consolidate(self) -> None:
         """Consolidates the roots of the heap after a pop operation. Also
-        Fixes the parent reference of the root nodes.
+        Fixes the parent reference of the root nodes. The degree table is
+        owned by the heap and emptied again before returning, so nothing is
+        allocated unless the table has to grow.
         """
 
-        deg = [None] * (int(math.log(self.size, PHI)) + 1)
+        deg = self.degrees
+        top = len(deg)
         p = self.minroot
         last = p.right
         loop = True
@@ -152,9 +257,13 @@ class Heap:
             if p == last:
                 loop = False
             np = p.left
-            while deg[p.degree]:
-                q = deg[p.degree]
-                deg[p.degree] = None
+            d = p.degree
+            while d + 1 >= top:
+                deg.append(None)
+                top += 1
+            q = deg[d]
+            while q:
+                deg[d] = None
                 # make the greater node a child
                 if p.key > q.key:
                     p, q = q, p
@@ -165,18 +274,25 @@ class Heap:
                     p.child = q
                 q.parent = p
                 p.degree += 1
-            deg[p.degree] = p
+                d += 1
+                if d + 1 == top:
+                    deg.append(None)
+                    top += 1
+                q = deg[d]
+            deg[d] = p
+            root = p
             p = np
-        # find the minroot and fix parent references
-        self.minroot = None
-        for root in deg:
-            if root:
-                root.parent = None
-                if self.minroot:
-                    if root.key < self.minroot.key:
-                        self.minroot = root
-                else:
-                    self.minroot = root
+        # find the minroot, fix parent references and clear the table by
+        # walking the roots that are left
+        self.minroot = p = root
+        while True:
+            p.parent = None
+            deg[p.degree] = None
+            if p.key < self.minroot.key:
+                self.minroot = p
+            p = p.right
+            if p == root:
+                return
 
     def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
         """Decreases the key stored in a node.
@@ -201,6 +317,18 @@ class Heap:
             self.minroot = node
         return node
 
+    def decreasekey_many(self, pairs: list[tuple[HeapNode, int]]) -> None:
+        """Decreases the keys stored in many nodes.
+
+        Args:
+            pairs (list[tuple[HeapNode, int]]): (node, new key) Each key
+                must be less than the node's original key.
+        """
+
+        decreasekey = self.decreasekey
+        for node, key in pairs:
+            decreasekey(node, key)
+
     def cut(self, node: HeapNode) -> None:
         """Cuts a node from its parent and adds it to the root list.
 
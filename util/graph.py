@@ -4,104 +4,352 @@
 
 Attributes:
     MAX_VAL (int): A default maximum weight value.
+    TARGET_TYPE (str): The array type code of CSR edge targets. 32 bit, so a
+        CSR graph holds fewer than 2 ** 31 vertices.
 """
 
-from random import randrange
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, repeat
+import math
+from operator import sub
+from multiprocessing import shared_memory
+import os
+from random import choices, getrandbits, randrange, random
 from heapq import heappop, heappush
 import sys
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    # only the dense graph functions need NumPy
+    np = None
 
 sys.path.append(str(Path(__file__).parent.parent.absolute()))
 
-from util import pairingheap, fibonacciheap
+from util import (
+    pairingheap,
+    fibonacciheap,
+    binaryheap,
+    daryheap,
+    radixheap,
+    hollowheap,
+    rankpairingheap,
+    heaps,
+)
 
 MAX_VAL = int(1e9)
+TARGET_TYPE = "i"
 
 
-def dijkstra_ssp_pairingheap(
-    adj_list: list[list[tuple[int]]], src: int
-) -> list[tuple[int]]:
+class ShortestPaths:
+    """The shortest paths from one source, as two flat arrays. Every
+    dijkstra_ssp_* function returns one, so results hold 16 bytes per vertex
+    instead of a heap node or tuple, and paths are only built when asked
+    for. Indexing gives (minimum distance, predecessor), or None if the
+    vertex cannot be reached.
+
+    Attributes:
+        src (int): The source index.
+        dist (array[int]): dist[v] is the minimum distance to v, or -1 if v
+            cannot be reached.
+        pred (array[int]): pred[v] is the vertex before v on a shortest
+            path, or -1 if v cannot be reached. pred[src] == src.
+    """
+
+    __slots__ = ("src", "dist", "pred")
+
+    def __init__(self, src: int, dist: array, pred: array) -> None:
+        """Inits a result from its arrays.
+
+        Args:
+            src (int): The source index.
+            dist (array[int]): The minimum distance to each vertex, or -1.
+            pred (array[int]): The predecessor of each vertex, or -1.
+
+        Raises:
+            ValueError: If the arrays have different lengths.
+        """
+
+        if len(dist) != len(pred):
+            raise ValueError("Distances and predecessors do not match")
+        self.src = src
+        self.dist = dist
+        self.pred = pred
+
+    @classmethod
+    def from_nodes(cls, src: int, nodes: list[heaps.HeapNode]) -> ShortestPaths:
+        """Packs the heap handles left by Dijkstra's.
+
+        Args:
+            src (int): The source index.
+            nodes (list[heaps.HeapNode]): The handle of each vertex, or None.
+                The vertex is in value and the predecessor's handle in pred.
+
+        Returns:
+            ShortestPaths: The result.
+        """
+
+        dist = array("q", [node.key if node else -1 for node in nodes])
+        pred = array("q", [node.pred.value if node else -1 for node in nodes])
+        return cls(src, dist, pred)
+
+    @classmethod
+    def from_pairs(cls, src: int, pairs: list[tuple[int]]) -> ShortestPaths:
+        """Packs (minimum distance, predecessor) pairs.
+
+        Args:
+            src (int): The source index.
+            pairs (list[tuple[int]]): The pair of each vertex, or None. Extra
+                items after the predecessor are ignored.
+
+        Returns:
+            ShortestPaths: The result.
+        """
+
+        dist = array("q", [p[0] if p else -1 for p in pairs])
+        pred = array("q", [p[1] if p else -1 for p in pairs])
+        return cls(src, dist, pred)
+
+    def __len__(self) -> int:
+        """Returns the number of vertices."""
+
+        return len(self.dist)
+
+    def __getitem__(self, v: int) -> Optional[tuple[int]]:
+        """Returns (minimum distance, predecessor) of a vertex. None if it
+        cannot be reached."""
+
+        d = self.dist[v]
+        return (d, self.pred[v]) if d >= 0 else None
+
+    def reached(self) -> int:
+        """Returns the number of vertices that can be reached."""
+
+        return len(self.dist) - self.dist.count(-1)
+
+    def path(self, v: int) -> Optional[list[int]]:
+        """Follows predecessors back from a vertex.
+
+        Args:
+            v (int): The target index.
+
+        Returns:
+            list[int] or None: The vertices on a shortest path from the
+                source to v. None if v cannot be reached.
+        """
+
+        pred = self.pred
+        if pred[v] < 0:
+            return None
+        res = [v]
+        while v != self.src:
+            v = pred[v]
+            res.append(v)
+        res.reverse()
+        return res
+
+    def nbytes(self) -> int:
+        """Returns the size of the arrays in bytes."""
+
+        return sum(arr.itemsize * len(arr) for arr in (self.dist, self.pred))
+
+    def tobytes(self) -> bytes:
+        """Exports the result as native 64 bit integers: the number of
+        vertices, the source, the distances and then the predecessors.
+
+        Returns:
+            bytes: The result, for frombytes.
+        """
+
+        head = array("q", (len(self.dist), self.src))
+        return b"".join((head.tobytes(), self.dist.tobytes(), self.pred.tobytes()))
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> ShortestPaths:
+        """Imports a result exported by tobytes.
+
+        Args:
+            data (bytes): The result.
+
+        Raises:
+            ValueError: If data is the wrong size.
+
+        Returns:
+            ShortestPaths: The result.
+        """
+
+        arr = array("q")
+        arr.frombytes(data)
+        n = arr[0] if arr else -1
+        if len(arr) != 2 + 2 * n:
+            raise ValueError("Shortest paths data is the wrong size")
+        return cls(arr[1], arr[2 : 2 + n], arr[2 + n :])
+
+
+def dijkstra_ssp(
+    adj_list: list[list[tuple[int]]], src: int, q: heaps.Heap
+) -> ShortestPaths:
     """Dijkstra's single source shortest path algorithm. Finds the minimum
-        weight path to reach all vertices from a source. Uses a pairing heap.
+        weight path to reach all vertices from a source. Works with any heap
+        that follows the heaps.Heap protocol.
 
     Args:
         adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
             Weights must be positive.
             adj_list[vertex index] = [(weight, adjacent index)]
         src (int): The source index.
+        q (heaps.Heap): An empty heap.
 
     Returns:
-        list[HeapNode]: HeapNodes with minimum distances and the
-            second-to-last vertex on a path from the source to the vertex.
-            HeapNode.key (int): minimum distance
-            HeapNode.pred (HeapNode): the predecessor
+        ShortestPaths: The minimum distances and the second-to-last vertex
+            on a path from the source to each vertex. The heap's handles
+            are dropped.
     """
 
     nodes = [None] * len(adj_list)
-    q = pairingheap.Heap()
-    nodes[src] = q.add(0)
-    nodes[src].index = src
+    nodes[src] = q.add(0, src)
     nodes[src].pred = nodes[src]
     while q.size != 0:
         u = q.pop()
-        # relax al edges out of u
-        for w, v in adj_list[u.index]:
+        # relax all edges out of u
+        for w, v in adj_list[u.value]:
             if nodes[v]:
                 v = nodes[v]
                 if v.key > u.key + w:
                     q.decreasekey(v, u.key + w)
                     v.pred = u
             else:
-                nodes[v] = q.add(u.key + w)
-                nodes[v].index = v
+                nodes[v] = q.add(u.key + w, v)
                 nodes[v].pred = u
-    return nodes
+    return ShortestPaths.from_nodes(src, nodes)
+
+
+def dijkstra_ssp_pairingheap(
+    adj_list: list[list[tuple[int]]], src: int
+) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using a pairing heap.
+        See dijkstra_ssp.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+        src (int): The source index.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    return dijkstra_ssp(adj_list, src, pairingheap.Heap())
 
 
 def dijkstra_ssp_fibonacciheap(
     adj_list: list[list[tuple[int]]], src: int
-) -> list[tuple[int]]:
-    """Dijkstra's single source shortest path algorithm. Finds the minimum
-        weight path to reach all vertices from a source. Uses a Fibonacci
-        heap. The path is not stored, but it could be.
+) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using a Fibonacci heap.
+        See dijkstra_ssp.
 
     Args:
         adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
-            Weights must be positive.
-            adj_list[vertex index] = [(weight, adjacent index)]
         src (int): The source index.
 
     Returns:
-        list[HeapNode]: HeapNodes with minimum distances and the
-            second-to-last vertex on a path from the source to the vertex.
-            HeapNode.key (int): minimum distance
-            HeapNodes.pred (HeapNode): the predecessor
+        ShortestPaths: The minimum distances and predecessors.
     """
 
-    nodes = [None] * len(adj_list)
-    q = fibonacciheap.Heap()
-    nodes[src] = q.add(0)
-    nodes[src].index = src
-    nodes[src].pred = nodes[src]
-    while q.size != 0:
-        u = q.pop()
-        # relax all edges out of u
-        for w, v in adj_list[u.index]:
-            if nodes[v]:
-                v = nodes[v]
-                if v.key > u.key + w:
-                    q.decreasekey(v, u.key + w)
-                    v.pred = u
-            else:
-                nodes[v] = q.add(u.key + w)
-                nodes[v].index = v
-                nodes[v].pred = u
-    return nodes
+    return dijkstra_ssp(adj_list, src, fibonacciheap.Heap())
+
+
+def dijkstra_ssp_hollowheap(
+    adj_list: list[list[tuple[int]]], src: int
+) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using a hollow heap.
+        See dijkstra_ssp.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+        src (int): The source index.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    return dijkstra_ssp(adj_list, src, hollowheap.Heap())
+
+
+def dijkstra_ssp_rankpairingheap(
+    adj_list: list[list[tuple[int]]], src: int
+) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using a rank-pairing
+        heap. See dijkstra_ssp.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+        src (int): The source index.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    return dijkstra_ssp(adj_list, src, rankpairingheap.Heap())
+
+
+def dijkstra_ssp_indexedheap(
+    adj_list: list[list[tuple[int]]], src: int
+) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using an indexed binary
+        heap. See dijkstra_ssp.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+        src (int): The source index.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    return dijkstra_ssp(adj_list, src, binaryheap.Heap())
+
+
+def dijkstra_ssp_daryheap(
+    adj_list: list[list[tuple[int]]], src: int, arity: int = daryheap.DEFAULT_ARITY
+) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using a d-ary heap. See
+        dijkstra_ssp.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+        src (int): The source index.
+        arity (int, optional): The number of children per heap node.
+            Defaults to daryheap.DEFAULT_ARITY.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    return dijkstra_ssp(adj_list, src, daryheap.Heap(arity))
+
+
+def dijkstra_ssp_radixheap(adj_list: list[list[tuple[int]]], src: int) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm using a radix heap.
+        Weights must be non-negative integers. See dijkstra_ssp.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+        src (int): The source index.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    return dijkstra_ssp(adj_list, src, radixheap.Heap())
 
 
 def dijkstra_ssp_binaryheap(
     adj_list: list[list[tuple[int]]], src: int
-) -> list[tuple[int]]:
+) -> ShortestPaths:
     """Dijkstra's single source shortest path algorithm. Finds the minimum
         weight path to reach all vertices from a source. Uses a binary
         heap.
@@ -113,7 +361,7 @@ def dijkstra_ssp_binaryheap(
         src (int): The source index.
 
     Returns:
-        list[tuple[int]]: (minimum distance, predecessor)
+        ShortestPaths: The minimum distances and predecessors.
     """
 
     dis = [None] * len(adj_list)
@@ -125,7 +373,7 @@ def dijkstra_ssp_binaryheap(
             u = heappop(q)
         if dis[u[1]][0] != u[0]:
             # q is empty
-            return dis
+            return ShortestPaths.from_pairs(src, dis)
         # relax all edges out of u
         for w, v in adj_list[u[1]]:
             if dis[v]:
@@ -135,10 +383,10 @@ def dijkstra_ssp_binaryheap(
             else:
                 heappush(q, (u[0] + w, v))
                 dis[v] = (u[0] + w, u[1])
-    return dis
+    return ShortestPaths.from_pairs(src, dis)
 
 
-def dijkstra_ssp_noheap(adj_list: list[list[tuple[int]]], src: int) -> list[tuple[int]]:
+def dijkstra_ssp_noheap(adj_list: list[list[tuple[int]]], src: int) -> ShortestPaths:
     """Dijkstra's single source shortest path algorithm. Finds the minimum
         weight path to reach all vertices from a source. Does not use a
         priority queue.
@@ -150,7 +398,7 @@ def dijkstra_ssp_noheap(adj_list: list[list[tuple[int]]], src: int) -> list[tupl
         src (int): The source index.
 
     Returns:
-        list[tuple[int]]: (minimum distance, predecessor)
+        ShortestPaths: The minimum distances and predecessors.
     """
 
     dis = [None] * len(adj_list)
@@ -164,7 +412,7 @@ def dijkstra_ssp_noheap(adj_list: list[list[tuple[int]]], src: int) -> list[tupl
                 ui = i
         if not u:
             # all vertices are done
-            return dis
+            return ShortestPaths.from_pairs(src, dis)
         # vertex u is done
         dis[ui] = (u[0], u[1], True)
         # relax all edges out of u
@@ -176,8 +424,1684 @@ def dijkstra_ssp_noheap(adj_list: list[list[tuple[int]]], src: int) -> list[tupl
                 dis[v] = (u[0] + w, ui, False)
 
 
+class DynamicShortestPaths:
+    """Shortest paths from one source that are repaired after edge changes
+    instead of being computed again. Raising the weight of a tree edge only
+    affects the subtree below it, and lowering a weight or adding an edge
+    only affects vertices it brings closer, so a batch of changes runs
+    Dijkstra's from those vertices alone. Repairs add vertices to the heap
+    once and then mostly decrease their keys.
+
+    Attributes:
+        src (int): The source index.
+        heap (str): The name of the heap in heaps.HEAPS used for repairs.
+        out (list[dict[int, int]]): out[u][v] is the weight of edge (u, v).
+        into (list[dict[int, int]]): into[v][u] is the weight of edge (u, v).
+        dist (list[int]): The minimum distance to each vertex, inf if it
+            cannot be reached.
+        pred (list[int]): The vertex before each vertex on a shortest path,
+            -1 if it cannot be reached.
+        children (list[set[int]]): The vertices whose pred is each vertex.
+    """
+
+    def __init__(
+        self, adj_list: list[list[tuple[int]]], src: int, heap: str = "pairing"
+    ) -> None:
+        """Runs Dijkstra's once to get the first tree.
+
+        Args:
+            adj_list (list[list[tuple[int]]]): The graph in adjacency list
+                format. Weights must be non-negative. Of parallel edges only
+                the lightest is kept.
+                adj_list[vertex index] = [(weight, adjacent index)]
+            src (int): The source index.
+            heap (str, optional): The name of a heap in heaps.HEAPS. Defaults
+                to "pairing".
+        """
+
+        n = len(adj_list)
+        self.src = src
+        self.heap = heap
+        self.out = [{} for _ in range(n)]
+        self.into = [{} for _ in range(n)]
+        for u, edges in enumerate(adj_list):
+            for w, v in edges:
+                if w < self.out[u].get(v, math.inf):
+                    self.out[u][v] = self.into[v][u] = w
+        res = dijkstra_ssp(adj_list, src, heaps.make(heap))
+        self.dist = [d if d >= 0 else math.inf for d in res.dist]
+        self.pred = res.pred.tolist()
+        self.children = [set() for _ in range(n)]
+        for v, u in enumerate(self.pred):
+            if u >= 0 and v != src:
+                self.children[u].add(v)
+
+    def adj_list(self) -> list[list[tuple[int]]]:
+        """Returns the current graph in adjacency list format."""
+
+        return [[(w, v) for v, w in edges.items()] for edges in self.out]
+
+    def update(self, changes: Iterable[tuple[int]]) -> int:
+        """Changes a batch of edges and repairs the tree.
+
+        Args:
+            changes (Iterable[tuple[int]]): (tail, head, weight) for each
+                edge. The edge is added if missing and removed if the weight
+                is None. Weights must be non-negative.
+
+        Returns:
+            int: The number of vertices settled by the repair.
+        """
+
+        dist = self.dist
+        pred = self.pred
+        inf = math.inf
+        raised = []
+        lowered = []
+        for u, v, w in changes:
+            old = self.out[u].get(v, inf)
+            if w is None:
+                self.out[u].pop(v, None)
+                self.into[v].pop(u, None)
+                w = inf
+            else:
+                self.out[u][v] = self.into[v][u] = w
+            if w > old and pred[v] == u and v != self.src:
+                raised.append(v)
+            elif w < old:
+                lowered.append(v)
+        # every vertex below a raised tree edge loses its distance
+        affected = []
+        for v in raised:
+            if dist[v] == inf:
+                continue
+            stack = [v]
+            while stack:
+                x = stack.pop()
+                dist[x] = inf
+                affected.append(x)
+                stack += self.children[x]
+        for x in affected:
+            if pred[x] >= 0:
+                self.children[pred[x]].discard(x)
+            pred[x] = -1
+        # reconnect each lost vertex through its best incoming edge that is
+        # still settled, and take every lowered edge that helps
+        q = heaps.make(self.heap)
+        nodes = {}
+        for x in affected + lowered:
+            best = dist[x]
+            via = -1
+            for u, w in self.into[x].items():
+                if dist[u] + w < best:
+                    best = dist[u] + w
+                    via = u
+            if via >= 0:
+                self.relink(x, via, best, q, nodes)
+        # Dijkstra's from the vertices that changed
+        settled = 0
+        while q.size:
+            node = q.pop()
+            x = node.value
+            del nodes[x]
+            settled += 1
+            d = dist[x]
+            for v, w in self.out[x].items():
+                if d + w < dist[v]:
+                    self.relink(v, x, d + w, q, nodes)
+        return settled
+
+    def relink(
+        self, v: int, u: int, d: int, q: heaps.Heap, nodes: dict[int, heaps.HeapNode]
+    ) -> None:
+        """Makes u the predecessor of v at a shorter distance, and adds v to
+        the heap or decreases its key.
+
+        Args:
+            v (int): The vertex that got closer.
+            u (int): Its new predecessor.
+            d (int): Its new distance.
+            q (heaps.Heap): The repair heap.
+            nodes (dict[int, heaps.HeapNode]): The handle of each vertex in
+                q.
+        """
+
+        if self.pred[v] >= 0:
+            self.children[self.pred[v]].discard(v)
+        self.pred[v] = u
+        self.children[u].add(v)
+        self.dist[v] = d
+        if v in nodes:
+            q.decreasekey(nodes[v], d)
+        else:
+            nodes[v] = q.add(d, v)
+
+    def result(self) -> ShortestPaths:
+        """Returns a copy of the current tree.
+
+        Returns:
+            ShortestPaths: The minimum distances and predecessors.
+        """
+
+        dist = array("q", [-1 if d == math.inf else d for d in self.dist])
+        return ShortestPaths(self.src, dist, array("q", self.pred))
+
+
+def path_to(node: heaps.HeapNode) -> list[int]:
+    """Follows predecessors back to the source of a Dijkstra search.
+
+    Args:
+        node (heaps.HeapNode): A handle from a Dijkstra search. The source's
+            predecessor is itself.
+
+    Returns:
+        list[int]: The vertices on the path, from the source to node.
+    """
+
+    path = [node.value]
+    while node.pred is not node:
+        node = node.pred
+        path.append(node.value)
+    path.reverse()
+    return path
+
+
+def reverse_graph(adj_list: list[list[tuple[int]]]) -> list[list[tuple[int]]]:
+    """Reverses the edges of a directed graph.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+            adj_list[vertex index] = [(weight, adjacent index)]
+
+    Returns:
+        list[list[tuple[int]]]: The graph with every edge turned around.
+    """
+
+    radj_list = [[] for _ in adj_list]
+    for u, edges in enumerate(adj_list):
+        for w, v in edges:
+            radj_list[v].append((w, u))
+    return radj_list
+
+
+def dijkstra_st(
+    adj_list: list[list[tuple[int]]], src: int, dst: int, q: heaps.Heap
+) -> tuple[int, list[int], int]:
+    """Dijkstra's shortest path algorithm between two vertices. Stops as soon
+        as the target is settled instead of settling the whole graph.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+            Weights must be non-negative.
+            adj_list[vertex index] = [(weight, adjacent index)]
+        src (int): The source index.
+        dst (int): The target index.
+        q (heaps.Heap): An empty heap.
+
+    Returns:
+        tuple[int, list[int], int]: (distance, path from src to dst, number
+            of settled vertices) The distance and path are None if dst cannot
+            be reached.
+    """
+
+    nodes = [None] * len(adj_list)
+    nodes[src] = q.add(0, src)
+    nodes[src].pred = nodes[src]
+    settled = 0
+    while q.size != 0:
+        u = q.pop()
+        settled += 1
+        if u.value == dst:
+            return u.key, path_to(u), settled
+        # relax all edges out of u
+        for w, v in adj_list[u.value]:
+            if nodes[v]:
+                v = nodes[v]
+                if v.key > u.key + w:
+                    q.decreasekey(v, u.key + w)
+                    v.pred = u
+            else:
+                nodes[v] = q.add(u.key + w, v)
+                nodes[v].pred = u
+    return None, None, settled
+
+
+def dijkstra_bidirectional(
+    adj_list: list[list[tuple[int]]],
+    src: int,
+    dst: int,
+    heap: str = "pairing",
+    radj_list: list[list[tuple[int]]] = None,
+) -> tuple[int, list[int], int]:
+    """Bidirectional Dijkstra's between two vertices. A forward search from
+        the source and a backward search from the target take turns, each
+        step going to the side with the smaller heap. Every edge between the
+        two searches is a candidate path. The search stops once the last
+        popped keys of both sides add up to at least the best candidate.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+            Weights must be non-negative.
+            adj_list[vertex index] = [(weight, adjacent index)]
+        src (int): The source index.
+        dst (int): The target index.
+        heap (str, optional): The name of a heap in heaps.HEAPS. Defaults to
+            "pairing".
+        radj_list (list[list[tuple[int]]], optional): The reverse of
+            adj_list, from reverse_graph. Defaults to adj_list, which is
+            right for undirected graphs.
+
+    Returns:
+        tuple[int, list[int], int]: (distance, path from src to dst, number
+            of settled vertices on both sides) The distance and path are None
+            if dst cannot be reached.
+    """
+
+    if radj_list is None:
+        radj_list = adj_list
+    n = len(adj_list)
+    # index 0 searches forward from src, index 1 backward from dst
+    graphs = (adj_list, radj_list)
+    queues = (heaps.make(heap), heaps.make(heap))
+    labels = ([None] * n, [None] * n)
+    last = [0, 0]
+    for side, start in enumerate((src, dst)):
+        node = labels[side][start] = queues[side].add(0, start)
+        node.pred = node
+    best = 0 if src == dst else math.inf
+    meet = (labels[0][src], labels[1][dst]) if src == dst else None
+    settled = 0
+    while queues[0].size and queues[1].size:
+        side = 0 if queues[0].size <= queues[1].size else 1
+        q = queues[side]
+        mine = labels[side]
+        other = labels[1 - side]
+        u = q.pop()
+        settled += 1
+        last[side] = u.key
+        if last[0] + last[1] >= best:
+            break
+        # relax all edges out of u
+        for w, v in graphs[side][u.value]:
+            if mine[v]:
+                node = mine[v]
+                if node.key > u.key + w:
+                    q.decreasekey(node, u.key + w)
+                    node.pred = u
+            else:
+                node = mine[v] = q.add(u.key + w, v)
+                node.pred = u
+            if other[v] and node.key + other[v].key < best:
+                best = node.key + other[v].key
+                meet = (node, other[v]) if side == 0 else (other[v], node)
+    if not meet:
+        return None, None, settled
+    path = path_to(meet[0]) + path_to(meet[1])[-2::-1]
+    return best, path, settled
+
+
+def euclidean(coords: list[tuple[int]], dst: int) -> Callable[[int], int]:
+    """Makes an A* heuristic from integer coordinates. The Euclidean distance
+    is rounded down, so it stays consistent with integer weights.
+
+    Args:
+        coords (list[tuple[int]]): coords[vertex index] = (x, y)
+        dst (int): The target index.
+
+    Returns:
+        Callable[[int], int]: The lower bound on the distance from a vertex
+            to dst.
+    """
+
+    tx, ty = coords[dst]
+
+    def heuristic(v: int) -> int:
+        x, y = coords[v]
+        return math.isqrt((x - tx) ** 2 + (y - ty) ** 2)
+
+    return heuristic
+
+
+def astar(
+    adj_list: list[list[tuple[int]]],
+    src: int,
+    dst: int,
+    q: heaps.Heap,
+    heuristic: Callable[[int], int],
+) -> tuple[int, list[int], int]:
+    """A* search between two vertices. Dijkstra's where the key of a vertex
+        is its distance from the source plus a lower bound on its distance to
+        the target, so vertices towards the target are settled first.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+            Weights must be non-negative.
+            adj_list[vertex index] = [(weight, adjacent index)]
+        src (int): The source index.
+        dst (int): The target index.
+        q (heaps.Heap): An empty heap. Monotone heaps work since the keys
+            of popped vertices never decrease.
+        heuristic (Callable[[int], int]): A lower bound on the distance from
+            a vertex to dst. Must be consistent: heuristic(u) <= w +
+            heuristic(v) for every edge (u, v) with weight w, e.g. euclidean.
+
+    Returns:
+        tuple[int, list[int], int]: (distance, path from src to dst, number
+            of settled vertices) The distance and path are None if dst cannot
+            be reached.
+    """
+
+    nodes = [None] * len(adj_list)
+    dist = [0] * len(adj_list)
+    nodes[src] = q.add(heuristic(src), src)
+    nodes[src].pred = nodes[src]
+    settled = 0
+    while q.size != 0:
+        u = q.pop()
+        settled += 1
+        if u.value == dst:
+            return dist[dst], path_to(u), settled
+        d = dist[u.value]
+        # relax all edges out of u
+        for w, v in adj_list[u.value]:
+            node = nodes[v]
+            if node:
+                if dist[v] > d + w:
+                    # the key is dist + heuristic, so it drops as much
+                    q.decreasekey(node, node.key - dist[v] + d + w)
+                    dist[v] = d + w
+                    node.pred = u
+            else:
+                dist[v] = d + w
+                node = nodes[v] = q.add(d + w + heuristic(v), v)
+                node.pred = u
+    return None, None, settled
+
+
+def _spur(
+    adj_list: list[list[tuple[int]]],
+    src: int,
+    dst: int,
+    q: heaps.Heap,
+    banned: set[int],
+    cut: set[int],
+    tree: ShortestPaths = None,
+) -> tuple[int, list[int], int]:
+    """Finds a spur path for Yen's algorithm: a shortest path that avoids
+        some vertices and leaves the source by none of some edges. With a
+        tree of distances to dst, the tree path is returned when it avoids
+        both, since it cannot be beaten, and otherwise the tree distances
+        guide an A* search. Labels are kept in a dict, so short searches do
+        not pay for the whole graph.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+            Weights must be non-negative.
+        src (int): The spur vertex.
+        dst (int): The target index.
+        q (heaps.Heap): An empty heap.
+        banned (set[int]): Vertices the path may not visit.
+        cut (set[int]): Vertices the path may not go to from src.
+        tree (ShortestPaths, optional): Shortest paths to dst in the whole
+            graph, from Dijkstra's on the reverse graph. Defaults to plain
+            Dijkstra's.
+
+    Returns:
+        tuple[int, list[int], int]: (distance, path from src to dst, number
+            of settled vertices) The distance and path are None if dst cannot
+            be reached.
+    """
+
+    if tree is not None:
+        h = tree.dist
+        if h[src] < 0:
+            return None, None, 0
+        # the tree path, unless it runs into the root of the spur
+        path = [src]
+        v = tree.pred[src]
+        if v not in cut or src == dst:
+            while path[-1] != dst and v not in banned:
+                path.append(v)
+                v = tree.pred[v]
+            if path[-1] == dst:
+                return h[src], path, 0
+    nodes = {src: q.add(h[src] if tree else 0, src)}
+    nodes[src].pred = nodes[src]
+    dist = {src: 0}
+    settled = 0
+    while q.size != 0:
+        u = q.pop()
+        settled += 1
+        if u.value == dst:
+            return dist[dst], path_to(u), settled
+        d = dist[u.value]
+        # relax all edges out of u
+        for w, v in adj_list[u.value]:
+            if v in banned or (u.value == src and v in cut):
+                continue
+            node = nodes.get(v)
+            if node:
+                if dist[v] > d + w:
+                    q.decreasekey(node, node.key - dist[v] + d + w)
+                    dist[v] = d + w
+                    node.pred = u
+            elif tree is None:
+                dist[v] = d + w
+                node = nodes[v] = q.add(d + w, v)
+                node.pred = u
+            elif h[v] >= 0:
+                dist[v] = d + w
+                node = nodes[v] = q.add(d + w + h[v], v)
+                node.pred = u
+    return None, None, settled
+
+
+def yen(
+    adj_list: list[list[tuple[int]]],
+    src: int,
+    dst: int,
+    k: int,
+    heap: str = "pairing",
+    reuse: bool = True,
+    radj_list: list[list[tuple[int]]] = None,
+) -> tuple[list[tuple[int, list[int]]], int]:
+    """Yen's k shortest loopless paths between two vertices. Each new path
+        branches off a path already found: for every vertex on the last
+        path, a spur search finds the shortest way to the target that keeps
+        the path up to that vertex, avoids its earlier vertices, and leaves
+        by an edge no found path with the same start took. The cheapest
+        candidate becomes the next path.
+
+        With reuse, one Dijkstra's on the reverse graph gives the distance
+        from every vertex to the target. Banning vertices and edges can only
+        make paths longer, so spur paths that follow that tree need no
+        search, and the others run A* with the tree distances as an exact
+        lower bound.
+
+    Args:
+        adj_list (list[list[tuple[int]]]): The graph in adjacency list format.
+            Weights must be non-negative.
+            adj_list[vertex index] = [(weight, adjacent index)]
+        src (int): The source index.
+        dst (int): The target index.
+        k (int): The most paths to find.
+        heap (str, optional): The name of a heap in heaps.HEAPS, used for
+            every search. Defaults to "pairing".
+        reuse (bool, optional): Whether spur searches use the tree of
+            distances to dst. Defaults to True.
+        radj_list (list[list[tuple[int]]], optional): The reverse of
+            adj_list, from reverse_graph. Defaults to adj_list, which is
+            right for undirected graphs.
+
+    Returns:
+        tuple[list[tuple[int, list[int]]], int]: ([(distance, path)] in
+            order of distance, number of vertices settled by all searches)
+            Fewer than k paths if there are no more.
+    """
+
+    tree = None
+    settled = 0
+    if reuse:
+        radj_list = adj_list if radj_list is None else radj_list
+        tree = dijkstra_ssp(radj_list, dst, heaps.make(heap))
+        settled += tree.reached()
+    d, path, count = _spur(adj_list, src, dst, heaps.make(heap), set(), set(), tree)
+    settled += count
+    if path is None:
+        return [], settled
+    paths = [(d, path)]
+    candidates = []
+    seen = {tuple(path)}
+    while len(paths) < k:
+        last = paths[-1][1]
+        cost = 0
+        for i in range(len(last) - 1):
+            root = last[: i + 1]
+            cut = {p[i + 1] for _, p in paths if len(p) > i + 1 and p[: i + 1] == root}
+            d, spur, count = _spur(
+                adj_list, last[i], dst, heaps.make(heap), set(root[:-1]), cut, tree
+            )
+            settled += count
+            if spur is not None:
+                path = root[:-1] + spur
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heappush(candidates, (cost + d, path))
+            cost += min(w for w, v in adj_list[last[i]] if v == last[i + 1])
+        if not candidates:
+            break
+        paths.append(heappop(candidates))
+    return paths, settled
+
+
+class Landmarks:
+    """An ALT index: exact distances from a few landmark vertices of an
+    undirected graph. By the triangle inequality, |d(L, t) - d(L, v)| is a
+    lower bound on d(v, t) for every landmark L, and the largest bound is a
+    consistent A* heuristic.
+
+    Attributes:
+        vertices (array[int]): The landmark indices.
+        dist (array[int]): Distances from the landmarks, vertex major.
+            dist[v * len(vertices) + i] is the distance from landmark i to v,
+            or -1 if v cannot be reached.
+    """
+
+    def __init__(self, vertices: array, dist: array) -> None:
+        """Inits an index from its arrays.
+
+        Args:
+            vertices (array[int]): The landmark indices.
+            dist (array[int]): Distances from the landmarks, vertex major.
+        """
+
+        self.vertices = vertices
+        self.dist = dist
+
+    def __len__(self) -> int:
+        """Returns the number of landmarks."""
+
+        return len(self.vertices)
+
+    @classmethod
+    def build(
+        cls, adj_list: list[list[tuple[int]]], k: int = 16, heap: str = "pairing"
+    ) -> Landmarks:
+        """Picks landmarks by farthest point selection and runs Dijkstra's
+        from each. The first landmark is the vertex farthest from a random
+        vertex, and each next one is the vertex farthest from its nearest
+        landmark, so landmarks end up on the edges of the graph.
+
+        Args:
+            adj_list (list[list[tuple[int]]]): The graph in adjacency list
+                format. Every edge must be listed in both directions with the
+                same weight, as read_graph does.
+                adj_list[vertex index] = [(weight, adjacent index)]
+            k (int, optional): The number of landmarks. Defaults to 16.
+            heap (str, optional): The name of a heap in heaps.HEAPS. Defaults
+                to "pairing".
+
+        Returns:
+            Landmarks: The index.
+        """
+
+        n = len(adj_list)
+        k = min(k, n)
+        vertices = array("q")
+        dist = array("q", [0]) * (n * k)
+        if not n:
+            return cls(vertices, dist)
+        # round -1 only finds the vertex farthest from a random start
+        far = randrange(n)
+        near = None
+        for i in range(-1, k):
+            row = cls.distances(adj_list, far, heap)
+            if i >= 0:
+                vertices.append(far)
+                dist[i::k] = row
+            # distance to the nearest landmark, inf if it cannot be reached so
+            # the next landmark lands in another component
+            near = [
+                min(a, math.inf if d < 0 else d)
+                for a, d in zip(near if i > 0 else repeat(math.inf), row)
+            ]
+            far = max(range(n), key=near.__getitem__)
+        return cls(vertices, dist)
+
+    @staticmethod
+    def distances(adj_list: list[list[tuple[int]]], src: int, heap: str) -> array:
+        """Finds the minimum distances from one source with dijkstra_ssp.
+
+        Args:
+            adj_list (list[list[tuple[int]]]): The graph in adjacency list
+                format.
+            src (int): The source index.
+            heap (str): The name of a heap in heaps.HEAPS.
+
+        Returns:
+            array[int]: The distance to each vertex. -1 if it cannot be
+                reached.
+        """
+
+        return dijkstra_ssp(adj_list, src, heaps.make(heap)).dist
+
+    def save(self, path: Path, key: str = "") -> None:
+        """Writes the index as native 64 bit integers: the number of vertices,
+        the number of landmarks and the length of the key, then the key, the
+        landmarks and the distances.
+
+        Args:
+            path (Path): The file to write.
+            key (str, optional): A fingerprint of the graph, such as
+                ssspcache.fingerprint, checked by load. Defaults to none.
+        """
+
+        k = len(self.vertices)
+        n = len(self.dist) // k if k else 0
+        tag = key.encode()
+        with path.open(mode="wb") as dat:
+            array("q", (n, k, len(tag))).tofile(dat)
+            dat.write(tag)
+            self.vertices.tofile(dat)
+            self.dist.tofile(dat)
+
+    @classmethod
+    def load(cls, path: Path, key: str = None) -> Landmarks:
+        """Reads an index written by save. Bounds from an index of another
+        graph are not admissible and make A* return wrong distances, so
+        callers should pass the graph's fingerprint.
+
+        Args:
+            path (Path): The file to read.
+            key (str, optional): The fingerprint the index must have been
+                saved with. Defaults to no check.
+
+        Raises:
+            ValueError: If the file is truncated or was saved with another
+                key.
+
+        Returns:
+            Landmarks: The index.
+        """
+
+        with path.open(mode="rb") as dat:
+            try:
+                head = array("q")
+                head.fromfile(dat, 3)
+                n, k, size = head
+                tag = dat.read(size)
+                if key is not None and tag != key.encode():
+                    raise ValueError(f"Landmark file is for another graph: {path}")
+                vertices = array("q")
+                vertices.fromfile(dat, k)
+                dist = array("q")
+                dist.fromfile(dat, n * k)
+            except EOFError as e:
+                raise ValueError(f"Truncated landmark file: {path}") from e
+        return cls(vertices, dist)
+
+    def heuristic(self, dst: int) -> Callable[[int], int]:
+        """Makes an A* heuristic towards one target. A landmark that cannot
+        reach v or dst only gives bounds on vertices in other components
+        than dst, which A* never reaches from the source anyway.
+
+        Args:
+            dst (int): The target index.
+
+        Returns:
+            Callable[[int], int]: The lower bound on the distance from a
+                vertex to dst.
+        """
+
+        k = len(self.vertices)
+        dist = self.dist
+        if not k:
+            return lambda v: 0
+        to = dist[dst * k : dst * k + k]
+
+        def heuristic(v: int) -> int:
+            return max(map(abs, map(sub, dist[v * k : v * k + k], to)))
+
+        return heuristic
+
+
+class CSRGraph:
+    """A weighted graph in compressed sparse row format. The edges out of
+    vertex u are at indices offsets[u] to offsets[u + 1] of targets and
+    weights, so the whole graph is three flat arrays of machine integers
+    instead of one tuple per edge.
+
+    Attributes:
+        offsets (array[int]): The start of each vertex's edges, plus the
+            number of edges at the end. len(offsets) == vertices + 1
+        targets (array[int]): The head of each edge.
+        weights (array[int]): The weight of each edge.
+    """
+
+    def __init__(self, offsets: array, targets: array, weights: array) -> None:
+        """Inits a graph from CSR arrays.
+
+        Args:
+            offsets (array[int]): The start of each vertex's edges, plus the
+                number of edges at the end.
+            targets (array[int]): The head of each edge.
+            weights (array[int]): The weight of each edge.
+
+        Raises:
+            ValueError: If the arrays do not describe the same edges.
+        """
+
+        if not offsets or len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("Offsets, targets and weights do not match")
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def __len__(self) -> int:
+        """Returns the number of vertices."""
+
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_edges(
+        cls,
+        vertices: int,
+        tails: array,
+        heads: array,
+        weights: array,
+        undirected: bool = False,
+    ) -> CSRGraph:
+        """Builds a graph from parallel edge arrays with a counting sort. The
+        edges out of each vertex keep the order they are given in.
+
+        Args:
+            vertices (int): The number of vertices.
+            tails (array[int]): The tail of each edge.
+            heads (array[int]): The head of each edge.
+            weights (array[int]): The weight of each edge.
+            undirected (bool, optional): Whether every edge is also added
+                from head to tail. Defaults to False.
+
+        Returns:
+            CSRGraph: The graph.
+        """
+
+        degree = [0] * (vertices + 1)
+        for u in tails:
+            degree[u + 1] += 1
+        if undirected:
+            for v in heads:
+                degree[v + 1] += 1
+        offsets = array("q", accumulate(degree))
+        size = offsets[-1]
+        targets = array(TARGET_TYPE, bytes(size * array(TARGET_TYPE).itemsize))
+        weights_out = array("q", bytes(size * 8))
+        pos = offsets.tolist()
+        for u, v, w in zip(tails, heads, weights):
+            i = pos[u]
+            targets[i] = v
+            weights_out[i] = w
+            pos[u] = i + 1
+            if undirected:
+                i = pos[v]
+                targets[i] = u
+                weights_out[i] = w
+                pos[v] = i + 1
+        return cls(offsets, targets, weights_out)
+
+    @classmethod
+    def from_adj_list(cls, adj_list: list[list[tuple[int]]]) -> CSRGraph:
+        """Builds a graph from an adjacency list.
+
+        Args:
+            adj_list (list[list[tuple[int]]]): The graph in adjacency list
+                format. adj_list[vertex index] = [(weight, adjacent index)]
+
+        Returns:
+            CSRGraph: The same graph, with edges in the same order.
+        """
+
+        offsets = array("q", [0])
+        targets = array(TARGET_TYPE)
+        weights = array("q")
+        for edges in adj_list:
+            for w, v in edges:
+                targets.append(v)
+                weights.append(w)
+            offsets.append(len(targets))
+        return cls(offsets, targets, weights)
+
+
+def dijkstra_ssp_csr(g: CSRGraph, src: int, q: heaps.Heap) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm on a CSR graph.
+        Works with any heap that follows the heaps.Heap protocol.
+
+    Args:
+        g (CSRGraph): The graph. Weights must be positive.
+        src (int): The source index.
+        q (heaps.Heap): An empty heap.
+
+    Returns:
+        ShortestPaths: The minimum distances and the second-to-last vertex
+            on a path from the source to each vertex. The heap's handles
+            are dropped.
+    """
+
+    offsets = g.offsets
+    targets = g.targets
+    weights = g.weights
+    nodes = [None] * len(g)
+    nodes[src] = q.add(0, src)
+    nodes[src].pred = nodes[src]
+    while q.size != 0:
+        u = q.pop()
+        ukey = u.key
+        start = offsets[u.value]
+        stop = offsets[u.value + 1]
+        # relax all edges out of u
+        for w, v in zip(weights[start:stop], targets[start:stop]):
+            node = nodes[v]
+            if node:
+                if node.key > ukey + w:
+                    q.decreasekey(node, ukey + w)
+                    node.pred = u
+            else:
+                node = nodes[v] = q.add(ukey + w, v)
+                node.pred = u
+    return ShortestPaths.from_nodes(src, nodes)
+
+
+def dijkstra_ssp_csr_binaryheap(g: CSRGraph, src: int) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm on a CSR graph. Uses
+        a binary heap with lazy deletion.
+
+    Args:
+        g (CSRGraph): The graph. Weights must be positive.
+        src (int): The source index.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    offsets = g.offsets
+    targets = g.targets
+    weights = g.weights
+    dis = [None] * len(g)
+    q = [(0, src)]
+    dis[src] = (0, src)
+    while q:
+        d, u = heappop(q)
+        if dis[u][0] != d:
+            continue
+        start = offsets[u]
+        stop = offsets[u + 1]
+        # relax all edges out of u
+        for w, v in zip(weights[start:stop], targets[start:stop]):
+            if not dis[v] or dis[v][0] > d + w:
+                heappush(q, (d + w, v))
+                dis[v] = (d + w, u)
+    return ShortestPaths.from_pairs(src, dis)
+
+
+class Hierarchy:
+    """A contraction hierarchy of an undirected graph. Vertices are
+    contracted one at a time, adding a shortcut between two neighbours
+    whenever the path through the contracted vertex is the only shortest
+    one. Every shortest path then climbs to its highest ranked vertex and
+    descends, so a query only searches upward edges from both ends.
+
+    Attributes:
+        rank (array[int]): The contraction order of each vertex. Vertices of
+            the core share the highest ranks.
+        up (CSRGraph): The edges from each vertex to higher ranked vertices,
+            original edges and shortcuts alike. Core vertices keep all edges
+            to each other, in both directions.
+        via (array[int]): The contracted vertex each edge of up skips, or -1
+            for an original edge. Parallel to up.targets.
+    """
+
+    def __init__(self, rank: array, up: CSRGraph, via: array) -> None:
+        """Inits a hierarchy from its arrays.
+
+        Args:
+            rank (array[int]): The contraction order of each vertex.
+            up (CSRGraph): The upward edges.
+            via (array[int]): The vertex each upward edge skips, or -1.
+
+        Raises:
+            ValueError: If via does not match the edges of up.
+        """
+
+        if len(via) != len(up.targets):
+            raise ValueError("Shortcuts do not match the upward edges")
+        self.rank = rank
+        self.up = up
+        self.via = via
+
+    def __len__(self) -> int:
+        """Returns the number of vertices."""
+
+        return len(self.rank)
+
+    @classmethod
+    def build(
+        cls,
+        adj_list: list[list[tuple[int]]],
+        heap: str = "pairing",
+        max_degree: int = 16,
+        witness_limit: int = 500,
+    ) -> Hierarchy:
+        """Contracts the vertices of a graph. The vertex to contract next is
+        the one with the smallest edge difference, the shortcuts it needs
+        minus its edges plus its contracted neighbours, kept in a heap. After
+        a contraction the priorities of its neighbours are updated with
+        decrease key, or remove and add when they grow. Vertices with more
+        than max_degree edges go to the core without a witness search, before
+        the first contraction or once shortcuts raise their degree.
+
+        Args:
+            adj_list (list[list[tuple[int]]]): The graph in adjacency list
+                format. Weights must be non-negative and every edge is used
+                in both directions.
+                adj_list[vertex index] = [(weight, adjacent index)]
+            heap (str, optional): The name of a heap in heaps.HEAPS.
+                Defaults to "pairing".
+            max_degree (int, optional): Vertices with more edges are not
+                contracted and become the core. Defaults to 16.
+            witness_limit (int, optional): The number of edges a witness
+                search may scan. Smaller limits build faster but add more
+                shortcuts. Defaults to 500.
+
+        Raises:
+            ValueError: If the heap is monotone, since priorities go down.
+
+        Returns:
+            Hierarchy: The hierarchy.
+        """
+
+        if heaps.HEAPS[heap].monotone:
+            raise ValueError(f"The {heap} heap cannot order vertices")
+        n = len(adj_list)
+        # adj[u][v] = (weight, contracted vertex the edge skips or -1)
+        adj = [{} for _ in range(n)]
+        for u, edges in enumerate(adj_list):
+            for w, v in edges:
+                if u != v and w < adj[u].get(v, (math.inf,))[0]:
+                    adj[u][v] = adj[v][u] = (w, -1)
+        deleted = [0] * n
+
+        def priority(v: int) -> tuple[int, list[tuple[int]]]:
+            shortcuts = cls.shortcuts(adj, v, witness_limit)
+            return len(shortcuts) - len(adj[v]) + deleted[v], shortcuts
+
+        q = heaps.make(heap)
+        nodes = [None] * n
+        core = []
+        for v in range(n):
+            if len(adj[v]) > max_degree:
+                core.append(v)
+            else:
+                nodes[v] = q.add(priority(v)[0], v)
+        rank = array("q", [0]) * n
+        up = [None] * n
+        order = 0
+        while q.size:
+            node = q.pop()
+            v = node.value
+            if len(adj[v]) > max_degree:
+                nodes[v] = None
+                core.append(v)
+                continue
+            key, shortcuts = priority(v)
+            if key > node.key:
+                # the priority was stale, try again later
+                nodes[v] = q.add(key, v)
+                continue
+            nodes[v] = None
+            rank[v] = order
+            order += 1
+            # adj[v] is not changed after v is contracted
+            up[v] = adj[v]
+            for u in adj[v]:
+                del adj[u][v]
+                deleted[u] += 1
+            for u, x, w in shortcuts:
+                if w < adj[u].get(x, (math.inf,))[0]:
+                    adj[u][x] = adj[x][u] = (w, v)
+            for u in adj[v]:
+                if not nodes[u]:
+                    continue
+                if len(adj[u]) > max_degree:
+                    q.remove(nodes[u])
+                    nodes[u] = None
+                    core.append(u)
+                    continue
+                key = priority(u)[0]
+                if key < nodes[u].key:
+                    q.decreasekey(nodes[u], key)
+                elif key > nodes[u].key:
+                    q.remove(nodes[u])
+                    nodes[u] = q.add(key, u)
+            adj[v] = None
+        # the core keeps its edges in both directions
+        for v in core:
+            rank[v] = order
+            up[v] = adj[v]
+        offsets = array("q", [0])
+        targets = array(TARGET_TYPE)
+        weights = array("q")
+        via = array(TARGET_TYPE)
+        for edges in up:
+            targets.extend(edges)
+            weights.extend([w for w, _ in edges.values()])
+            via.extend([mid for _, mid in edges.values()])
+            offsets.append(len(targets))
+        return cls(rank, CSRGraph(offsets, targets, weights), via)
+
+    @staticmethod
+    def shortcuts(
+        adj: list[dict[int, tuple[int]]], v: int, limit: int
+    ) -> list[tuple[int]]:
+        """Finds the shortcuts needed to contract a vertex. A witness search
+        from each neighbour looks for paths around v that are no longer than
+        the paths through it. A search ends once it has settled every later
+        neighbour, passed the longest path through v or scanned limit edges.
+        Stopping early only adds shortcuts that are not needed.
+
+        Args:
+            adj (list[dict[int, tuple[int]]]): The graph left to contract.
+                adj[u][v] = (weight, contracted vertex the edge skips or -1)
+            v (int): The vertex to contract.
+            limit (int): The number of edges a witness search may scan.
+
+        Returns:
+            list[tuple[int]]: (neighbour, neighbour, weight) for each pair
+                of neighbours whose shortest path goes through v.
+        """
+
+        res = []
+        around = [(u, w) for u, (w, _) in adj[v].items()]
+        for i, (u, wu) in enumerate(around[:-1]):
+            rest = around[i + 1 :]
+            bound = wu + max(w for _, w in rest)
+            dist = {u: 0}
+            q = [(0, u)]
+            left = {x for x, _ in rest}
+            scanned = 0
+            while q and left and scanned < limit:
+                d, x = heappop(q)
+                if d > bound:
+                    break
+                if d > dist[x]:
+                    continue
+                left.discard(x)
+                scanned += len(adj[x])
+                for y, (w, _) in adj[x].items():
+                    if y != v and d + w < dist.get(y, math.inf):
+                        dist[y] = d + w
+                        heappush(q, (d + w, y))
+            # a tentative distance is the length of a real path around v
+            for x, wx in rest:
+                if dist.get(x, math.inf) > wu + wx:
+                    res.append((u, x, wu + wx))
+        return res
+
+    def query(self, src: int, dst: int) -> tuple[int, list[int], int]:
+        """Finds a shortest path with Dijkstra's upward from both ends at
+        once. A side stops once its next key is no smaller than the best
+        meeting found.
+
+        Args:
+            src (int): The source index.
+            dst (int): The target index.
+
+        Returns:
+            tuple[int, list[int], int]: (distance, path from src to dst, number
+                of settled vertices) The distance and path are None if dst
+                cannot be reached.
+        """
+
+        offsets = self.up.offsets
+        targets = self.up.targets
+        weights = self.up.weights
+        dist = ({src: 0}, {dst: 0})
+        # pred[side][v] = (previous vertex, index of the edge to v)
+        pred = ({src: None}, {dst: None})
+        qs = ([(0, src)], [(0, dst)])
+        inf = best = math.inf
+        meet = None
+        settled = 0
+        while True:
+            side = 0 if qs[0] and (not qs[1] or qs[0][0] <= qs[1][0]) else 1
+            q = qs[side]
+            if not q or q[0][0] >= best:
+                break
+            d, u = heappop(q)
+            ds = dist[side]
+            if d > ds[u]:
+                continue
+            settled += 1
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best = d + other
+                meet = u
+            start = offsets[u]
+            stop = offsets[u + 1]
+            edges = tuple(zip(weights[start:stop], targets[start:stop]))
+            # stall on demand: a higher vertex already reached gives a
+            # shorter way to u, so nothing above u is reached through it
+            if any(ds.get(v, inf) + w < d for w, v in edges):
+                continue
+            ps = pred[side]
+            for i, (w, v) in enumerate(edges, start):
+                if d + w < ds.get(v, inf):
+                    ds[v] = d + w
+                    ps[v] = (u, i)
+                    heappush(q, (d + w, v))
+        if meet is None:
+            return None, None, settled
+        # walk from the meeting vertex back to each end, then unpack
+        path = [src]
+        hops = []
+        v = meet
+        while pred[0][v]:
+            u, i = pred[0][v]
+            hops.append((u, v, i))
+            v = u
+        for u, v, i in reversed(hops):
+            path += self.unpack(u, v, self.via[i])
+        v = meet
+        while pred[1][v]:
+            u, i = pred[1][v]
+            path += self.unpack(v, u, self.via[i])
+            v = u
+        return best, path, settled
+
+    def unpack(self, a: int, b: int, mid: int) -> list[int]:
+        """Replaces shortcuts with the original edges they skip.
+
+        Args:
+            a (int): The start of the edge.
+            b (int): The end of the edge.
+            mid (int): The vertex the edge skips, or -1 for an original edge.
+
+        Returns:
+            list[int]: The vertices of the original path after a, up to and
+                including b.
+        """
+
+        res = []
+        stack = [(a, b, mid)]
+        while stack:
+            a, b, mid = stack.pop()
+            if mid < 0:
+                res.append(b)
+                continue
+            # mid is ranked below both ends, so it holds both edges
+            stack.append((mid, b, self.via[self.edge(mid, b)]))
+            stack.append((a, mid, self.via[self.edge(mid, a)]))
+        return res
+
+    def edge(self, u: int, v: int) -> int:
+        """Finds the upward edge from u to v.
+
+        Args:
+            u (int): The lower ranked end.
+            v (int): The higher ranked end.
+
+        Raises:
+            ValueError: If there is no such edge.
+
+        Returns:
+            int: The index of the edge in up.
+        """
+
+        targets = self.up.targets
+        for i in range(self.up.offsets[u], self.up.offsets[u + 1]):
+            if targets[i] == v:
+                return i
+        raise ValueError(f"No upward edge from {u} to {v}")
+
+    def save(self, path: Path, key: str = "") -> None:
+        """Writes the hierarchy as native integers: the number of vertices,
+        the number of upward edges and the length of the key, then the key,
+        rank, the CSR arrays and via.
+
+        Args:
+            path (Path): The file to write.
+            key (str, optional): A fingerprint of the graph, such as
+                ssspcache.fingerprint, checked by load. Defaults to none.
+        """
+
+        tag = key.encode()
+        with path.open(mode="wb") as dat:
+            array("q", (len(self.rank), len(self.via), len(tag))).tofile(dat)
+            dat.write(tag)
+            for arr in (
+                self.rank,
+                self.up.offsets,
+                self.up.targets,
+                self.up.weights,
+                self.via,
+            ):
+                arr.tofile(dat)
+
+    @classmethod
+    def load(cls, path: Path, key: str = None) -> Hierarchy:
+        """Reads a hierarchy written by save. A hierarchy of another graph
+        answers queries with wrong distances, so callers should pass the
+        graph's fingerprint.
+
+        Args:
+            path (Path): The file to read.
+            key (str, optional): The fingerprint the hierarchy must have been
+                saved with. Defaults to no check.
+
+        Raises:
+            ValueError: If the file is truncated or was saved with another
+                key.
+
+        Returns:
+            Hierarchy: The hierarchy.
+        """
+
+        with path.open(mode="rb") as dat:
+            try:
+                head = array("q")
+                head.fromfile(dat, 3)
+                n, m, size = head
+                tag = dat.read(size)
+                if key is not None and tag != key.encode():
+                    raise ValueError(f"Hierarchy file is for another graph: {path}")
+                arrays = []
+                for code, size in (
+                    ("q", n),
+                    ("q", n + 1),
+                    (TARGET_TYPE, m),
+                    ("q", m),
+                    (TARGET_TYPE, m),
+                ):
+                    arrays.append(array(code))
+                    arrays[-1].fromfile(dat, size)
+            except EOFError as e:
+                raise ValueError(f"Truncated hierarchy file: {path}") from e
+        rank, offsets, targets, weights, via = arrays
+        return cls(rank, CSRGraph(offsets, targets, weights), via)
+
+
+def share_csr(g: CSRGraph) -> shared_memory.SharedMemory:
+    """Copies a CSR graph into a new shared memory block: offsets, then
+    weights, then targets. The caller must close and unlink the block.
+
+    Args:
+        g (CSRGraph): The graph.
+
+    Returns:
+        shared_memory.SharedMemory: The block holding the graph.
+    """
+
+    n = len(g)
+    m = len(g.targets)
+    a = 8 * (n + 1)
+    b = a + 8 * m
+    shm = shared_memory.SharedMemory(
+        create=True, size=max(b + g.targets.itemsize * m, 1)
+    )
+    shm.buf[:a] = memoryview(g.offsets).cast("B")
+    shm.buf[a:b] = memoryview(g.weights).cast("B")
+    shm.buf[b : b + g.targets.itemsize * m] = memoryview(g.targets).cast("B")
+    return shm
+
+
+def attach_csr(buf: memoryview, vertices: int, edges: int) -> CSRGraph:
+    """Views a CSR graph written by share_csr without copying it.
+
+    Args:
+        buf (memoryview): The buffer of the shared memory block.
+        vertices (int): The number of vertices.
+        edges (int): The number of edges.
+
+    Returns:
+        CSRGraph: A graph whose arrays are memoryviews into buf. They must be
+            released before the block is closed.
+    """
+
+    a = 8 * (vertices + 1)
+    b = a + 8 * edges
+    size = array(TARGET_TYPE).itemsize * edges
+    return CSRGraph(
+        buf[:a].cast("q"), buf[b : b + size].cast(TARGET_TYPE), buf[a:b].cast("q")
+    )
+
+
+# the graph and distances a pool worker reads, set once per process by
+# _init_worker
+_worker_shm = None
+_worker_graph = None
+_worker_dist_shm = None
+_worker_dist = None
+
+
+def _init_worker(name: str, vertices: int, edges: int, dist_name: str = None) -> None:
+    """Attaches a pool worker to the shared graph.
+
+    Args:
+        name (str): The name of the shared memory block.
+        vertices (int): The number of vertices.
+        edges (int): The number of edges.
+        dist_name (str, optional): The name of a shared memory block of
+            distances, one 64 bit integer per vertex. Defaults to none.
+    """
+
+    global _worker_shm, _worker_graph, _worker_dist_shm, _worker_dist
+    # pool workers share the parent's resource tracker, so the blocks are
+    # unlinked once, by the parent
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_graph = attach_csr(_worker_shm.buf, vertices, edges)
+    if dist_name:
+        _worker_dist_shm = shared_memory.SharedMemory(name=dist_name)
+        _worker_dist = _worker_dist_shm.buf.cast("q")
+
+
+def _distances(g: CSRGraph, src: int, heap: str = None) -> array:
+    """Finds the minimum distances from one source.
+
+    Args:
+        g (CSRGraph): The graph.
+        src (int): The source index.
+        heap (str, optional): The name of a heap in heaps.HEAPS. Defaults to
+            heapq.
+
+    Returns:
+        array[int]: The distance to each vertex. -1 if it cannot be reached.
+    """
+
+    if heap is None:
+        return dijkstra_ssp_csr_binaryheap(g, src).dist
+    return dijkstra_ssp_csr(g, src, heaps.make(heap)).dist
+
+
+def _distances_chunk(sources: list[int], heap: str) -> list[tuple[int, array]]:
+    """Finds the minimum distances from each source on a pool worker.
+
+    Args:
+        sources (list[int]): The source indices.
+        heap (str or None): The name of a heap in heaps.HEAPS, or None for
+            heapq.
+
+    Returns:
+        list[tuple[int, array[int]]]: (source, distances)
+    """
+
+    return [(src, _distances(_worker_graph, src, heap)) for src in sources]
+
+
+def dijkstra_msp(
+    g: CSRGraph,
+    sources: Iterable[int] = None,
+    heap: str = None,
+    workers: int = None,
+    chunksize: int = None,
+) -> Iterator[tuple[int, array]]:
+    """Runs Dijkstra's from many sources on a process pool. The graph is
+        copied once into shared memory and every worker reads it in place,
+        so only sources and distance rows cross between processes.
+
+    Args:
+        g (CSRGraph): The graph. Weights must be non-negative.
+        sources (Iterable[int], optional): The source indices. Defaults to
+            every vertex, which gives all pairs shortest paths.
+        heap (str, optional): The name of a heap in heaps.HEAPS. Workers are
+            forked on Linux and see heaps registered before the call; other
+            platforms only see heaps registered on import. Defaults to
+            heapq.
+        workers (int, optional): The number of processes. 1 runs in this
+            process without a pool. Defaults to the number of CPUs.
+        chunksize (int, optional): The number of sources sent to a worker at
+            a time. Defaults to about four chunks per worker.
+
+    Yields:
+        tuple[int, array[int]]: (source, distances) in source order.
+            distances[v] is -1 if v cannot be reached.
+    """
+
+    sources = list(range(len(g)) if sources is None else sources)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for src in sources:
+            yield src, _distances(g, src, heap)
+        return
+    chunksize = chunksize or max(len(sources) // (4 * workers), 1)
+    chunks = [sources[i : i + chunksize] for i in range(0, len(sources), chunksize)]
+    shm = share_csr(g)
+    pool = ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(shm.name, len(g), len(g.targets)),
+    )
+    try:
+        for rows in pool.map(_distances_chunk, chunks, repeat(heap)):
+            yield from rows
+    finally:
+        pool.shutdown(cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+
+def auto_delta(g: CSRGraph) -> int:
+    """Picks a bucket width for delta_stepping from the weights: the largest
+    weight over the average degree, as for random weights, but never less
+    than the smallest weight. With delta at most the smallest weight, a
+    bucket is settled in one phase, like Dial's algorithm.
+
+    Args:
+        g (CSRGraph): The graph.
+
+    Returns:
+        int: The bucket width, at least 1.
+    """
+
+    if not len(g.weights):
+        return 1
+    degree = max(len(g.targets) // max(len(g), 1), 1)
+    return max(min(g.weights), max(g.weights) // degree, 1)
+
+
+def _relax(
+    g: CSRGraph, dist: memoryview, frontier: list[int], delta: int, light: bool
+) -> tuple[array, array]:
+    """Relaxes the light or heavy edges out of some vertices.
+
+    Args:
+        g (CSRGraph): The graph.
+        dist (memoryview): The tentative distance of each vertex. Only read.
+        frontier (list[int]): The vertices to relax.
+        delta (int): The bucket width. Edges lighter than delta are light.
+        light (bool): Whether to relax light or heavy edges.
+
+    Returns:
+        tuple[array[int], array[int]]: (vertices, distances) The shortest
+            new distance to each vertex that improves on dist.
+    """
+
+    offsets = g.offsets
+    targets = g.targets
+    weights = g.weights
+    best = {}
+    for u in frontier:
+        d = dist[u]
+        start = offsets[u]
+        stop = offsets[u + 1]
+        for w, v in zip(weights[start:stop], targets[start:stop]):
+            if (w < delta) == light and d + w < dist[v]:
+                if v not in best or d + w < best[v]:
+                    best[v] = d + w
+    return array("q", best), array("q", best.values())
+
+
+def _relax_chunk(frontier: list[int], delta: int, light: bool) -> tuple[array, array]:
+    """Relaxes edges on a pool worker with the shared graph and distances.
+
+    Args:
+        frontier (list[int]): The vertices to relax.
+        delta (int): The bucket width.
+        light (bool): Whether to relax light or heavy edges.
+
+    Returns:
+        tuple[array[int], array[int]]: (vertices, distances)
+    """
+
+    return _relax(_worker_graph, _worker_dist, frontier, delta, light)
+
+
+def delta_stepping(
+    g: CSRGraph,
+    src: int,
+    delta: int = None,
+    workers: int = None,
+    grain: int = 1024,
+) -> array:
+    """Delta-stepping single source shortest paths. Vertices are kept in
+    buckets of width delta by tentative distance. The lowest bucket is
+    emptied by relaxing light edges until no vertex falls back into it, then
+    heavy edges are relaxed once from every vertex it held. Each relaxation
+    round is split over a process pool that reads the graph and distances
+    from shared memory, and only this process updates the buckets.
+
+    Args:
+        g (CSRGraph): The graph. Weights must be non-negative.
+        src (int): The source index.
+        delta (int, optional): The bucket width. Defaults to auto_delta.
+        workers (int, optional): The number of processes. 1 runs in this
+            process without a pool. Defaults to the number of CPUs.
+        grain (int, optional): Rounds with fewer vertices than this are
+            relaxed in this process, since sending them costs more than it
+            saves. Defaults to 1024.
+
+    Returns:
+        array[int]: The distance to each vertex. -1 if it cannot be reached.
+    """
+
+    n = len(g)
+    delta = delta or auto_delta(g)
+    workers = workers or os.cpu_count() or 1
+    inf = 2**63 - 1
+    pool = None
+    if workers == 1:
+        dist = array("q", [inf]) * n
+    else:
+        shm = share_csr(g)
+        dist_shm = shared_memory.SharedMemory(create=True, size=max(8 * n, 1))
+        dist = dist_shm.buf.cast("q")
+        dist[:n] = array("q", [inf]) * n
+        pool = ProcessPoolExecutor(
+            workers,
+            initializer=_init_worker,
+            initargs=(shm.name, n, len(g.targets), dist_shm.name),
+        )
+
+    def relax(frontier: list[int], light: bool) -> None:
+        if pool and len(frontier) >= grain:
+            size = max(len(frontier) // (4 * workers), grain // 4)
+            chunks = [frontier[i : i + size] for i in range(0, len(frontier), size)]
+            rounds = pool.map(_relax_chunk, chunks, repeat(delta), repeat(light))
+        else:
+            rounds = (_relax(g, dist, frontier, delta, light),)
+        for heads, dists in rounds:
+            for v, d in zip(heads, dists):
+                old = dist[v]
+                if d < old:
+                    if old != inf and old // delta in buckets:
+                        buckets[old // delta].discard(v)
+                    dist[v] = d
+                    if d // delta not in buckets:
+                        buckets[d // delta] = set()
+                        heappush(order, d // delta)
+                    buckets[d // delta].add(v)
+
+    try:
+        dist[src] = 0
+        buckets = {0: {src}}
+        # bucket indices, possibly stale or repeated
+        order = [0]
+        while order:
+            i = heappop(order)
+            if i not in buckets:
+                continue
+            settled = set()
+            while i in buckets:
+                frontier = list(buckets.pop(i))
+                settled.update(frontier)
+                if frontier:
+                    relax(frontier, True)
+            relax(list(settled), False)
+        return array("q", [-1 if d == inf else d for d in dist])
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+            dist.release()
+            for block in (shm, dist_shm):
+                block.close()
+                block.unlink()
+
+
+def dense_matrix(g: CSRGraph) -> np.ndarray:
+    """Builds the adjacency matrix of a graph. Needs NumPy.
+
+    Args:
+        g (CSRGraph): The graph. Parallel edges keep the smallest weight.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+
+    Returns:
+        np.ndarray: matrix[u, v] is the weight of the edge from u to v, or
+            inf if there is none. float64, so it holds V ** 2 * 8 bytes.
+    """
+
+    if np is None:
+        raise ImportError("NumPy is required for dense graphs")
+    n = len(g)
+    offsets = np.frombuffer(g.offsets, dtype=np.int64)
+    tails = np.repeat(np.arange(n), np.diff(offsets))
+    heads = np.frombuffer(g.targets, dtype=np.intc)
+    weights = np.frombuffer(g.weights, dtype=np.int64).astype(np.float64)
+    matrix = np.full((n, n), np.inf)
+    np.minimum.at(matrix, (tails, heads), weights)
+    return matrix
+
+
+def dijkstra_ssp_dense(matrix: np.ndarray, src: int) -> ShortestPaths:
+    """Dijkstra's single source shortest path algorithm on an adjacency
+        matrix. Like dijkstra_ssp_noheap, every step scans all vertices, but
+        finding the closest vertex and relaxing its row are NumPy vector
+        operations, so the O(V^2) work runs natively. Best on nearly
+        complete graphs. Needs NumPy.
+
+    Args:
+        matrix (np.ndarray): The graph from dense_matrix. Weights must be
+            positive.
+        src (int): The source index.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+
+    Returns:
+        ShortestPaths: The minimum distances and predecessors.
+    """
+
+    if np is None:
+        raise ImportError("NumPy is required for dense graphs")
+    n = len(matrix)
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    dist[src] = 0
+    pred[src] = src
+    # the distances of unsettled vertices, inf once settled
+    frontier = dist.copy()
+    for _ in range(n):
+        u = int(frontier.argmin())
+        d = frontier[u]
+        if d == np.inf:
+            break
+        frontier[u] = np.inf
+        # settled vertices never improve since weights are not negative
+        cand = matrix[u] + d
+        better = cand < dist
+        dist[better] = cand[better]
+        frontier[better] = cand[better]
+        pred[better] = u
+    # weights are integers, so the float distances are exact
+    dist = np.where(pred >= 0, dist, -1).astype(np.int64)
+    return ShortestPaths(src, array("q", dist.tobytes()), array("q", pred.tobytes()))
+
+
 def rand_graph(vertices: int, edges: int) -> list[list[int]]:
-    """Generates a random connected undirected graph.
+    """Generates a random connected undirected graph in O(vertices + edges)
+        expected time. A random tree is filled in with distinct edges, drawn
+        in rounds of random pairs that skip pairs already taken. A graph
+        more than half complete draws the edges to leave out of the complete
+        graph instead, so fewer than half of the draws are ever rejected.
 
     Args:
         vertices (int): The number of vertices
@@ -194,69 +2118,196 @@ def rand_graph(vertices: int, edges: int) -> list[list[int]]:
 
     if edges + 1 < vertices:
         raise ValueError("Too few edges")
-    if edges * 4 > vertices * (vertices - 1):
-        # graph is more than 50% complete: start from a complete graph and
-        # remove edges
-        remove_edges = (vertices * (vertices - 1) // 2) - edges
-        if remove_edges < 0:
-            raise ValueError("Too many edges")
-        adj_list = [set() for _ in range(vertices)]
-        for v, adj in enumerate(adj_list):
-            for u in range(vertices):
-                if u != v:
-                    adj.add(u)
-        # remove edges
-        for _ in range(remove_edges):
-            u = v = 0
-            while (
-                u == v
-                or len(adj_list[v]) == 0
-                or len(adj_list[u]) == 0
-                or u not in adj_list[v]
-            ):
-                u = randrange(vertices)
-                v = randrange(vertices)
-            adj_list[v].remove(u)
-            adj_list[u].remove(v)
-        # convert sets to lists
-        for i in range(vertices):
-            adj_list[i] = list(adj_list[i])
-        return adj_list
-    # graph is at most 50% complete: start from tree and add edges
+    total = vertices * (vertices - 1) // 2
+    if edges > total:
+        raise ValueError("Too many edges")
     adj_list = rand_tree(vertices)
-    for _ in range(edges - vertices + 1):
-        u = v = 0
-        while u == v or u in adj_list[v]:
-            u = randrange(vertices)
-            v = randrange(vertices)
-        adj_list[u].append(v)
-        adj_list[v].append(u)
+    # the pair u < v has key u * vertices + v
+    taken = {u * vertices + v for u, adj in enumerate(adj_list) for v in adj if u < v}
+    dense = edges * 2 > total
+    # a dense graph takes its edges out of the complete graph
+    draws = total - edges if dense else edges - vertices + 1
+    picked = set()
+    pool = range(vertices)
+    while len(picked) < draws:
+        # a round draws no more pairs than are missing, so never too many
+        m = draws - len(picked)
+        keys = {
+            u * vertices + v if u < v else v * vertices + u
+            for u, v in zip(choices(pool, k=m), choices(pool, k=m))
+            if u != v
+        }
+        picked |= keys - taken
+    if not dense:
+        for key in picked:
+            u, v = divmod(key, vertices)
+            adj_list[u].append(v)
+            adj_list[v].append(u)
+        return adj_list
+    # the tree edges are never left out, so the tree is kept
+    left_out = [set() for _ in range(vertices)]
+    for key in picked:
+        u, v = divmod(key, vertices)
+        left_out[u].add(v)
+        left_out[v].add(u)
+    for u, skip in enumerate(left_out):
+        skip.add(u)
+        adj_list[u] = [v for v in range(vertices) if v not in skip]
     return adj_list
 
 
+def rand_geometric_graph(
+    vertices: int, edges: int, width: int = MAX_VAL, stretch: float = 0.2
+) -> tuple[list[tuple[int]], list[list[tuple[int]]]]:
+    """Generates a random connected road-like graph. Vertices are random
+        points in a square, found with a grid. In rounds, every vertex is
+        joined to its next nearest neighbor until there are enough edges.
+        Leftover components are then joined to their nearest vertex in
+        another component. No weight is less than the Euclidean distance
+        between its ends, so Euclidean distance is a lower bound for A*.
+
+    Args:
+        vertices (int): The number of vertices. Must be at least 1.
+        edges (int): The number of edges. There are more if joining
+            components takes extra edges, and fewer only if the
+            2 * ceil(edges / vertices) + 1 nearest neighbors of the vertices
+            hold too few distinct pairs, as in tiny graphs.
+        width (int, optional): The side length of the square. Defaults to
+            MAX_VAL.
+        stretch (float, optional): Weights are the Euclidean distance
+            rounded up and stretched by a random factor in [1, 1 + stretch].
+            Defaults to 0.2.
+
+    Returns:
+        tuple[list[tuple[int]], list[list[tuple[int]]]]: (coords, adj_list)
+            coords[vertex index] = (x, y)
+            adj_list[vertex index] = [(weight, adjacent index)] Every edge is
+            in the lists of both ends with the same weight.
+    """
+
+    coords = [(randrange(width), randrange(width)) for _ in range(vertices)]
+    # an edge chosen by both ends is only made once, so vertices look
+    # further than edges / vertices neighbors
+    k = max(2 * math.ceil(edges / vertices) + 1, 1)
+    # about k points per cell
+    side = max(math.isqrt(max(vertices // k, 1)), 1)
+    cell = width // side + 1
+    grid = {}
+    for v, (x, y) in enumerate(coords):
+        grid.setdefault((x // cell, y // cell), []).append(v)
+
+    def ring(cx: int, cy: int, r: int) -> Iterator[int]:
+        """Yields the vertices in the cells r cells away from a cell."""
+        for i in range(cx - r, cx + r + 1):
+            for j in range(cy - r, cy + r + 1):
+                if max(abs(i - cx), abs(j - cy)) == r:
+                    yield from grid.get((i, j), ())
+
+    def dist2(u: int, v: int) -> int:
+        """The squared distance between two vertices."""
+        return (coords[u][0] - coords[v][0]) ** 2 + (coords[u][1] - coords[v][1]) ** 2
+
+    nearest = []
+    for u, (x, y) in enumerate(coords):
+        cx, cy = x // cell, y // cell
+        near = [v for v in ring(cx, cy, 0) if v != u]
+        r = 0
+        # one more ring once enough are found, since closer vertices may be
+        # just across a cell border
+        while r < side and len(near) < k:
+            r += 1
+            near += ring(cx, cy, r)
+        r += 1
+        near += ring(cx, cy, r)
+        near.sort(key=lambda v: dist2(u, v))
+        nearest.append(near[:k])
+    adj = [set() for _ in range(vertices)]
+    count = 0
+    for rank in range(k):
+        for u in range(vertices):
+            if count >= edges:
+                break
+            if rank < len(nearest[u]) and nearest[u][rank] not in adj[u]:
+                v = nearest[u][rank]
+                adj[u].add(v)
+                adj[v].add(u)
+                count += 1
+    # join components with union find
+    parent = list(range(vertices))
+
+    def find(u: int) -> int:
+        """Finds the representative of a vertex's component."""
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    for u in range(vertices):
+        for v in adj[u]:
+            parent[find(u)] = find(v)
+    for u in range(vertices):
+        if find(u) != find(0):
+            # join u to the nearest vertex outside its component
+            cx, cy = coords[u][0] // cell, coords[u][1] // cell
+            ru = find(u)
+            best = None
+            r = 0
+            while best is None:
+                for v in ring(cx, cy, r):
+                    if find(v) != ru and (best is None or dist2(u, v) < dist2(u, best)):
+                        best = v
+                r += 1
+            adj[u].add(best)
+            adj[best].add(u)
+            parent[ru] = find(best)
+    adj_list = [[] for _ in range(vertices)]
+    for u in range(vertices):
+        for v in adj[u]:
+            if u < v:
+                w = math.ceil(math.sqrt(dist2(u, v)) * (1 + random() * stretch))
+                adj_list[u].append((w, v))
+                adj_list[v].append((w, u))
+    return coords, adj_list
+
+
 def assign_random_weights(
     adj_list: list[list[int]], minweight: int = 0, maxweight: int = MAX_VAL
 ) -> list[list[tuple[int]]]:
-    """Assigns random weights to an undirected graph.
+    """Assigns random weights to an undirected graph. The weights are drawn
+    all at once, with NumPy if it is installed. NumPy is seeded from the
+    random module, so random.seed makes the weights repeat either way.
 
     Args:
         adj_list (list[list[int]]): A graph as an adjacency list.
-        minweight (int, optional): The minimum weight for an edge. Defaults to 0.
-        maxweight (int, optional): The maximum weight for an edge. Defaults to MAX_VAL.
+        minweight (int, optional): The minimum weight for an edge. Defaults
+            to 0.
+        maxweight (int, optional): The maximum weight for an edge. Defaults
+            to MAX_VAL.
 
     Returns:
         list[list[tuple[int]]]: The original adjacency list:
             list[vertex index] = [(weight, adjacent index)]
     """
 
+    count = sum(map(len, adj_list))
+    if np is not None:
+        rng = np.random.default_rng(getrandbits(64))
+        weights = rng.integers(minweight, maxweight, count, endpoint=True).tolist()
+    else:
+        weights = choices(range(minweight, maxweight + 1), k=count)
+    i = 0
     for edges in adj_list:
-        for i in range(len(edges)):
-            edges[i] = (randrange(minweight, maxweight + 1), edges[i])
+        j = i + len(edges)
+        edges[:] = zip(weights[i:j], edges)
+        i = j
     return adj_list
 
 
 def rand_tree(size: int) -> list[list[int]]:
-    """Generates a random tree (undirected).
+    """Generates a random tree (undirected) by decoding a random Prufer
+    sequence in linear time. The next leaf is either the vertex that just
+    became one, if it is smaller than the pointer, or the next leaf after the
+    pointer, so the pointer only moves forward.
 
     Args:
         size (int): The number of vertices in the tree.
@@ -266,24 +2317,31 @@ def rand_tree(size: int) -> list[list[int]]:
             list[vertex index] = [adjacent index]
     """
 
-    prufer = rand_prufer_seq(size)
     adj_list = [[] for _ in range(size)]
+    if size < 2:
+        return adj_list
+    prufer = rand_prufer_seq(size)
     degree = [1] * size
     # calculate degrees
     for u in prufer:
         degree[u] += 1
-    # make edges
+    # make edges, always to the smallest leaf
+    ptr = leaf = degree.index(1)
     for u in prufer:
-        v = degree.index(1)
-        adj_list[u].append(v)
-        adj_list[v].append(u)
+        adj_list[u].append(leaf)
+        adj_list[leaf].append(u)
+        degree[leaf] = 0
         degree[u] -= 1
-        degree[v] -= 1
+        if degree[u] == 1 and u < ptr:
+            leaf = u
+        else:
+            ptr += 1
+            while degree[ptr] != 1:
+                ptr += 1
+            leaf = ptr
     # make last edge
-    u = degree.index(1)
-    v = degree.index(1, u + 1)
-    adj_list[u].append(v)
-    adj_list[v].append(u)
+    adj_list[leaf].append(size - 1)
+    adj_list[size - 1].append(leaf)
     return adj_list
 
 
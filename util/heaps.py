@@ -0,0 +1,155 @@
+#!/usr/bin/env python3.9
+
+"""The interface shared by node based heaps and a registry of heaps that
+implement it. Benchmarks and graph algorithms look heaps up here instead of
+importing each module, so a new heap only needs to be registered.
+
+Example:
+    >>> heap = heaps.make("Fibonacci")
+    >>> node = heap.add(5, "five")
+    >>> heap.decreasekey(node, 3).key
+    3
+
+Attributes:
+    HEAPS (dict[str, HeapInfo]): Registered heaps by name, in the order they
+        were registered.
+"""
+
+from __future__ import annotations
+from functools import partial
+from typing import Callable, NamedTuple, Optional, Protocol
+
+from util import pairingheap, fibonacciheap, binaryheap, daryheap, radixheap
+from util import hollowheap, rankpairingheap
+
+
+class HeapNode(Protocol):
+    """A handle to a key in a heap. The heap returns the same handle from
+    add, pop, decreasekey and remove, so callers may keep it to decrease or
+    remove the key later.
+
+    Attributes:
+        key (int): The key stored by this handle.
+        value (any): The payload stored with the key.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link handles together.
+    """
+
+    key: int
+    value: any
+    pred: Optional[HeapNode]
+
+
+class Heap(Protocol):
+    """A minheap with handles.
+
+    Attributes:
+        size (int): The number of keys in the heap.
+    """
+
+    size: int
+
+    def add(self, key: int, value: any = None) -> HeapNode:
+        """Adds a key to the heap and returns its handle."""
+
+    def pop(self) -> Optional[HeapNode]:
+        """Returns and removes the handle with the minimum key. None if the
+        heap is empty."""
+
+    def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
+        """Decreases the key of a handle still in the heap."""
+
+    def remove(self, node: HeapNode) -> HeapNode:
+        """Removes a handle still in the heap."""
+
+
+class HeapInfo(NamedTuple):
+    """A registered heap.
+
+    Attributes:
+        factory (Callable[..., Heap]): Makes an empty heap. Extra arguments,
+            such as the arity of a d-ary heap, are passed through.
+        code (str): The letter used in run codes. <code>h runs the heap
+            operation test and <code>d runs Dijkstra's. Empty if the heap has
+            no run code.
+        monotone (bool): Whether keys may never be smaller than the last
+            popped key. Monotone heaps only run Dijkstra's.
+    """
+
+    factory: Callable[..., Heap]
+    code: str = ""
+    monotone: bool = False
+
+
+HEAPS = {}
+
+
+def register(
+    name: str,
+    factory: Callable[..., Heap],
+    code: str = "",
+    monotone: bool = False,
+) -> None:
+    """Registers a heap.
+
+    Args:
+        name (str): The name of the heap.
+        factory (Callable[..., Heap]): Makes an empty heap.
+        code (str, optional): The letter used in run codes. Defaults to no
+            run code.
+        monotone (bool, optional): Whether keys may never be smaller than the
+            last popped key. Defaults to False.
+
+    Raises:
+        ValueError: If the name or code is already registered.
+    """
+
+    if name in HEAPS:
+        raise ValueError(f"Heap already registered: {name}")
+    if code and code in (info.code for info in HEAPS.values()):
+        raise ValueError(f"Run code already registered: {code}")
+    HEAPS[name] = HeapInfo(factory, code, monotone)
+
+
+def make(name: str, *args) -> Heap:
+    """Makes an empty registered heap.
+
+    Args:
+        name (str): The name of the heap.
+        *args: Passed to the heap's factory.
+
+    Raises:
+        KeyError: If no heap has the name.
+
+    Returns:
+        Heap: An empty heap.
+    """
+
+    return HEAPS[name].factory(*args)
+
+
+def by_code(code: str) -> Optional[str]:
+    """Finds a heap by its run code letter.
+
+    Args:
+        code (str): The run code letter.
+
+    Returns:
+        str or None: The name of the heap. None if no heap has the code.
+    """
+
+    for name, info in HEAPS.items():
+        if code and info.code == code:
+            return name
+    return None
+
+
+register("pairing", pairingheap.Heap, "p")
+register("multipass pairing", partial(pairingheap.Heap, pairingheap.MULTIPASS))
+register("auxiliary pairing", partial(pairingheap.Heap, pairingheap.AUXILIARY))
+register("Fibonacci", fibonacciheap.Heap, "f")
+register("indexed binary", binaryheap.Heap, "i")
+register("d-ary", daryheap.Heap, "d")
+register("radix", radixheap.Heap, "r", monotone=True)
+register("hollow", hollowheap.Heap, "h")
+register("rank-pairing", rankpairingheap.Heap, "k")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3.9
+
+
+class Item:
+    """An item stored in a hollow heap. Items are the handles given to
+    callers. Decreasing a key moves the item to a new node, so the item and
+    not the node stays the same.
+
+    Attributes:
+        key (int): The key of the item.
+        value (any): The payload stored with the key.
+        node (HeapNode or None): The node holding this item. None once the
+            item is removed.
+        pred (Item or None): Not used by the heap. Free for algorithms, such
+            as Dijkstra's, to link items together.
+    """
+
+    __slots__ = ("key", "value", "node", "pred")
+
+    def __init__(self, key: int, value: any = None) -> None:
+        """Inits an item that is not yet in a heap.
+
+        Args:
+            key (int): The key of the item.
+            value (any, optional): The payload stored with the key. Defaults
+                to None.
+        """
+
+        self.key = key
+        self.value = value
+        self.node = None
+        self.pred = None
+
+
+class HeapNode:
+    """A node in a hollow heap.
+
+    Attributes:
+        item (Item or None): The item held by this node. None if the node
+            is hollow.
+        key (int): The key of the node. Guaranteed to be less than or equal
+            to all keys in this subheap.
+        child (HeapNode or None): The first child of the node.
+        next (HeapNode or None): The next sibling of the node.
+        ep (HeapNode or None): The extra parent of a hollow node that was
+            left behind by a decrease key.
+        rank (int): The rank of the node.
+    """
+
+    __slots__ = ("item", "key", "child", "next", "ep", "rank")
+
+    def __init__(self, item: Item, key: int) -> None:
+        """Inits a solitary node of a heap.
+
+        Args:
+            item (Item): The item held by the node.
+            key (int): The key of the node.
+        """
+
+        self.item = item
+        self.key = key
+        self.child = None
+        self.next = None
+        self.ep = None
+        self.rank = 0
+
+
+class Heap:
+    """A minheap implemented using a hollow heap with one root. Decrease key
+    and remove are lazy: the old node is left hollow and only destroyed when
+    it becomes the root.
+
+    Attributes:
+        root (HeapNode or None): The node containing the minimum key.
+        size (int): The number of items in the heap.
+        ranks (list[HeapNode or None]): The table used to link nodes by rank.
+            All None between deletions.
+    """
+
+    def __init__(self) -> None:
+        """Inits an empty minheap."""
+
+        self.root = None
+        self.size = 0
+        self.ranks = []
+
+    @staticmethod
+    def link(v: HeapNode, w: HeapNode) -> HeapNode:
+        """Makes the node with the greater key the first child of the other.
+
+        Args:
+            v (HeapNode): A root.
+            w (HeapNode): A root.
+
+        Returns:
+            HeapNode: The root of the combined tree.
+        """
+
+        if v.key >= w.key:
+            v.next = w.child
+            w.child = v
+            return w
+        w.next = v.child
+        v.child = w
+        return v
+
+    def add(self, key: int, value: any = None) -> Item:
+        """Adds a key to the heap.
+
+        Args:
+            key (int): The key to add.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
+
+        Returns:
+            Item: The item that stores the key.
+        """
+
+        item = Item(key, value)
+        item.node = HeapNode(item, key)
+        if self.root:
+            self.root = self.link(item.node, self.root)
+        else:
+            self.root = item.node
+        self.size += 1
+        return item
+
+    def pop(self) -> Item:
+        """Returns and removes the minimum item in this heap.
+
+        Returns:
+            Item or None: The item with the minimum key. None if the heap is
+                empty.
+        """
+
+        if not self.root:
+            return None
+        return self.remove(self.root.item)
+
+    def decreasekey(self, item: Item, key: int) -> Item:
+        """Decreases the key of an item. Unless the item is the root, it
+        moves to a new node and its old node becomes hollow.
+
+        Args:
+            item (Item): The item to decrease.
+            key (int): The new key for the item. Must be less than the
+                original key.
+
+        Returns:
+            Item: The decreased item.
+        """
+
+        item.key = key
+        u = item.node
+        if u is self.root:
+            u.key = key
+            return item
+        v = HeapNode(item, key)
+        item.node = v
+        u.item = None
+        if u.rank > 2:
+            v.rank = u.rank - 2
+        v.child = u
+        u.ep = v
+        self.root = self.link(v, self.root)
+        return item
+
+    def remove(self, item: Item) -> Item:
+        """Removes an item from the heap. Its node becomes hollow. If the
+        root is hollow, hollow roots are destroyed and their full children
+        are linked by rank into one tree.
+
+        Args:
+            item (Item): The item to remove.
+
+        Returns:
+            Item: The removed item.
+        """
+
+        item.node.item = None
+        item.node = None
+        self.size -= 1
+        if self.root.item:
+            return item
+        link = self.link
+        ranks = self.ranks
+        top = len(ranks)
+        max_rank = -1
+        h = self.root
+        h.next = None
+        while h:
+            w = h.child
+            v = h
+            h = h.next
+            v.child = None
+            while w:
+                u = w
+                w = w.next
+                if not u.item:
+                    if not u.ep:
+                        # u is hollow with one parent, destroy it later
+                        u.next = h
+                        h = u
+                    else:
+                        # u keeps its other parent
+                        if u.ep is v:
+                            w = None
+                        else:
+                            u.next = None
+                        u.ep = None
+                else:
+                    r = u.rank
+                    while r + 1 >= top:
+                        ranks.append(None)
+                        top += 1
+                    while ranks[r]:
+                        u = link(u, ranks[r])
+                        ranks[r] = None
+                        r += 1
+                        if r + 1 == top:
+                            ranks.append(None)
+                            top += 1
+                    u.rank = r
+                    ranks[r] = u
+                    if r > max_rank:
+                        max_rank = r
+        # link the full trees that are left
+        root = None
+        for r in range(max_rank + 1):
+            if ranks[r]:
+                root = link(root, ranks[r]) if root else ranks[r]
+                ranks[r] = None
+        if root:
+            root.next = None
+        self.root = root
+        return item
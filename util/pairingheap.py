@@ -1,6 +1,25 @@
 #!/usr/bin/env python3.9
 
+"""A pairing heap.
+
+Attributes:
+    TWO_PASS (str): Link the children of a popped root in pairs from the
+        front, then link the pairs from the back.
+    MULTIPASS (str): Link the children of a popped root in pairs, over and
+        over, until one tree is left.
+    AUXILIARY (str): Two pass pops, but added nodes and cut subtrees wait in
+        an auxiliary list. The list is linked with multipass before the next
+        pop.
+    STRATEGIES (tuple[str]): All strategies.
+"""
+
 import math
+from operator import attrgetter
+
+TWO_PASS = "twopass"
+MULTIPASS = "multipass"
+AUXILIARY = "auxiliary"
+STRATEGIES = (TWO_PASS, MULTIPASS, AUXILIARY)
 
 
 class HeapNode:
@@ -9,22 +28,31 @@ class HeapNode:
     Attributes:
         key (int): The key value stored by this node. Guaranteed to be less
             than or equal to all keys in this subheap.
+        value (any): The payload stored with the key.
         left (HeapNode or None): The child of the node.
         right (HeapNode or None): The sibling of the node.
         parent (HeapNode or None): The parent of the node.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link nodes together.
     """
 
-    def __init__(self, key: int) -> None:
+    __slots__ = ("key", "value", "left", "right", "parent", "pred")
+
+    def __init__(self, key: int, value: any = None) -> None:
         """Inits a solitary node of a heap.
 
         Args:
             key (int): The key stored in the node.
+            value (any, optional): The payload stored in the node. Defaults
+                to None.
         """
 
         self.key = key
+        self.value = value
         self.left = None
         self.right = None
         self.parent = None
+        self.pred = None
 
     def cut(self) -> None:
         """Cuts the node from its parent. Parent must not be None."""
@@ -44,15 +72,32 @@ class Heap:
 
     Attributes:
         root (HeapNode or None): The node containing the minimum key in the
-            heap.
+            heap, not counting nodes in aux.
         size (int): The size of the heap.
+        strategy (str): How trees are linked. One of STRATEGIES.
+        aux (list[HeapNode]): Trees waiting to be linked with the root. Only
+            used by the AUXILIARY strategy.
+        lazy (bool): Whether added and cut nodes wait in aux.
     """
 
-    def __init__(self) -> None:
-        """Inits an empty minheap."""
+    def __init__(self, strategy: str = TWO_PASS) -> None:
+        """Inits an empty minheap.
 
+        Args:
+            strategy (str, optional): How trees are linked. One of
+                STRATEGIES. Defaults to TWO_PASS.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+        """
+
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
         self.root = None
         self.size = 0
+        self.strategy = strategy
+        self.aux = []
+        self.lazy = strategy == AUXILIARY
 
     @staticmethod
     def meld(a: HeapNode, b: HeapNode) -> HeapNode:
@@ -75,24 +120,61 @@ class Heap:
         a.left = b
         return a
 
-    def add(self, key: int) -> HeapNode:
+    def add(self, key: int, value: any = None) -> HeapNode:
         """Adds a key to the heap.
 
         Args:
             key (int): The key to add.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
 
         Returns:
             HeapNode: The node that stores the key.
         """
 
-        node = HeapNode(key)
-        if not self.root:
+        node = HeapNode(key, value)
+        if self.lazy:
+            self.aux.append(node)
+        elif not self.root:
             self.root = node
         else:
             self.root = self.meld(self.root, node)
         self.size += 1
         return node
 
+    def add_many(self, keys: list[int]) -> list[HeapNode]:
+        """Adds many keys to the heap in linear time. The smallest new node
+        gets every other new node as a child, then it is melded with the
+        root once.
+
+        Args:
+            keys (list[int]): The keys to add.
+
+        Returns:
+            list[HeapNode]: The nodes that store the keys, in order.
+        """
+
+        nodes = [HeapNode(key) for key in keys]
+        if not nodes:
+            return nodes
+        top = min(nodes, key=attrgetter("key"))
+        prev = top
+        for node in nodes:
+            if node is top:
+                continue
+            if prev is top:
+                top.left = node
+            else:
+                prev.right = node
+            node.parent = prev
+            prev = node
+        if not self.root:
+            self.root = top
+        else:
+            self.root = self.meld(self.root, top)
+        self.size += len(nodes)
+        return nodes
+
     def pop(self) -> HeapNode:
         """Returns and removes the minimum node in this heap.
 
@@ -101,6 +183,8 @@ class Heap:
                 heap is empty.
         """
 
+        if self.aux:
+            self.flush()
         res = self.root
         if not res:
             return res
@@ -108,9 +192,54 @@ class Heap:
         if not res.left:
             self.root = None
             return res
-        # link pairs of subtrees by their roots
         crawl = res.left
         res.left = None
+        if self.strategy == MULTIPASS:
+            self.root = self.multipass(crawl)
+        else:
+            self.root = self.twopass(crawl)
+        return res
+
+    def peek(self) -> HeapNode:
+        """Returns the minimum node in this heap without removing it.
+
+        Returns:
+            HeapNode or None: The node with the minimum key. None if the
+                heap is empty.
+        """
+
+        if self.aux:
+            self.flush()
+        return self.root
+
+    def flush(self) -> None:
+        """Links the trees waiting in aux with each other using multipass
+        and then with the root.
+        """
+
+        aux = self.aux
+        meld = self.meld
+        # aux is used as a queue; linked pairs go to the back
+        i = 0
+        while i + 1 < len(aux):
+            aux.append(meld(aux[i], aux[i + 1]))
+            i += 2
+        top = aux[-1]
+        aux.clear()
+        self.root = meld(self.root, top) if self.root else top
+
+    def twopass(self, crawl: HeapNode) -> HeapNode:
+        """Links a list of sibling trees into one tree. Pairs are linked from
+        the front, then the pairs are linked from the back.
+
+        Args:
+            crawl (HeapNode): The first tree in the list.
+
+        Returns:
+            HeapNode: The root of the combined tree.
+        """
+
+        # link pairs of subtrees by their roots
         roots = []
         while crawl and crawl.right:
             a = crawl
@@ -123,11 +252,93 @@ class Heap:
             crawl.right = None
             roots.append(crawl)
         # link all pairs together to make one tree
-        self.root = roots.pop()
+        root = roots.pop()
         for node in reversed(roots):
-            self.root = self.meld(self.root, node)
-        self.root.parent = None
-        return res
+            root = self.meld(root, node)
+        root.parent = None
+        return root
+
+    def multipass(self, crawl: HeapNode) -> HeapNode:
+        """Links a list of sibling trees into one tree. Pairs are linked
+        from the front and put at the back until one tree is left.
+
+        Args:
+            crawl (HeapNode): The first tree in the list.
+
+        Returns:
+            HeapNode: The root of the combined tree.
+        """
+
+        roots = []
+        while crawl:
+            roots.append(crawl)
+            nxt = crawl.right
+            crawl.right = None
+            crawl = nxt
+        meld = self.meld
+        i = 0
+        while i + 1 < len(roots):
+            roots.append(meld(roots[i], roots[i + 1]))
+            i += 2
+        root = roots[-1]
+        root.parent = None
+        return root
+
+    def pop_many(self, k: int) -> list[HeapNode]:
+        """Returns and removes the k minimum nodes in this heap.
+
+        Args:
+            k (int): The number of nodes to pop.
+
+        Returns:
+            list[HeapNode]: The popped nodes in increasing key order. Shorter
+                than k if the heap runs out of nodes.
+        """
+
+        pop = self.pop
+        return [pop() for _ in range(min(k, self.size))]
+
+    def replace(self, key: int) -> tuple[HeapNode, HeapNode]:
+        """Pops the minimum node and adds a key. The new node is put with the
+        children of the root so the pop links it in for free.
+
+        Args:
+            key (int): The key to add.
+
+        Returns:
+            tuple[HeapNode, HeapNode]: (popped node or None if the heap was
+                empty, node that stores the key)
+        """
+
+        res = self.peek()
+        if not res:
+            return None, self.add(key)
+        node = HeapNode(key)
+        node.parent = res
+        if res.left:
+            node.right = res.left
+            node.right.parent = node
+        res.left = node
+        self.size += 1
+        return self.pop(), node
+
+    def pushpop(self, key: int) -> tuple[HeapNode, HeapNode]:
+        """Adds a key and then pops the minimum node. The heap is not touched
+        if the key is not greater than the minimum.
+
+        Args:
+            key (int): The key to add.
+
+        Returns:
+            tuple[HeapNode, HeapNode]: (popped node, node that stores the
+                key) Both are the same node if the key was popped.
+        """
+
+        root = self.peek()
+        if not root or key <= root.key:
+            node = HeapNode(key)
+            return node, node
+        return self.replace(key)
 
     def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
         """Decreases the key stored in a node.
@@ -147,9 +358,41 @@ class Heap:
         if not node.parent or node.parent.key <= key:
             return node
         node.cut()
-        self.root = self.meld(self.root, node)
+        if self.lazy:
+            self.aux.append(node)
+        else:
+            self.root = self.meld(self.root, node)
         return node
 
+    def decreasekey_many(self, pairs: list[tuple[HeapNode, int]]) -> None:
+        """Decreases the keys stored in many nodes. Nodes that break heap
+        order are cut, linked with each other in pairs and then melded with
+        the root once. The AUXILIARY strategy leaves them in aux instead.
+
+        Args:
+            pairs (list[tuple[HeapNode, int]]): (node, new key) Each key
+                must be less than the node's original key.
+        """
+
+        cuts = []
+        for node, key in pairs:
+            node.key = key
+            if node.parent and node.parent.key > key:
+                node.cut()
+                cuts.append(node)
+        if not cuts:
+            return
+        if self.lazy:
+            self.aux += cuts
+            return
+        meld = self.meld
+        while len(cuts) > 1:
+            linked = [meld(a, b) for a, b in zip(cuts[::2], cuts[1::2])]
+            if len(cuts) % 2:
+                linked.append(cuts[-1])
+            cuts = linked
+        self.root = meld(self.root, cuts[0])
+
     def remove(self, node: HeapNode) -> HeapNode:
         """Removes a node from the heap.
 
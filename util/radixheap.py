@@ -0,0 +1,172 @@
+#!/usr/bin/env python3.9
+
+
+class HeapNode:
+    """A node in a radix heap.
+
+    Attributes:
+        key (int): The key value stored by this node.
+        value (any): The payload stored with the key.
+        bucket (int): The index of the bucket holding this node. -1 if the
+            node is not in a heap.
+        pos (int): The index of this node in its bucket.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link nodes together.
+    """
+
+    __slots__ = ("key", "value", "bucket", "pos", "pred")
+
+    def __init__(self, key: int, value: any = None) -> None:
+        """Inits a node that is not yet in a heap.
+
+        Args:
+            key (int): The key stored in the node.
+            value (any, optional): The payload stored in the node. Defaults
+                to None.
+        """
+
+        self.key = key
+        self.value = value
+        self.bucket = -1
+        self.pos = -1
+        self.pred = None
+
+
+class Heap:
+    """A monotone minheap for non-negative integer keys implemented using a
+    radix heap. Keys may never be smaller than the last popped key, which
+    holds for Dijkstra's with non-negative weights. A node with key k goes in
+    bucket (k ^ last).bit_length(), so each node only moves to lower buckets
+    and is moved at most O(log C) times, where C is the largest key.
+
+    Attributes:
+        buckets (list[list[HeapNode]]): buckets[0] holds keys equal to last.
+            buckets[i] holds keys that first differ from last at bit i - 1.
+        last (int): The last popped key.
+        size (int): The size of the heap.
+    """
+
+    def __init__(self) -> None:
+        """Inits an empty minheap."""
+
+        self.buckets = [[]]
+        self.last = 0
+        self.size = 0
+
+    def place(self, node: HeapNode) -> None:
+        """Puts a node into the bucket that matches its key.
+
+        Args:
+            node (HeapNode): A node not in any bucket.
+        """
+
+        i = (node.key ^ self.last).bit_length()
+        while i >= len(self.buckets):
+            self.buckets.append([])
+        bucket = self.buckets[i]
+        node.bucket = i
+        node.pos = len(bucket)
+        bucket.append(node)
+
+    def detach(self, node: HeapNode) -> None:
+        """Takes a node out of its bucket by moving the bucket's last node
+        into its place.
+
+        Args:
+            node (HeapNode): A node in this heap.
+        """
+
+        bucket = self.buckets[node.bucket]
+        last = bucket.pop()
+        if last is not node:
+            bucket[node.pos] = last
+            last.pos = node.pos
+        node.bucket = -1
+
+    def add(self, key: int, value: any = None) -> HeapNode:
+        """Adds a key to the heap.
+
+        Args:
+            key (int): The key to add. Must not be smaller than the last
+                popped key.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
+
+        Raises:
+            ValueError: If the key is smaller than the last popped key.
+
+        Returns:
+            HeapNode: The node that stores the key.
+        """
+
+        if key < self.last:
+            raise ValueError("Key is smaller than the last popped key")
+        node = HeapNode(key, value)
+        self.place(node)
+        self.size += 1
+        return node
+
+    def pop(self) -> HeapNode:
+        """Returns and removes the minimum node in this heap.
+
+        Returns:
+            HeapNode or None: The node with the minimum key. None if the
+                heap is empty.
+        """
+
+        if not self.size:
+            return None
+        buckets = self.buckets
+        if not buckets[0]:
+            # find the first nonempty bucket and redistribute it around its
+            # minimum key
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            self.last = min(node.key for node in bucket)
+            for node in bucket:
+                self.place(node)
+        res = buckets[0].pop()
+        res.bucket = -1
+        self.size -= 1
+        return res
+
+    def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
+        """Decreases the key stored in a node.
+
+        Args:
+            node (HeapNode): The node to decrease.
+            key (int): The new key for the node. Must be less than the
+                original key and not smaller than the last popped key.
+
+        Raises:
+            ValueError: If the key is smaller than the last popped key.
+
+        Returns:
+            HeapNode: The decreased node.
+        """
+
+        if key < self.last:
+            raise ValueError("Key is smaller than the last popped key")
+        node.key = key
+        i = (key ^ self.last).bit_length()
+        if i != node.bucket:
+            self.detach(node)
+            self.place(node)
+        return node
+
+    def remove(self, node: HeapNode) -> HeapNode:
+        """Removes a node from the heap.
+
+        Args:
+            node (HeapNode): The node to remove.
+
+        Returns:
+            HeapNode: The removed node.
+        """
+
+        self.detach(node)
+        self.size -= 1
+        return node
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3.9
+
+import math
+from operator import attrgetter
+
+
+class HeapNode:
+    """A node in a rank-pairing heap. Trees are half ordered binary trees:
+    a node's key is less than or equal to every key in its left subtree,
+    and a root has no right child.
+
+    Attributes:
+        key (int): The key value stored by this node.
+        value (any): The payload stored with the key.
+        left (HeapNode or None): The left child of the node.
+        right (HeapNode or None): The right child of the node.
+        parent (HeapNode or None): The parent of the node. None for a root.
+        rank (int): The rank of the node.
+        pred (HeapNode or None): Not used by the heap. Free for algorithms,
+            such as Dijkstra's, to link nodes together.
+    """
+
+    __slots__ = ("key", "value", "left", "right", "parent", "rank", "pred")
+
+    def __init__(self, key: int, value: any = None) -> None:
+        """Inits a solitary node of a heap.
+
+        Args:
+            key (int): The key stored in the node.
+            value (any, optional): The payload stored in the node. Defaults
+                to None.
+        """
+
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.rank = 0
+        self.pred = None
+
+
+class Heap:
+    """A minheap implemented using a type 1 rank-pairing heap. Roots are only
+    linked when the minimum is popped, and then only once per pass, pairing
+    roots of equal rank. Decrease key cuts a node's left subtree loose and
+    lowers ranks on the path above it.
+
+    Attributes:
+        roots (list[HeapNode]): The roots of the half trees.
+        minroot (HeapNode or None): The root containing the minimum key.
+        size (int): The size of the heap.
+        buckets (list[HeapNode or None]): The table used to pair roots by
+            rank. All None between pops.
+    """
+
+    def __init__(self) -> None:
+        """Inits an empty minheap."""
+
+        self.roots = []
+        self.minroot = None
+        self.size = 0
+        self.buckets = []
+
+    @staticmethod
+    def link(x: HeapNode, y: HeapNode) -> HeapNode:
+        """Links two roots of equal rank. The loser becomes the left child of
+        the winner and takes the winner's old left subtree as its right.
+
+        Args:
+            x (HeapNode): A root.
+            y (HeapNode): A root with the same rank as x.
+
+        Returns:
+            HeapNode: The root of the combined half tree.
+        """
+
+        if y.key < x.key:
+            x, y = y, x
+        y.right = x.left
+        if y.right:
+            y.right.parent = y
+        x.left = y
+        y.parent = x
+        x.rank += 1
+        return x
+
+    def add(self, key: int, value: any = None) -> HeapNode:
+        """Adds a key to the heap.
+
+        Args:
+            key (int): The key to add.
+            value (any, optional): The payload to store with the key.
+                Defaults to None.
+
+        Returns:
+            HeapNode: The node that stores the key.
+        """
+
+        node = HeapNode(key, value)
+        self.roots.append(node)
+        if not self.minroot or key < self.minroot.key:
+            self.minroot = node
+        self.size += 1
+        return node
+
+    def pop(self) -> HeapNode:
+        """Returns and removes the minimum node in this heap.
+
+        Returns:
+            HeapNode or None: The node with the minimum key. None if the
+                heap is empty.
+        """
+
+        res = self.minroot
+        if not res:
+            return res
+        self.size -= 1
+        buckets = self.buckets
+        top = len(buckets)
+        link = self.link
+        roots = []
+        # the right spine of the left child becomes new roots
+        spine = []
+        crawl = res.left
+        res.left = None
+        while crawl:
+            nxt = crawl.right
+            crawl.right = None
+            crawl.parent = None
+            crawl.rank = crawl.left.rank + 1 if crawl.left else 0
+            spine.append(crawl)
+            crawl = nxt
+        # one pass of linking roots of equal rank
+        for group in (self.roots, spine):
+            for node in group:
+                if node is res:
+                    continue
+                r = node.rank
+                while r >= top:
+                    buckets.append(None)
+                    top += 1
+                if buckets[r]:
+                    roots.append(link(node, buckets[r]))
+                    buckets[r] = None
+                else:
+                    buckets[r] = node
+        for r in range(top):
+            if buckets[r]:
+                roots.append(buckets[r])
+                buckets[r] = None
+        self.roots = roots
+        self.minroot = min(roots, key=attrgetter("key")) if roots else None
+        return res
+
+    def decreasekey(self, node: HeapNode, key: int) -> HeapNode:
+        """Decreases the key stored in a node. A node that is not a root is
+        cut with its left subtree and becomes a root, and the ranks of its
+        ancestors are lowered until one does not change.
+
+        Args:
+            node (HeapNode): The node to decrease.
+            key (int): The new key for the node. Must be less than the
+                original key.
+
+        Returns:
+            HeapNode: The decreased node.
+        """
+
+        node.key = key
+        if key < self.minroot.key:
+            self.minroot = node
+        parent = node.parent
+        if not parent:
+            return node
+        # the right subtree of the node takes its place
+        if parent.left is node:
+            parent.left = node.right
+        else:
+            parent.right = node.right
+        if node.right:
+            node.right.parent = parent
+        node.parent = None
+        node.right = None
+        node.rank = node.left.rank + 1 if node.left else 0
+        self.roots.append(node)
+        # lower ranks towards the root
+        u = parent
+        while u.parent:
+            r1 = u.left.rank if u.left else -1
+            r2 = u.right.rank if u.right else -1
+            rank = max(r1, r2) if r1 != r2 else r1 + 1
+            if rank >= u.rank:
+                break
+            u.rank = rank
+            u = u.parent
+        else:
+            u.rank = u.left.rank + 1 if u.left else 0
+        return node
+
+    def remove(self, node: HeapNode) -> HeapNode:
+        """Removes a node from the heap.
+
+        Args:
+            node (HeapNode): The node to remove.
+
+        Returns:
+            HeapNode: The removed node.
+        """
+
+        self.decreasekey(node, -math.inf)
+        return self.pop()
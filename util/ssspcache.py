@@ -0,0 +1,298 @@
+#!/usr/bin/env python3.9
+
+"""A least recently used cache of shortest path trees. Trees are keyed by a
+fingerprint of the graph's content and the source, so the same graph read
+twice shares entries, and a changed graph never sees stale ones.
+
+Example:
+    >>> cache = ssspcache.Cache(max_bytes=1 << 26)
+    >>> key = ssspcache.fingerprint(adj_list)
+    >>> cache.sssp(adj_list, 0, key).path(5)
+    [0, 3, 5]
+    >>> cache.sssp(adj_list, 0, key).dist[5]
+    12
+    >>> cache.hits, cache.misses
+    (1, 1)
+"""
+
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+import os
+from pathlib import Path
+import time
+from typing import Optional, Union
+
+from util import graph, heaps
+
+
+def fingerprint(g: Union[list[list[tuple[int]]], graph.CSRGraph]) -> str:
+    """Hashes the content of a graph. Takes time linear in the size of the
+    graph, so callers that query a graph many times should keep the result.
+
+    Args:
+        g (list[list[tuple[int]]] or graph.CSRGraph): The graph, in adjacency
+            list or CSR format.
+
+    Returns:
+        str: A hex digest that changes if any vertex, edge or weight does.
+    """
+
+    h = blake2b(digest_size=16)
+    if isinstance(g, graph.CSRGraph):
+        h.update(b"csr")
+        for arr in (g.offsets, g.targets, g.weights):
+            h.update(memoryview(arr).cast("B"))
+        return h.hexdigest()
+    h.update(b"adj")
+    h.update(array("q", (len(g),)))
+    for edges in g:
+        h.update(array("q", [len(edges)] + [x for edge in edges for x in edge]))
+    return h.hexdigest()
+
+
+def solve(
+    g: Union[list[list[tuple[int]]], graph.CSRGraph], src: int, heap: str = None
+) -> graph.ShortestPaths:
+    """Runs Dijkstra's on an adjacency list or CSR graph.
+
+    Args:
+        g (list[list[tuple[int]]] or graph.CSRGraph): The graph. Weights must
+            be non-negative.
+        src (int): The source index.
+        heap (str, optional): The name of a heap in heaps.HEAPS. Defaults to
+            heapq.
+
+    Returns:
+        graph.ShortestPaths: The minimum distances and predecessors.
+    """
+
+    csr = isinstance(g, graph.CSRGraph)
+    if heap is None:
+        if csr:
+            return graph.dijkstra_ssp_csr_binaryheap(g, src)
+        return graph.dijkstra_ssp_binaryheap(g, src)
+    if csr:
+        return graph.dijkstra_ssp_csr(g, src, heaps.make(heap))
+    return graph.dijkstra_ssp(g, src, heaps.make(heap))
+
+
+class Cache:
+    """A least recently used cache of shortest path trees, bounded by the
+    bytes of their arrays. With a directory, every computed tree is
+    also written there, and trees evicted from memory are read back instead
+    of being computed again. The directory has its own bound, and the files
+    used least recently, by modification time, are deleted first, so files
+    of graphs that changed age out.
+
+    Attributes:
+        max_bytes (int): The most bytes of trees kept in memory.
+        directory (Path or None): The directory of the disk tier.
+        max_disk_bytes (int): The most bytes of tree files kept in the
+            directory.
+        heap (str or None): The name of the heap in heaps.HEAPS used to
+            compute trees. None for heapq.
+        trees (OrderedDict[tuple[str, int], graph.ShortestPaths]):
+            (fingerprint, source) -> tree, least recently used first.
+        size (int): The bytes of trees in memory.
+        hits (int): Lookups answered from memory.
+        disk_hits (int): Lookups answered from the disk tier.
+        misses (int): Lookups that ran Dijkstra's.
+        evictions (int): Trees dropped from memory.
+        disk_size (int): The bytes of tree files in the directory.
+        disk_evictions (int): Tree files deleted from the directory.
+        clock (int): The last modification time given to a tree file, in
+            nanoseconds. File times are coarse, so the cache counts up from
+            it to keep reads and writes in order.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 1 << 26,
+        directory: Path = None,
+        heap: str = None,
+        max_disk_bytes: int = 1 << 30,
+    ) -> None:
+        """Inits an empty cache. Tree files already in the directory are
+        kept, up to max_disk_bytes.
+
+        Args:
+            max_bytes (int, optional): The most bytes of trees kept in
+                memory. Defaults to 64 MiB.
+            directory (Path, optional): The directory of the disk tier. It is
+                created if missing. Defaults to no disk tier.
+            heap (str, optional): The name of the heap in heaps.HEAPS used to
+                compute trees. Defaults to heapq.
+            max_disk_bytes (int, optional): The most bytes of tree files
+                kept in the directory. Defaults to 1 GiB.
+        """
+
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.heap = heap
+        self.trees = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_size = 0
+        self.disk_evictions = 0
+        self.clock = 0
+        if directory:
+            directory.mkdir(parents=True, exist_ok=True)
+            self.trim()
+
+    def sssp(
+        self,
+        g: Union[list[list[tuple[int]]], graph.CSRGraph],
+        src: int,
+        key: str = None,
+    ) -> graph.ShortestPaths:
+        """Finds the shortest path tree from a source, from memory, disk or
+        Dijkstra's in that order. The result is shared with the cache and
+        must not be changed.
+
+        Args:
+            g (list[list[tuple[int]]] or graph.CSRGraph): The graph.
+            src (int): The source index.
+            key (str, optional): fingerprint(g), if the caller kept it.
+                Defaults to hashing the graph, which is as slow as a search.
+
+        Returns:
+            graph.ShortestPaths: The minimum distances and predecessors.
+        """
+
+        key = key or fingerprint(g)
+        tree = self.trees.get((key, src))
+        if tree is not None:
+            self.trees.move_to_end((key, src))
+            self.hits += 1
+            return tree
+        tree = self.read(key, src)
+        if tree is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            tree = solve(g, src, self.heap)
+            self.write(key, src, tree)
+        self.put(key, src, tree)
+        return tree
+
+    def put(self, key: str, src: int, tree: graph.ShortestPaths) -> None:
+        """Stores a tree in memory and evicts the least recently used trees
+        until the cache fits. A tree larger than max_bytes is not stored.
+
+        Args:
+            key (str): The fingerprint of the graph.
+            src (int): The source index.
+            tree (graph.ShortestPaths): The tree.
+        """
+
+        if tree.nbytes() > self.max_bytes:
+            return
+        old = self.trees.pop((key, src), None)
+        if old is not None:
+            self.size -= old.nbytes()
+        self.trees[(key, src)] = tree
+        self.size += tree.nbytes()
+        while self.size > self.max_bytes:
+            _, old = self.trees.popitem(last=False)
+            self.size -= old.nbytes()
+            self.evictions += 1
+
+    def path(self, key: str, src: int) -> Optional[Path]:
+        """Returns the disk tier file of a tree. None without a disk tier."""
+
+        return self.directory / f"{key}-{src}.sssp" if self.directory else None
+
+    def read(self, key: str, src: int) -> Optional[graph.ShortestPaths]:
+        """Reads a tree from the disk tier.
+
+        Args:
+            key (str): The fingerprint of the graph.
+            src (int): The source index.
+
+        Returns:
+            graph.ShortestPaths or None: The tree. None if it is not on disk
+                or the file is damaged.
+        """
+
+        path = self.path(key, src)
+        if not path or not path.is_file():
+            return None
+        try:
+            tree = graph.ShortestPaths.frombytes(path.read_bytes())
+            self.touch(path)
+        except (OSError, ValueError):
+            return None
+        return tree
+
+    def write(self, key: str, src: int, tree: graph.ShortestPaths) -> None:
+        """Writes a tree to the disk tier, if there is one, and deletes the
+        least recently used files until the directory fits. A tree larger
+        than max_disk_bytes is not written.
+
+        Args:
+            key (str): The fingerprint of the graph.
+            src (int): The source index.
+            tree (graph.ShortestPaths): The tree.
+        """
+
+        path = self.path(key, src)
+        data = tree.tobytes()
+        if not path or len(data) > self.max_disk_bytes:
+            return
+        if path.is_file():
+            self.disk_size -= path.stat().st_size
+        # write then rename, so readers never see half a file
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        self.touch(path)
+        self.disk_size += len(data)
+        if self.disk_size > self.max_disk_bytes:
+            self.trim()
+
+    def touch(self, path: Path) -> None:
+        """Marks a tree file as just used.
+
+        Args:
+            path (Path): The tree file.
+        """
+
+        self.clock = max(time.time_ns(), self.clock + 1)
+        os.utime(path, ns=(self.clock, self.clock))
+
+    def trim(self) -> None:
+        """Measures the disk tier and deletes the least recently used tree
+        files until it fits in max_disk_bytes."""
+
+        files = []
+        for path in self.directory.glob("*.sssp"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, str(path), stat.st_size))
+        files.sort()
+        self.disk_size = sum(size for _, _, size in files)
+        for _, path, size in files:
+            if self.disk_size <= self.max_disk_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            self.disk_size -= size
+            self.disk_evictions += 1
+
+    def clear(self) -> None:
+        """Drops every tree from memory and the disk tier. Counters are
+        kept."""
+
+        self.trees.clear()
+        self.size = 0
+        if self.directory:
+            for path in self.directory.glob("*.sssp"):
+                path.unlink()
+        self.disk_size = 0